@@ -9,10 +9,11 @@ It was developed as a challenge project for the FIAP Software Architecture Post
 """
 
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from builder import build_db, seed_db
-from src.adapters.driven.infra.database.db import start_db
+from builder import build_db, migrate_db, seed_db
+from src.adapters.driven.infra.database.db import close_db, start_db
 from src.adapters.driver.API import (
     cliente_router,
     payment_router,
@@ -22,6 +23,19 @@ from src.adapters.driver.API import (
     maintenance_router,
     web_hook_example_router,
 )
+from src.adapters.driver.API.middlewares.db_connection_middleware import (
+    DBConnectionMiddleware,
+)
+from src.adapters.driver.API.thread_pool import configure_thread_pool
+from src.adapters.driver.container import get_container, reset_container
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_thread_pool()
+    get_container()
+    yield
+    reset_container()
 
 
 app = FastAPI(
@@ -39,13 +53,19 @@ app = FastAPI(
         "name": "MIT License",
         "identifier": "MIT",
     },
+    lifespan=lifespan,
 )
 
 start_db()
 if int(os.getenv("DB_BUILD", 0)):
     build_db()
+elif int(os.getenv("DB_MIGRATE", 0)):
+    migrate_db()
 if int(os.getenv("DB_SEED", 0)):
     seed_db()
+close_db()
+
+app.add_middleware(DBConnectionMiddleware)
 
 
 @app.get("/")
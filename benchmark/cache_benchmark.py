@@ -0,0 +1,119 @@
+"""
+Compares the latency of a cache hit with the previous behavior (a deepcopy of
+the stored object) for the values the services cache: a pedido aggregate and
+a product entity. Runs in memory, no database needed:
+
+    python -m benchmark.cache_benchmark --lines 5 --repeat 5000
+"""
+
+import argparse
+import statistics
+import time
+from copy import deepcopy
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
+from src.core.domain.entities.categoria_entity import CategoriaEntity
+from src.core.domain.entities.cliente_entity import ClienteEntity
+from src.core.domain.entities.compra_entity import CompraEntity
+from src.core.domain.entities.currency_entity import CurrencyEntity
+from src.core.domain.entities.produto_entity import ProdutoEntity
+from src.core.domain.entities.produto_escolhido_entity import ProdutoEscolhidoEntity
+from src.core.domain.value_objects.persona_value_object import PersonaValueObject
+from src.core.domain.value_objects.preco_value_object import PrecoValueObject
+from src.core.helpers.enums.compra_status import CompraStatus
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+
+NOW = datetime.now()
+CURRENCY = CurrencyEntity(
+    id=1, created_at=NOW, updated_at=NOW, symbol="R$", name="Real", code="BRL"
+)
+
+
+def build_product(product_id: int, components: int) -> ProdutoEntity:
+    return ProdutoEntity(
+        id=product_id,
+        created_at=NOW,
+        updated_at=NOW,
+        name=f"Produto {product_id}",
+        category=CategoriaEntity(id=1, created_at=NOW, updated_at=NOW, name="Lanche"),
+        price=PrecoValueObject(value=Decimal("19.90"), currency=CURRENCY),
+        components=[
+            build_product(product_id * 100 + index, 0) for index in range(components)
+        ],
+        is_active=True,
+        allow_components=bool(components),
+    )
+
+
+def build_pedido(lines: int) -> PedidoAggregate:
+    return PedidoAggregate(
+        purchase=CompraEntity(
+            id=1,
+            created_at=NOW,
+            updated_at=NOW,
+            client=ClienteEntity(
+                id=1,
+                created_at=NOW,
+                updated_at=NOW,
+                person=PersonaValueObject(name="Cliente", document="12345678900"),
+            ),
+            status=CompraStatus.CRIANDO,
+            selected_products=[
+                ProdutoEscolhidoEntity(
+                    id=line + 1,
+                    created_at=NOW,
+                    updated_at=NOW,
+                    product=build_product(line + 1, 3),
+                    added_components=[build_product(line + 1000, 0)],
+                )
+                for line in range(lines)
+            ],
+            total=PrecoValueObject(value=Decimal("99.50"), currency=CURRENCY),
+        ),
+        payments=[],
+    )
+
+
+def median_microseconds(operation: Callable[[], object], repeat: int) -> float:
+    operation()
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples)
+
+
+def run(lines: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    cache = InMemoryCacheService(start_cleaner_deamon=False)
+    results = {}
+    for name, value in (
+        ("pedido", build_pedido(lines)),
+        ("produto", build_product(1, 3)),
+    ):
+        cache.set(name, value)
+        results[name] = {
+            "deepcopy hit": median_microseconds(lambda: deepcopy(value), repeat),
+            "snapshot hit": median_microseconds(lambda: cache.get(name), repeat),
+            "set": median_microseconds(lambda: cache.set(name, value), repeat),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache hit latency benchmark.")
+    parser.add_argument("--lines", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'value':<10}{'deepcopy hit (us)':>20}{'snapshot hit (us)':>20}{'set (us)':>12}"
+    )
+    for name, timings in run(args.lines, args.repeat).items():
+        print(
+            f"{name:<10}{timings['deepcopy hit']:>20.1f}"
+            f"{timings['snapshot hit']:>20.1f}{timings['set']:>12.1f}"
+        )
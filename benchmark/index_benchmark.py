@@ -0,0 +1,152 @@
+"""
+Times the queue and product listings with and without the indexes of the
+index migration.
+
+It inserts synthetic purchases and products, so only run it against a
+disposable database:
+
+    python -m benchmark.index_benchmark --purchases 100000 --products 5000
+
+It measures whatever database the DB_* settings point at and prints which.
+So far it has only been run on SQLite: the partial-index gains are not
+verified on Postgres, and it does not exercise CREATE INDEX CONCURRENTLY
+under concurrent writes.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from src.adapters.driven.infra import db
+from src.adapters.driven.infra.models.categories import Category
+from src.adapters.driven.infra.models.currencies import Currency
+from src.adapters.driven.infra.models.persona import Persona
+from src.adapters.driven.infra.models.products import Product
+from src.adapters.driven.infra.models.purchases import Purchase
+from src.adapters.driven.infra.ports.orm_pedido_query import OrmPedidoQuery
+from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
+from src.core.helpers.enums.compra_status import CompraStatus
+from src.core.helpers.functions.keyset_cursor import encode_cursor
+from src.core.helpers.options.pedido_find_options import PedidoFindOptions
+from src.core.helpers.options.produto_find_options import ProdutoFindOptions
+from migration.builder.migrations import (
+    MIGRATIONS,
+    apply_migration,
+    drop_index,
+)
+
+QUEUE_STATUS = (
+    CompraStatus.CONCLUIDO,
+    CompraStatus.EM_PREPARO,
+    CompraStatus.PRONTO_PARA_ENTREGA,
+    CompraStatus.ENTREGUE,
+)
+BATCH_SIZE = 1000
+
+
+def seed(purchases: int, products: int, deleted_ratio: float):
+    currency_id = Currency.select(Currency.id).scalar()
+    client_ids = [persona.id for persona in Persona.select(Persona.id)]
+    category_ids = [category.id for category in Category.select(Category.id)]
+    start = datetime.now() - timedelta(days=365)
+    purchase_rows = [
+        {
+            "status": random.choice(list(CompraStatus)).value,
+            "total_value": round(random.uniform(10, 200), 2),
+            "currency": currency_id,
+            "client": random.choice(client_ids),
+            "created_at": start + timedelta(seconds=random.randint(0, 31_536_000)),
+            "deleted_at": datetime.now() if random.random() < deleted_ratio else None,
+        }
+        for _ in range(purchases)
+    ]
+    product_rows = [
+        {
+            "name": f"Benchmark {index}",
+            "category": random.choice(category_ids),
+            "price": round(random.uniform(1, 50), 2),
+            "currency": currency_id,
+            "is_active": True,
+            "deleted_at": datetime.now() if random.random() < deleted_ratio else None,
+        }
+        for index in range(products)
+    ]
+    with db.atomic():
+        for model, rows in ((Purchase, purchase_rows), (Product, product_rows)):
+            for offset in range(0, len(rows), BATCH_SIZE):
+                model.insert_many(rows[offset : offset + BATCH_SIZE]).execute()
+
+
+def queries() -> Dict[str, Callable[[], object]]:
+    middle = (
+        Purchase.select(Purchase.created_at, Purchase.id)
+        .where(Purchase.status << [status.value for status in QUEUE_STATUS])
+        .order_by(Purchase.created_at, Purchase.id)
+        .offset(Purchase.select().count() // 4)
+        .first()
+    )
+    middle_cursor = encode_cursor(middle.created_at, middle.id) if middle else None
+    return {
+        "queue first page": lambda: OrmPedidoQuery().find_page(
+            PedidoFindOptions(status=QUEUE_STATUS, limit=50)
+        ),
+        "queue deep page": lambda: OrmPedidoQuery().find_page(
+            PedidoFindOptions(status=QUEUE_STATUS, cursor=middle_cursor, limit=50)
+        ),
+        "pedido listing": lambda: OrmPedidoQuery().find_page(
+            PedidoFindOptions(limit=50)
+        ),
+        "product listing by category": lambda: OrmProductQuery().find_page(
+            ProdutoFindOptions(category="Lanches", limit=50)
+        ),
+    }
+
+
+def measure(repeat: int) -> Dict[str, float]:
+    db.execute_sql("ANALYZE")
+    timings = {}
+    for name, query in queries().items():
+        query()
+        samples: List[float] = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[name] = statistics.median(samples)
+    return timings
+
+
+def run(purchases: int, products: int, repeat: int, deleted_ratio: float):
+    migration = MIGRATIONS[0]
+    seed(purchases, products, deleted_ratio)
+    for index in migration.indexes:
+        drop_index(index)
+    before = measure(repeat)
+    apply_migration(migration)
+    after = measure(repeat)
+
+    print(f"database: {type(db).__name__}")
+    print(f"{'query':<30}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in before:
+        print(
+            f"{name:<30}{before[name]:>14.2f}{after[name]:>14.2f}"
+            f"{before[name] / after[name]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index migration benchmark.")
+    parser.add_argument("--purchases", type=int, default=100_000)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--deleted-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    db.connect(reuse_if_open=True)
+    try:
+        run(args.purchases, args.products, args.repeat, args.deleted_ratio)
+    finally:
+        db.close()
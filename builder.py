@@ -1,11 +1,21 @@
 import argparse
 
 from migration.seeder.seeder import seed_data
+from migration.builder.migrations import delete_duplicate_rows, run_migrations
 from migration.builder.raw_creation import create_tables
 
 
 def build_db():
     create_tables()
+    migrate_db()
+
+
+def migrate_db():
+    run_migrations()
+
+
+def delete_duplicates():
+    delete_duplicate_rows()
 
 
 def seed_db():
@@ -22,11 +32,25 @@ if __name__ == "__main__":
 
     parser.add_argument("-s", "--seed", action="store_true", help="Seed the database")
     parser.add_argument("-b", "--build", action="store_true", help="Build the database")
+    parser.add_argument(
+        "-m", "--migrate", action="store_true", help="Apply pending migrations"
+    )
+    parser.add_argument(
+        "--delete-duplicates",
+        action="store_true",
+        help="Delete the rows blocking a unique index, keeping one per key",
+    )
 
     args = parser.parse_args()
 
+    if args.delete_duplicates:
+        delete_duplicates()
+
     if args.build:
         build_db()
 
+    if args.migrate:
+        migrate_db()
+
     if args.seed:
         seed_db()
@@ -0,0 +1,233 @@
+"""
+Versioned schema migrations.
+
+`create_tables` only creates what is missing, so anything added to the schema
+after the first deploy (indexes, for now) lives here as a numbered migration.
+Applied versions are recorded in the `schema_migration` table; every migration
+is idempotent, so re-running a half applied one is safe.
+
+Indexes are created with CREATE INDEX CONCURRENTLY on Postgres, which does not
+block writes on the table but cannot run inside a transaction, so migrations
+must run on an autocommit connection (the default for peewee).
+
+A unique index is not created over duplicate keys written before the
+constraint existed: the migration stops listing them, and nothing is deleted
+unless an operator runs the cleanup explicitly (python builder.py
+--delete-duplicates), which keeps one row per key.
+"""
+
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from loguru import logger
+from peewee import CharField, DateTimeField, IntegerField, Model, PostgresqlDatabase
+
+from src.adapters.driven.infra import db
+
+SOFT_DELETE_FILTER = "deleted_at IS NULL"
+# How many duplicate keys the error of a blocked unique index lists.
+DUPLICATES_REPORTED = 10
+# Serializes pods that start at the same time on Postgres.
+MIGRATION_LOCK_ID = 9_001
+
+
+class IndexDefinition(NamedTuple):
+    name: str
+    table: str
+    columns: List[str]
+    unique: bool = False
+    where: Optional[str] = None
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    indexes: List[IndexDefinition]
+
+
+class SchemaMigration(Model):
+    version = IntegerField(primary_key=True)
+    name = CharField()
+    applied_at = DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = db
+        table_name = "schema_migration"
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        name="foreign_key_and_soft_delete_indexes",
+        indexes=[
+            # Same names as the composite indexes declared on the models, so a
+            # fresh database built by create_tables skips them.
+            IndexDefinition(
+                "productcomponent_product_id_component_id",
+                "product_component",
+                ["product_id", "component_id"],
+                unique=True,
+            ),
+            IndexDefinition(
+                "purchaseselectedproducts_purchase_id_product_id",
+                "purchase_selected_product",
+                ["purchase_id", "product_id"],
+                unique=True,
+            ),
+            IndexDefinition(
+                "selectedproductcomponent_selected_product_id_component_id",
+                "selected_product_component",
+                ["selected_product_id", "component_id"],
+            ),
+            # Queue / pedido listings: status filter + keyset on (created_at, id).
+            IndexDefinition(
+                "purchase_status_created_at_active",
+                "purchase",
+                ["status", "created_at", "id"],
+                where=SOFT_DELETE_FILTER,
+            ),
+            IndexDefinition(
+                "purchase_created_at_active",
+                "purchase",
+                ["created_at", "id"],
+                where=SOFT_DELETE_FILTER,
+            ),
+        ],
+    ),
+]
+
+
+def run_migrations():
+    if _is_postgres():
+        db.execute_sql("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+    try:
+        db.create_tables([SchemaMigration], safe=True)
+        applied = {
+            migration.version
+            for migration in SchemaMigration.select(SchemaMigration.version)
+        }
+        for migration in MIGRATIONS:
+            if migration.version in applied:
+                continue
+            logger.info(f"Applying migration {migration.version}: {migration.name}")
+            apply_migration(migration)
+            SchemaMigration.create(version=migration.version, name=migration.name)
+    finally:
+        if _is_postgres():
+            db.execute_sql("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+
+
+def apply_migration(migration: Migration):
+    if db.in_transaction():
+        raise RuntimeError("Migrations must run outside of a transaction.")
+    for index in migration.indexes:
+        create_index(index)
+
+
+def revert_migration(migration: Migration):
+    for index in migration.indexes:
+        drop_index(index)
+    SchemaMigration.delete().where(
+        SchemaMigration.version == migration.version
+    ).execute()
+
+
+def create_index(index: IndexDefinition):
+    if index.unique:
+        check_duplicates(index)
+    concurrently = _is_postgres()
+    if concurrently and _is_invalid_index(index.name):
+        # Left behind by an interrupted CREATE INDEX CONCURRENTLY.
+        drop_index(index)
+    sql = (
+        f"CREATE {'UNIQUE ' if index.unique else ''}INDEX "
+        f"{'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+        f"{_quote(index.name)} ON {_quote(index.table)} "
+        f"({', '.join(_quote(column) for column in index.columns)})"
+    )
+    if index.where:
+        sql += f" WHERE {index.where}"
+    db.execute_sql(sql)
+
+
+def check_duplicates(index: IndexDefinition):
+    """Raises, listing the first duplicate keys, if the unique index cannot be built."""
+    key_columns = ", ".join(_quote(column) for column in index.columns)
+    duplicates = db.execute_sql(
+        f"SELECT {key_columns}, COUNT(*) FROM {_quote(index.table)} "
+        f"WHERE {_key_conditions(index)} GROUP BY {key_columns} "
+        f"HAVING COUNT(*) > 1 ORDER BY {key_columns} LIMIT {DUPLICATES_REPORTED}"
+    ).fetchall()
+    if not duplicates:
+        return
+    keys = "; ".join(
+        ", ".join(f"{column}={value}" for column, value in zip(index.columns, row))
+        + f" ({row[-1]} rows)"
+        for row in duplicates
+    )
+    raise RuntimeError(
+        f"Cannot create unique index {index.name}: {index.table} has duplicate "
+        f"keys ({keys}). Review them, then run python builder.py "
+        "--delete-duplicates to keep one row per key."
+    )
+
+
+def delete_duplicate_rows():
+    """
+    The explicit data migration behind a blocked unique index, run by an
+    operator: deletes the duplicate keys of every unique index.
+    """
+    for migration in MIGRATIONS:
+        for index in migration.indexes:
+            if index.unique:
+                delete_duplicates(index)
+
+
+def delete_duplicates(index: IndexDefinition):
+    """
+    Keeps, for each key of the unique index, the active row (deleted_at, as
+    every model has it, is NULL) with the lowest id.
+    """
+    key_columns = ", ".join(_quote(column) for column in index.columns)
+    cursor = db.execute_sql(
+        f"DELETE FROM {_quote(index.table)} WHERE id IN ("
+        "SELECT id FROM ("
+        f"SELECT id, ROW_NUMBER() OVER (PARTITION BY {key_columns} "
+        "ORDER BY deleted_at IS NOT NULL, id) AS key_rank "
+        f"FROM {_quote(index.table)} WHERE {_key_conditions(index)}"
+        ") AS ranked WHERE key_rank > 1)"
+    )
+    if cursor.rowcount:
+        logger.warning(
+            f"Deleted {cursor.rowcount} duplicate rows of {index.table} "
+            f"for {index.name}"
+        )
+
+
+def _key_conditions(index: IndexDefinition) -> str:
+    """The rows the unique index covers: a NULL key column never conflicts."""
+    conditions = [f"{_quote(column)} IS NOT NULL" for column in index.columns]
+    if index.where:
+        conditions.append(f"({index.where})")
+    return " AND ".join(conditions)
+
+
+def drop_index(index: IndexDefinition):
+    concurrently = "CONCURRENTLY " if _is_postgres() else ""
+    db.execute_sql(f"DROP INDEX {concurrently}IF EXISTS {_quote(index.name)}")
+
+
+def _is_invalid_index(name: str) -> bool:
+    cursor = db.execute_sql(
+        "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+        "WHERE c.relname = %s AND NOT i.indisvalid",
+        (name,),
+    )
+    return cursor.fetchone() is not None
+
+
+def _is_postgres() -> bool:
+    return isinstance(db, PostgresqlDatabase)
+
+
+def _quote(identifier: str) -> str:
+    return f'"{identifier}"'
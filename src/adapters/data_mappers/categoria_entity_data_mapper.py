@@ -1,3 +1,4 @@
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.categories import Category
 from src.core.domain.entities.categoria_entity import PartialCategoriaEntity
 
@@ -13,3 +14,14 @@ class CategoriaEntityDataMapper:
             updated_at=category.updated_at,
             deleted_at=category.deleted_at,
         )
+
+    @classmethod
+    def from_row_to_domain(cls, category: Row):
+        return PartialCategoriaEntity(
+            id=category["id"],
+            description=category["description"],
+            is_component=category["is_component"],
+            created_at=category["created_at"],
+            updated_at=category["updated_at"],
+            deleted_at=category["deleted_at"],
+        )
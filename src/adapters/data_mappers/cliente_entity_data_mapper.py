@@ -1,5 +1,6 @@
 from typing import Optional
 from src.adapters.data_mappers.usuario_data_mapper import UsuarioEntityDataMapper
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.persona import Persona
 from src.adapters.driven.infra.models.user import User
 from src.core.domain.entities.cliente_entity import PartialClienteEntity
@@ -12,6 +13,8 @@ class ClientEntityDataMapper:
     def from_db_to_domain(cls, client: Persona, user: Optional[User] = None):
         return PartialClienteEntity(
             id=client.id,
+            # Still validated: its validators normalize document, email and
+            # phone.
             person=PersonaValueObject(
                 name=client.name,
                 document=client.document,
@@ -38,6 +41,49 @@ class ClientEntityDataMapper:
             user=UsuarioEntityDataMapper.from_db_to_domain(user) if user else None,
         )
 
+    @classmethod
+    def from_row_to_domain(cls, client: Row):
+        address = client["address"]
+        return PartialClienteEntity(
+            id=client["id"],
+            person=PersonaValueObject(
+                name=client["name"],
+                document=client["document"],
+                email=client["email"],
+                address=(
+                    AddressValueObject(
+                        zip_code=address["zip_code"],
+                        street=address["street"],
+                        number=address["number"],
+                        city=address["city"],
+                        state=address["state"],
+                        country=address["country"],
+                        additional_information=address["additional_information"],
+                    )
+                    if address
+                    else None
+                ),
+                birth_date=client["birth_date"],
+                phone=client["phone"],
+            ),
+            created_at=client["created_at"],
+            updated_at=client["updated_at"],
+            deleted_at=client["deleted_at"],
+            user=None,
+        )
+
+    @classmethod
+    def from_returning_to_domain(cls, client: Persona, cliente: PartialClienteEntity):
+        """Fills the generated id and timestamps of the inserted persona row."""
+        return cliente.model_copy(
+            update={
+                "id": client.id,
+                "created_at": client.created_at,
+                "updated_at": client.updated_at,
+                "deleted_at": client.deleted_at,
+            }
+        )
+
     @classmethod
     def from_domain_to_db(cls, client: PartialClienteEntity):
         return {
@@ -1,4 +1,5 @@
-from typing import Optional
+from decimal import Decimal
+from typing import List, Optional
 from src.adapters.data_mappers.cliente_entity_data_mapper import ClientEntityDataMapper
 from src.adapters.data_mappers.currency_entity_data_mapper import (
     CurrencyEntityDataMapper,
@@ -6,7 +7,9 @@ from src.adapters.data_mappers.currency_entity_data_mapper import (
 from src.adapters.data_mappers.produto_escolhido_entity_data_mapper import (
     ProdutoEscolhidoEntityDataMapper,
 )
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.purchases import Purchase
+from src.adapters.driven.infra.models.select_product import SelectedProduct
 from src.core.domain.entities.compra_entity import PartialCompraEntity
 from src.core.domain.entities.pagamento_entity import PagamentoEntity
 from src.core.domain.value_objects.preco_value_object import PrecoValueObject
@@ -20,7 +23,8 @@ class CompraEntityDataMapper:
             id=compra.id,
             status=CompraStatus(compra.status),
             total=PrecoValueObject(
-                value=compra.total_value,
+                # As validation converts floats: through their shortest repr.
+                value=Decimal(str(compra.total_value)),
                 currency=CurrencyEntityDataMapper.from_db_to_domain(compra.currency),
             ),
             created_at=compra.created_at,
@@ -41,6 +45,83 @@ class CompraEntityDataMapper:
             ),
         )
 
+    @classmethod
+    def from_row_to_domain(cls, compra: Row):
+        return PartialCompraEntity(
+            id=compra["id"],
+            status=CompraStatus(compra["status"]),
+            total=PrecoValueObject(
+                value=Decimal(str(compra["total_value"])),
+                currency=CurrencyEntityDataMapper.from_row_to_domain(
+                    compra["currency"]
+                ),
+            ),
+            created_at=compra["created_at"],
+            updated_at=compra["updated_at"],
+            deleted_at=compra["deleted_at"],
+            client=(
+                ClientEntityDataMapper.from_row_to_domain(compra["client"])
+                if compra["client"]
+                else None
+            ),
+            selected_products=[
+                ProdutoEscolhidoEntityDataMapper.from_row_to_domain(selected_product)
+                for selected_product in compra["selected_products"]
+            ],
+        )
+
+    @classmethod
+    def from_returning_to_domain(
+        cls,
+        compra: Purchase,
+        pedido: PartialCompraEntity,
+        created_selected_products: Optional[List[SelectedProduct]] = None,
+        with_references: bool = False,
+    ):
+        """
+        Builds the entity from the row returned by INSERT/UPDATE ... RETURNING
+        and the entity that was written. Order lines still without id are
+        matched, in order, with the created rows. Client and currency come from
+        the written entity unless `with_references` is set, in which case the
+        relations already attached to the row are used.
+        """
+        created_selected_products = iter(created_selected_products or [])
+        selected_products = []
+        for selected_product in pedido.selected_products or []:
+            if selected_product.id is None:
+                created_selected_product = next(created_selected_products)
+                selected_product = selected_product.model_copy(
+                    update={
+                        "id": created_selected_product.id,
+                        "created_at": created_selected_product.created_at,
+                        "updated_at": created_selected_product.updated_at,
+                    }
+                )
+            selected_products.append(selected_product)
+        update = {
+            "id": compra.id,
+            "status": CompraStatus(compra.status),
+            "total": PrecoValueObject(
+                value=compra.total_value,
+                currency=(
+                    CurrencyEntityDataMapper.from_db_to_domain(compra.currency)
+                    if with_references
+                    else pedido.total.currency
+                ),
+            ),
+            "created_at": compra.created_at,
+            "updated_at": compra.updated_at,
+            "deleted_at": compra.deleted_at,
+            "selected_products": selected_products,
+        }
+        if with_references:
+            update["client"] = (
+                ClientEntityDataMapper.from_db_to_domain(compra.client)
+                if compra.client
+                else None
+            )
+        return pedido.model_copy(update=update)
+
     @classmethod
     def from_domain_to_db(cls, compra: PartialCompraEntity):
         purchase_selected_products = (
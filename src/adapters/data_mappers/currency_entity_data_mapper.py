@@ -1,3 +1,4 @@
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.currencies import Currency
 from src.core.domain.entities.currency_entity import PartialCurrencyEntity
 
@@ -14,3 +15,15 @@ class CurrencyEntityDataMapper:
             updated_at=currency.updated_at,
             deleted_at=currency.deleted_at,
         )
+
+    @classmethod
+    def from_row_to_domain(cls, currency: Row):
+        return PartialCurrencyEntity(
+            id=currency["id"],
+            name=currency["name"],
+            symbol=currency["symbol"],
+            code=currency["code"],
+            created_at=currency["created_at"],
+            updated_at=currency["updated_at"],
+            deleted_at=currency["deleted_at"],
+        )
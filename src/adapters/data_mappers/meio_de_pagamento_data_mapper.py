@@ -1,3 +1,4 @@
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.payment_methods import PaymentMethod
 from src.core.domain.entities.meio_de_pagamento_entity import MeioDePagamentoEntity
 
@@ -15,5 +16,29 @@ class MeioDePagamentoEntityDataMapper:
             description=payment_method.description,
             is_active=payment_method.is_active,
             internal_comm_method_name=payment_method.internal_comm_method_name,
-            internal_comm_delay=payment_method.internal_comm_delay,
+            # A varchar column.
+            internal_comm_delay=(
+                int(payment_method.internal_comm_delay)
+                if payment_method.internal_comm_delay is not None
+                else None
+            ),
+        )
+
+    @classmethod
+    def from_row_to_domain(cls, payment_method: Row):
+        return MeioDePagamentoEntity(
+            id=payment_method["id"],
+            sys_name=payment_method["sys_name"],
+            created_at=payment_method["created_at"],
+            updated_at=payment_method["updated_at"],
+            deleted_at=payment_method["deleted_at"],
+            name=payment_method["name"],
+            description=payment_method["description"],
+            is_active=payment_method["is_active"],
+            internal_comm_method_name=payment_method["internal_comm_method_name"],
+            internal_comm_delay=(
+                int(payment_method["internal_comm_delay"])
+                if payment_method["internal_comm_delay"] is not None
+                else None
+            ),
         )
@@ -6,6 +6,7 @@ from src.adapters.data_mappers.currency_entity_data_mapper import (
 from src.adapters.data_mappers.meio_de_pagamento_data_mapper import (
     MeioDePagamentoEntityDataMapper,
 )
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.payments import Payment
 from src.core.domain.entities.compra_entity import PartialCompraEntity
 from src.core.domain.entities.pagamento_entity import (
@@ -33,6 +34,44 @@ class PagamentoEntityDataMapper:
             ),
         )
 
+    @classmethod
+    def from_row_to_domain(cls, payment: Row):
+        return PartialPagamentoEntity(
+            id=payment["id"],
+            created_at=payment["created_at"],
+            updated_at=payment["updated_at"],
+            deleted_at=payment["deleted_at"],
+            payment_method=MeioDePagamentoEntityDataMapper.from_row_to_domain(
+                payment["payment_method"]
+            ),
+            status=PagamentoStatus(payment["status"]),
+            payment_value=PrecoValueObject(
+                value=Decimal(payment["value"]),
+                currency=CurrencyEntityDataMapper.from_row_to_domain(
+                    payment["currency"]
+                ),
+            ),
+        )
+
+    @classmethod
+    def from_returning_to_domain(
+        cls, payment: Payment, pagamento: PartialPagamentoEntity
+    ):
+        """Merges the INSERT/UPDATE ... RETURNING row into the written entity."""
+        return pagamento.model_copy(
+            update={
+                "id": payment.id,
+                "created_at": payment.created_at,
+                "updated_at": payment.updated_at,
+                "deleted_at": payment.deleted_at,
+                "status": PagamentoStatus(payment.status),
+                "payment_value": PrecoValueObject(
+                    value=Decimal(payment.value),
+                    currency=pagamento.payment_value.currency,
+                ),
+            }
+        )
+
     @classmethod
     def from_domain_to_db(
         cls,
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from src.adapters.data_mappers.compra_data_mapper import CompraEntityDataMapper
 from src.adapters.data_mappers.pagamento_data_mapper import PagamentoEntityDataMapper
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.payments import Payment
 from src.adapters.driven.infra.models.purchases import Purchase
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
@@ -22,3 +23,14 @@ class PedidoAggregateDataMapper:
                 else []
             ),
         )
+
+    @classmethod
+    def from_row_to_domain(cls, purchase: Row, payments: List[Row]):
+        """For the rows of PedidoLoader.load_rows."""
+        return PedidoAggregate(
+            purchase=CompraEntityDataMapper.from_row_to_domain(purchase),
+            payments=[
+                PagamentoEntityDataMapper.from_row_to_domain(payment)
+                for payment in payments
+            ],
+        )
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from src.adapters.data_mappers.produto_entity_data_mapper import ProdutoEntityDataMapper
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.products import Product
 from src.adapters.driven.infra.models.purchases import Purchase
 from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
@@ -26,3 +27,11 @@ class ProdutoAggregateDataMapper:
                 else 0
             ),
         )
+
+    @classmethod
+    def from_row_to_domain(cls, produto: Row):
+        return ProdutoAggregate(
+            orders=[],
+            product=ProdutoEntityDataMapper.from_row_to_domain(produto),
+            sold_amount=0,
+        )
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.products import Product
 from src.core.domain.entities.produto_entity import PartialProdutoEntity
 from src.core.domain.value_objects.preco_value_object import PrecoValueObject
@@ -43,6 +44,36 @@ class ProdutoEntityDataMapper:
             ),
         )
 
+    @classmethod
+    def from_row_to_domain(cls, produto: Row):
+        return PartialProdutoEntity(
+            id=produto["id"],
+            name=produto["name"],
+            price=(
+                PrecoValueObject(
+                    value=round(Decimal(produto["price"]), 2),
+                    currency=CurrencyEntityDataMapper.from_row_to_domain(
+                        produto["currency"]
+                    ),
+                )
+                if produto["price"]
+                else None
+            ),
+            category=(
+                CategoriaEntityDataMapper.from_row_to_domain(produto["category"])
+                if produto["category"]
+                else None
+            ),
+            created_at=produto["created_at"],
+            updated_at=produto["updated_at"],
+            deleted_at=produto["deleted_at"],
+            allow_components=produto["allow_components"],
+            is_active=produto["is_active"],
+            components=[
+                cls.from_row_to_domain(component) for component in produto["components"]
+            ],
+        )
+
     @classmethod
     def from_domain_to_db(cls, produto: PartialProdutoEntity):
         return {
@@ -1,4 +1,5 @@
 from src.adapters.data_mappers.produto_entity_data_mapper import ProdutoEntityDataMapper
+from src.adapters.driven.infra.loaders.row_columns import Row
 from src.adapters.driven.infra.models.purchase_selected_products import (
     PurchaseSelectedProducts,
 )
@@ -26,6 +27,22 @@ class ProdutoEscolhidoEntityDataMapper:
             deleted_at=selected_product.product.deleted_at,
         )
 
+    @classmethod
+    def from_row_to_domain(cls, selected_product: Row):
+        return ProdutoEscolhidoEntity(
+            id=selected_product["id"],
+            product=ProdutoEntityDataMapper.from_row_to_domain(
+                selected_product["product"]
+            ),
+            added_components=[
+                ProdutoEntityDataMapper.from_row_to_domain(component)
+                for component in selected_product["added_components"]
+            ],
+            created_at=selected_product["created_at"],
+            updated_at=selected_product["updated_at"],
+            deleted_at=selected_product["deleted_at"],
+        )
+
     @classmethod
     def from_domain_to_db(cls, selected_product: ProdutoEscolhidoEntity):
         return {
@@ -5,6 +5,7 @@ from src.adapters.driven.events.interfaces.notification_service import (
     NotificationService,
 )
 from src.adapters.driven.events.model.notification import Notification
+from src.adapters.driven.infra import db
 from src.adapters.driver.events import internal_events
 
 
@@ -29,5 +30,6 @@ class InternalNotifierService(NotificationService):
         method = getattr(cls, method_name, None)
         sleep(self.notification_delay)
         logger.info("Processing notification")
-        method(notification)
+        with db.connection_context():
+            method(notification)
         logger.success("Notification processed")
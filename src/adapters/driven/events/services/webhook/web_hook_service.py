@@ -5,10 +5,17 @@ from src.adapters.driven.events.interfaces.notification_service import (
 )
 from src.adapters.driven.events.model.notification import Notification
 
+# Notifications are sent from the request thread; never let a slow receiver hold it.
+WEBHOOK_TIMEOUT_SECONDS = 5
+
 
 class WebHookService(NotificationService):
     def __init__(self, webhook_url: str):
         self.webhook_url = webhook_url
 
     def send_notification(self, notification: Notification) -> None:
-        requests.post(self.webhook_url, json=json.loads(notification.model_dump_json()))
+        requests.post(
+            self.webhook_url,
+            json=json.loads(notification.model_dump_json()),
+            timeout=WEBHOOK_TIMEOUT_SECONDS,
+        )
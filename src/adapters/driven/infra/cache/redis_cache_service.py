@@ -0,0 +1,327 @@
+from math import log
+from random import random
+from time import perf_counter, sleep
+from typing import Callable, Hashable, NamedTuple, Optional, Tuple
+import hashlib
+import hmac
+import secrets
+import struct
+import time
+
+from loguru import logger
+
+from src.adapters.driven.infra.cache.redis_client import RedisConnectionPool
+from src.core.helpers.functions.cache_serializer import deserialize, serialize
+from src.core.helpers.interfaces.chace_service import CacheService
+
+# version, fresh until (epoch seconds, 0 = no TTL) and loader duration, in
+# front of the pickled value.
+_HEADER = struct.Struct("!qdd")
+# HMAC-SHA256 of header and value, in front of both.
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+class RedisEntry(NamedTuple):
+    version: int
+    fresh_until: float
+    load_seconds: float
+    payload: bytes
+
+    def is_fresh(self, now: float) -> bool:
+        return not self.fresh_until or now < self.fresh_until
+
+
+class RedisCacheService(CacheService):
+    """
+    CacheService shared by every pod through a Redis server. Values are
+    stored as a binary header plus the same pickle snapshot the in-memory
+    cache uses, signed with secret: an entry whose signature does not match,
+    e.g. written by anyone else with access to Redis, is never unpickled and
+    reads as a miss. Redis expires entries stale_ttl seconds after their TTL
+    and evicts by its own maxmemory policy.
+
+    Redis is a cache, not a dependency: while it is unreachable reads are
+    misses that fall through to the loader, and writes are logged and
+    skipped, leaving the previous entry to expire.
+
+    Multi-command operations are pipelined into one round trip. get_or_load
+    coalesces the loads of all pods with a short-lived lock key: the pod that
+    takes it reloads while the others serve the stale value or poll for the
+    new one, loading it themselves if the lock expires or is released
+    without a value.
+    """
+
+    def __init__(
+        self,
+        pool: RedisConnectionPool,
+        secret: bytes,
+        prefix: str = "cache:",
+        lock_timeout: float = 10.0,
+        poll_interval: float = 0.02,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.pool = pool
+        self.secret = secret
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._clock = clock
+
+    def set(self, key: str, value: any, ttl: int = 300, pin: bool = False) -> None:
+        """
+        pin is a no-op: keys without TTL are only evicted by allkeys-*
+        maxmemory policies, and get_or_set recreates a lost control key the
+        same way on every pod.
+        """
+        try:
+            self.pool.execute("SET", self._key(key), *self._store_args(value, ttl))
+        except OSError as error:
+            self._unavailable("set", error)
+
+    def get(self, key: str) -> any:
+        try:
+            entry = self._decode(self.pool.execute("GET", self._key(key)))
+        except OSError as error:
+            self._unavailable("get", error)
+            return None
+        if entry is None or not entry.is_fresh(self._clock()):
+            return None
+        return deserialize(entry.payload)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.pool.execute("DEL", self._key(key))
+        except OSError as error:
+            self._unavailable("delete", error)
+
+    def clear(self) -> None:
+        """Deletes the keys under prefix only; other data in the db is kept."""
+        try:
+            with self.pool.connection() as connection:
+                cursor = b"0"
+                while True:
+                    cursor, keys = connection.execute(
+                        "SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500
+                    )
+                    if keys:
+                        connection.execute("DEL", *keys)
+                    if cursor == b"0":
+                        return
+        except OSError as error:
+            self._unavailable("clear", error)
+
+    def get_or_set(
+        self, key: str, value: any, ttl: int = 300, pin: bool = False
+    ) -> any:
+        """
+        None, as for a refused value, while Redis is unavailable: returning
+        value would let every caller believe its own value was stored.
+        """
+        redis_key = self._key(key)
+        try:
+            stored, current = self.pool.pipeline(
+                [
+                    ("SET", redis_key, *self._store_args(value, ttl), "NX"),
+                    ("GET", redis_key),
+                ]
+            )
+        except OSError as error:
+            self._unavailable("get_or_set", error)
+            return None
+        if stored is not None:
+            return value
+        entry = self._decode(current)
+        return deserialize(entry.payload) if entry else None
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], any],
+        ttl: int = 300,
+        stale_ttl: int = 0,
+        early_refresh_beta: float = 1.0,
+        negative_ttl: int = 0,
+    ) -> any:
+        redis_key = self._key(key)
+        lock_key = redis_key + ":lock"
+        try:
+            entry = self._decode(self.pool.execute("GET", redis_key))
+            if entry is not None and not self._needs_refresh(entry, early_refresh_beta):
+                return deserialize(entry.payload)
+            locked, current = self.pool.pipeline(
+                [
+                    (
+                        "SET",
+                        lock_key,
+                        secrets.token_hex(8),
+                        "NX",
+                        "PX",
+                        self._ms(self.lock_timeout),
+                    ),
+                    ("GET", redis_key),
+                ]
+            )
+        except OSError as error:
+            self._unavailable("get_or_load", error)
+            return loader()
+        if locked is None:
+            if entry is not None:
+                return deserialize(entry.payload)
+            loaded, value = self._wait_for_load(redis_key, lock_key)
+            if loaded:
+                return value
+        else:
+            current = self._decode(current)
+            if entry is None and current and current.is_fresh(self._clock()):
+                # Another pod stored it between the miss and the lock.
+                self._release_lock(lock_key)
+                return deserialize(current.payload)
+        return self._load(redis_key, lock_key, loader, ttl, stale_ttl, negative_ttl)
+
+    def get_with_version(self, key: str) -> Tuple[any, Optional[int]]:
+        try:
+            entry = self._decode(self.pool.execute("GET", self._key(key)))
+        except OSError as error:
+            self._unavailable("get_with_version", error)
+            return None, None
+        if entry is None or not entry.is_fresh(self._clock()):
+            return None, None
+        return deserialize(entry.payload), entry.version
+
+    def compare_and_set(
+        self, key: str, version: Optional[int], value: any, ttl: int = 300
+    ) -> bool:
+        """
+        Optimistic WATCH/MULTI/EXEC: EXEC is aborted if the key changed.
+        Not stored, so False, while Redis is unreachable.
+        """
+        redis_key = self._key(key)
+        try:
+            with self.pool.connection() as connection:
+                _, current = connection.pipeline(
+                    [("WATCH", redis_key), ("GET", redis_key)]
+                )
+                entry = self._decode(current)
+                if entry is not None and not entry.is_fresh(self._clock()):
+                    entry = None
+                if (entry.version if entry else None) != version:
+                    connection.execute("UNWATCH")
+                    return False
+                *_, result = connection.pipeline(
+                    [
+                        ("MULTI",),
+                        ("SET", redis_key, *self._store_args(value, ttl)),
+                        ("EXEC",),
+                    ]
+                )
+                return result is not None
+        except OSError as error:
+            self._unavailable("compare_and_set", error)
+            return False
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _load(
+        self,
+        redis_key: str,
+        lock_key: str,
+        loader: Callable[[], any],
+        ttl: int,
+        stale_ttl: int,
+        negative_ttl: int = 0,
+    ) -> any:
+        try:
+            started = perf_counter()
+            value = loader()
+        except BaseException:
+            self._release_lock(lock_key)
+            raise
+        if value is None and not negative_ttl:
+            self._release_lock(lock_key)
+            return None
+        store_args = (
+            self._store_args(value, ttl, stale_ttl, perf_counter() - started)
+            if value is not None
+            else self._store_args(None, negative_ttl)
+        )
+        try:
+            self.pool.pipeline([("SET", redis_key, *store_args), ("DEL", lock_key)])
+        except OSError as error:
+            self._unavailable("get_or_load", error)
+        return value
+
+    def _release_lock(self, lock_key: str):
+        """Left to expire after lock_timeout if Redis is unreachable."""
+        try:
+            self.pool.execute("DEL", lock_key)
+        except OSError as error:
+            self._unavailable("get_or_load", error)
+
+    def _wait_for_load(self, redis_key: str, lock_key: str) -> Tuple[bool, any]:
+        """Returns whether another pod stored the key, and its value."""
+        deadline = self._clock() + self.lock_timeout
+        while self._clock() < deadline:
+            sleep(self.poll_interval)
+            try:
+                current, locked = self.pool.pipeline(
+                    [("GET", redis_key), ("EXISTS", lock_key)]
+                )
+            except OSError as error:
+                self._unavailable("get_or_load", error)
+                return False, None
+            entry = self._decode(current)
+            if entry is not None and entry.is_fresh(self._clock()):
+                return True, deserialize(entry.payload)
+            if not locked:
+                return False, None
+        return False, None
+
+    def _needs_refresh(self, entry: RedisEntry, beta: float) -> bool:
+        now = self._clock()
+        if not entry.is_fresh(now):
+            return True
+        if not entry.fresh_until or not beta or not entry.load_seconds:
+            return False
+        gap = -entry.load_seconds * beta * log(1.0 - random())
+        return now + gap >= entry.fresh_until
+
+    def _store_args(
+        self, value: any, ttl: int, stale_ttl: int = 0, load_seconds: float = 0.0
+    ) -> tuple:
+        """SET arguments: the encoded entry and, with a TTL, its PX expiry."""
+        fresh_until = self._clock() + ttl if ttl else 0.0
+        data = _HEADER.pack(
+            secrets.randbits(63), fresh_until, load_seconds
+        ) + serialize(value)
+        data = self._sign(data) + data
+        if not ttl:
+            return (data,)
+        return data, "PX", self._ms(ttl + stale_ttl)
+
+    def _decode(self, data: Optional[bytes]) -> Optional[RedisEntry]:
+        if data is None:
+            return None
+        digest, data = data[:_DIGEST_SIZE], data[_DIGEST_SIZE:]
+        if len(data) < _HEADER.size or not hmac.compare_digest(
+            digest, self._sign(data)
+        ):
+            logger.warning("Ignoring a Redis cache entry with an invalid signature.")
+            return None
+        version, fresh_until, load_seconds = _HEADER.unpack_from(data)
+        return RedisEntry(version, fresh_until, load_seconds, data[_HEADER.size :])
+
+    def _sign(self, data: bytes) -> bytes:
+        return hmac.new(self.secret, data, hashlib.sha256).digest()
+
+    @staticmethod
+    def _unavailable(operation: str, error: OSError):
+        """ConnectionError and TimeoutError, from the pool too, are OSErrors."""
+        logger.warning(f"Redis unavailable on {operation}: {error}")
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key}"
+
+    @staticmethod
+    def _ms(seconds: float) -> int:
+        return max(1, int(seconds * 1000))
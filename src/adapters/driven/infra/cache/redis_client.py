@@ -0,0 +1,207 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence
+from urllib.parse import unquote, urlsplit
+import socket
+import threading
+import time
+
+CRLF = b"\r\n"
+
+
+class RedisError(Exception):
+    """Error reply of the server; the connection stays usable."""
+
+
+class RedisConnection:
+    """A single RESP2 connection. Not thread safe: borrow it from the pool."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: Optional[float] = 5.0,
+    ):
+        self._socket = socket.create_connection((host, port), timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._socket.makefile("rb")
+        if password:
+            self.execute("AUTH", password)
+        if db:
+            self.execute("SELECT", db)
+
+    def execute(self, *args) -> any:
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence]) -> List[any]:
+        """
+        Sends every command in one write and reads the replies in order, so a
+        batch costs a single round trip. Error replies are raised only after
+        all replies are read, keeping the connection in sync.
+        """
+        self.send(commands)
+        replies = [self.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def send(self, commands: Sequence[Sequence]):
+        self._socket.sendall(b"".join(encode_command(args) for args in commands))
+
+    def interrupt(self):
+        """Unblocks a read_reply waiting on another thread."""
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self):
+        try:
+            self._reader.close()
+        finally:
+            self._socket.close()
+
+    def read_reply(self) -> any:
+        line = self._reader.readline()
+        if not line.endswith(CRLF):
+            raise ConnectionError("Conexão com o Redis encerrada.")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [self.read_reply() for _ in range(length)]
+        raise ConnectionError(f"Resposta inválida do Redis: {line!r}")
+
+
+def encode_command(args: Sequence) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode()
+        elif isinstance(arg, (int, float)):
+            data = repr(arg).encode()
+        else:
+            raise TypeError(f"Argumento inválido para o Redis: {type(arg).__name__}")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class RedisConnectionPool:
+    """
+    Keeps up to max_connections open connections and lends them to one thread
+    at a time; callers wait up to timeout seconds when all are in use.
+    Connections that failed at the socket level are dropped, not returned.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 20,
+        timeout: float = 5.0,
+        socket_timeout: Optional[float] = 5.0,
+    ):
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"URL do Redis inválida: {url}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.password = unquote(parts.password) if parts.password else None
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.socket_timeout = socket_timeout
+        self._idle: List[RedisConnection] = []
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def connection(self) -> Iterator[RedisConnection]:
+        connection = self._acquire()
+        try:
+            yield connection
+        except RedisError:
+            self._release(connection)
+            raise
+        except BaseException:
+            self._discard(connection)
+            raise
+        else:
+            self._release(connection)
+
+    def execute(self, *args) -> any:
+        with self.connection() as connection:
+            return connection.execute(*args)
+
+    def pipeline(self, commands: Sequence[Sequence]) -> List[any]:
+        with self.connection() as connection:
+            return connection.pipeline(commands)
+
+    def open_connection(self, socket_timeout: Optional[float] = None):
+        """A dedicated connection outside the pool, e.g. for SUBSCRIBE."""
+        return RedisConnection(
+            self.host, self.port, self.db, self.password, socket_timeout
+        )
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            connection.close()
+
+    def _acquire(self) -> RedisConnection:
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ConnectionError("Pool de conexões do Redis encerrado.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.max_connections:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    raise TimeoutError("Nenhuma conexão livre no pool do Redis.")
+        try:
+            return self.open_connection(self.socket_timeout)
+        except BaseException:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, connection: RedisConnection):
+        with self._condition:
+            if not self._closed:
+                self._idle.append(connection)
+                self._condition.notify()
+                return
+            self._open -= 1
+        connection.close()
+
+    def _discard(self, connection: RedisConnection):
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+        connection.close()
@@ -0,0 +1,98 @@
+from typing import List, Optional
+import json
+import threading
+import uuid
+
+from loguru import logger
+
+from src.adapters.driven.infra.cache.redis_client import (
+    RedisConnection,
+    RedisConnectionPool,
+)
+from src.core.helpers.interfaces.cache_invalidation_bus import (
+    CacheInvalidationBus,
+    InvalidationHandler,
+)
+
+DEFAULT_CHANNEL = "cache:invalidate"
+
+
+class RedisInvalidationBus(CacheInvalidationBus):
+    """
+    Invalidations over Redis pub/sub. Delivery is at most once: after a
+    reconnect the handler gets None, since messages may have been lost, and
+    the L1 TTL bounds staleness for anything else that slips through.
+    """
+
+    def __init__(
+        self,
+        pool: RedisConnectionPool,
+        channel: str = DEFAULT_CHANNEL,
+        reconnect_interval: float = 1.0,
+    ):
+        self.pool = pool
+        self.channel = channel
+        self.reconnect_interval = reconnect_interval
+        self.sender = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._connection: Optional[RedisConnection] = None
+        self._subscribed = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, keys: Optional[List[str]]) -> None:
+        """Best-effort: while Redis is unreachable the message is dropped."""
+        message = json.dumps({"sender": self.sender, "keys": keys})
+        try:
+            self.pool.execute("PUBLISH", self.channel, message)
+        except OSError as error:
+            logger.warning(f"Cache invalidation not published: {error}")
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self._listener = threading.Thread(
+            target=self._listen,
+            args=(handler,),
+            name="cache-invalidation-listener",
+            daemon=True,
+        )
+        self._listener.start()
+
+    def wait_subscribed(self, timeout: Optional[float] = None) -> bool:
+        return self._subscribed.wait(timeout)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._connection:
+            self._connection.interrupt()
+        if self._listener:
+            self._listener.join(self.reconnect_interval + 1)
+            self._listener = None
+
+    def _listen(self, handler: InvalidationHandler):
+        reconnecting = False
+        while not self._stop.is_set():
+            try:
+                self._connection = self.pool.open_connection()
+                self._connection.execute("SUBSCRIBE", self.channel)
+                self._subscribed.set()
+                if reconnecting:
+                    handler(None)
+                while not self._stop.is_set():
+                    self._dispatch(self._connection.read_reply(), handler)
+            except (OSError, ValueError) as error:
+                if self._stop.is_set():
+                    return
+                logger.warning(f"Cache invalidation listener disconnected: {error}")
+                self._subscribed.clear()
+                reconnecting = True
+                self._stop.wait(self.reconnect_interval)
+            finally:
+                if self._connection:
+                    self._connection.close()
+                    self._connection = None
+
+    def _dispatch(self, reply: list, handler: InvalidationHandler):
+        if not isinstance(reply, list) or reply[0] != b"message":
+            return
+        message = json.loads(reply[2])
+        if message["sender"] != self.sender:
+            handler(message["keys"])
@@ -0,0 +1,73 @@
+from itertools import islice
+from time import monotonic
+from typing import Callable, Iterator, List
+import uuid
+
+from peewee import ModelSelect, ModelTupleCursorWrapper
+from playhouse.postgres_ext import FetchManyCursor, PostgresqlExtDatabase
+
+DEFAULT_CHUNK_SIZE = 500
+# A stream holds a pooled connection, and on Postgres a transaction, for as
+# long as its consumer reads; past this many seconds it is cut.
+DEFAULT_TIMEOUT = 300
+
+
+def iterate_chunks(
+    query: ModelSelect,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timeout: float = DEFAULT_TIMEOUT,
+    clock: Callable[[], float] = monotonic,
+) -> Iterator[List[tuple]]:
+    """
+    The tuple rows of query, chunk_size at a time, never all in memory.
+
+    On Postgres they come from a named (server-side) cursor fetching a chunk
+    per round trip. It is a plain cursor, not a holdable one, so it lives in
+    a transaction and the server never materializes the rest of the result;
+    it is closed as soon as the generator is, e.g. when a client disconnects
+    from a stream. Other databases iterate the client cursor without caching
+    the rows.
+
+    A slow client cannot hold the connection indefinitely: after timeout
+    seconds the next chunk raises TimeoutError, and on Postgres the server
+    ends a transaction left idle that long (idle_in_transaction_session_timeout)
+    if the consumer stops reading without closing the generator.
+    """
+    database = query.model._meta.database
+    query = query.tuples()
+    deadline = clock() + timeout
+    if not isinstance(database, PostgresqlExtDatabase):
+        yield from _chunks(query.iterator(), chunk_size, deadline, clock)
+        return
+    sql, params = query.sql()
+    with database.atomic():
+        database.execute_sql(
+            "SET LOCAL idle_in_transaction_session_timeout = %s",
+            (int(timeout * 1000),),
+        )
+        cursor = database.connection().cursor(name=f"chunks_{uuid.uuid4().hex}")
+        try:
+            cursor.execute(sql, params)
+            rows = ModelTupleCursorWrapper(
+                FetchManyCursor(cursor, chunk_size),
+                query.model,
+                query.selected_columns,
+            )
+            yield from _chunks(rows.iterator(), chunk_size, deadline, clock)
+        finally:
+            cursor.close()
+
+
+def _chunks(
+    rows: Iterator[tuple],
+    chunk_size: int,
+    deadline: float,
+    clock: Callable[[], float],
+) -> Iterator[List[tuple]]:
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+        if clock() > deadline:
+            raise TimeoutError("Tempo limite da leitura em partes excedido.")
@@ -1,19 +1,124 @@
 import os
-from peewee import PostgresqlDatabase
+from contextvars import ContextVar, Token
+from peewee import PostgresqlDatabase, _ConnectionState
+from playhouse.pool import PooledDatabase, PooledPostgresqlExtDatabase
+from playhouse.postgres_ext import PostgresqlExtDatabase
+
+_connection_state: ContextVar[dict] = ContextVar("db_connection_state")
+
+
+def _new_connection_state() -> dict:
+    return {"closed": True, "conn": None, "ctx": [], "transactions": []}
+
+
+class ContextConnectionState(_ConnectionState):
+    """
+    Peewee connection state bound to the current execution context instead of
+    the current thread, so requests served concurrently by the same event loop
+    never share a connection.
+    """
+
+    def __init__(self, **kwargs):
+        super().__setattr__("_state", _connection_state)
+        super().__init__(**kwargs)
+
+    def __setattr__(self, name, value):
+        self._current()[name] = value
+
+    def __getattr__(self, name):
+        try:
+            return self._current()[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def _current(self) -> dict:
+        state = self._state.get(None)
+        if state is None:
+            state = _new_connection_state()
+            self._state.set(state)
+        return state
+
+
+class ResilientPooledPostgresqlDatabase(PooledPostgresqlExtDatabase):
+    """
+    Pooled database that optionally pings idle connections on checkout, so
+    connections broken by a Postgres restart are discarded instead of
+    handed to a request. The Ext variant adds server-side (named) cursors.
+    """
+
+    def __init__(self, database, pre_ping: bool = False, **kwargs):
+        self._pre_ping = pre_ping
+        super().__init__(database, **kwargs)
+
+    def _is_closed(self, conn):
+        if super()._is_closed(conn):
+            return True
+        if not self._pre_ping:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            return True
+        return False
+
+
+def _build_database() -> PostgresqlDatabase:
+    connect_kwargs = {
+        "user": os.environ["DB_USER"],
+        "password": os.environ["DB_PASSWORD"],
+        "host": os.environ["DB_HOST"],
+        "port": int(os.environ["DB_PORT"]),
+    }
+    if int(os.getenv("DB_POOL_ENABLED", 1)):
+        database = ResilientPooledPostgresqlDatabase(
+            os.environ["DB_NAME"],
+            max_connections=int(os.getenv("DB_POOL_MAX_CONNECTIONS", 20)),
+            stale_timeout=int(os.getenv("DB_POOL_STALE_TIMEOUT", 300)),
+            timeout=int(os.getenv("DB_POOL_TIMEOUT", 10)),
+            pre_ping=bool(int(os.getenv("DB_POOL_PRE_PING", 0))),
+            **connect_kwargs,
+        )
+    else:
+        database = PostgresqlExtDatabase(os.environ["DB_NAME"], **connect_kwargs)
+    database._state = ContextConnectionState()
+    return database
+
 
 # Configure the PostgreSQL database
-db = PostgresqlDatabase(
-    os.environ["DB_NAME"],
-    user=os.environ["DB_USER"],
-    password=os.environ["DB_PASSWORD"],
-    host=os.environ["DB_HOST"],
-    port=int(os.environ["DB_PORT"]),
-)
+db = _build_database()
 
 
 def start_db():
-    db.connect()
+    db.connect(reuse_if_open=True)
 
 
 def close_db():
-    db.close()
+    if not db.is_closed():
+        db.close()
+
+
+def open_connection_scope() -> Token:
+    """Gives the current context (request / thread) its own connection state."""
+    return _connection_state.set(_new_connection_state())
+
+
+def close_connection_scope(token: Token):
+    """Returns the scope connection to the pool and restores the outer state."""
+    try:
+        close_db()
+    finally:
+        _connection_state.reset(token)
+
+
+def get_pool_stats() -> dict:
+    if not isinstance(db, PooledDatabase):
+        return {"pooled": False}
+    return {
+        "pooled": True,
+        "max_connections": db._max_connections,
+        "stale_timeout": db._stale_timeout,
+        "wait_timeout": db._wait_timeout,
+        "in_use": len(db._in_use),
+        "available": len(db._connections),
+    }
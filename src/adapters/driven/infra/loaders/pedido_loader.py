@@ -0,0 +1,283 @@
+from typing import Dict, Iterable, List, Tuple, Union
+from peewee import JOIN, ModelSelect
+
+from src.adapters.driven.infra.loaders.produto_loader import (
+    CURRENCY_COLUMNS,
+    ProdutoLoader,
+)
+from src.adapters.driven.infra.loaders.row_columns import (
+    Row,
+    RowColumns,
+    read_row,
+    select_columns,
+)
+from src.adapters.driven.infra.models.address import Address
+from src.adapters.driven.infra.models.currencies import Currency
+from src.adapters.driven.infra.models.payment_methods import PaymentMethod
+from src.adapters.driven.infra.models.payments import Payment
+from src.adapters.driven.infra.models.persona import Persona
+from src.adapters.driven.infra.models.products import Product
+from src.adapters.driven.infra.models.purchase_selected_products import (
+    PurchaseSelectedProducts,
+)
+from src.adapters.driven.infra.models.purchases import Purchase
+from src.adapters.driven.infra.models.select_product import SelectedProduct
+from src.adapters.driven.infra.models.select_product_components import (
+    SelectedProductComponent,
+)
+
+PURCHASE_COLUMNS = RowColumns(Purchase)
+PERSONA_COLUMNS = RowColumns(Persona)
+ADDRESS_COLUMNS = RowColumns(Address)
+SELECTED_PRODUCT_COLUMNS = RowColumns(SelectedProduct)
+PAYMENT_COLUMNS = RowColumns(Payment)
+PAYMENT_METHOD_COLUMNS = RowColumns(PaymentMethod)
+
+
+class PedidoLoader:
+    """
+    Batch loader for the pedido aggregate: every relation walked by the data
+    mappers is fetched up front with one query per table, so loading a page of
+    purchases costs the same number of round-trips as loading a single one.
+    """
+
+    @classmethod
+    def select_purchases(cls) -> ModelSelect:
+        return (
+            Purchase.select(Purchase, Currency, Persona, Address)
+            .join(
+                Currency,
+                join_type=JOIN.LEFT_OUTER,
+            )
+            .switch(Purchase)
+            .join(
+                Persona,
+                join_type=JOIN.LEFT_OUTER,
+            )
+            .join(
+                Address,
+                join_type=JOIN.LEFT_OUTER,
+            )
+            .switch(Purchase)
+        )
+
+    @classmethod
+    def load_references(cls, purchase: Purchase) -> Purchase:
+        """
+        Attaches currency and client to a purchase row returned by a write
+        (INSERT/UPDATE ... RETURNING), without selecting the purchase again.
+        """
+        purchase.currency = Currency.get_or_none(Currency.id == purchase.currency_id)
+        purchase.client = (
+            Persona.select(Persona, Address)
+            .join(
+                Address,
+                join_type=JOIN.LEFT_OUTER,
+            )
+            .where(Persona.id == purchase.client_id)
+            .get_or_none()
+        )
+        return purchase
+
+    @classmethod
+    def load(
+        cls, purchases: Union[ModelSelect, Iterable[Purchase]]
+    ) -> List[Tuple[Purchase, List[Payment]]]:
+        purchases: List[Purchase] = list(purchases)
+        if not purchases:
+            return []
+        purchase_ids = [purchase.id for purchase in purchases]
+
+        purchase_selected_products: List[PurchaseSelectedProducts] = list(
+            PurchaseSelectedProducts.select(PurchaseSelectedProducts, SelectedProduct)
+            .join(SelectedProduct)
+            .where(PurchaseSelectedProducts.purchase << purchase_ids)
+            .order_by(PurchaseSelectedProducts.id)
+        )
+        selected_product_ids = [psp.product.id for psp in purchase_selected_products]
+        added_components: List[SelectedProductComponent] = (
+            list(
+                SelectedProductComponent.select()
+                .where(
+                    SelectedProductComponent.selected_product << selected_product_ids
+                )
+                .order_by(SelectedProductComponent.id)
+            )
+            if selected_product_ids
+            else []
+        )
+        products = ProdutoLoader.load(
+            {psp.product.product_id for psp in purchase_selected_products}
+            | {component.component_id for component in added_components}
+        )
+
+        components_by_selected_product: Dict[int, List[SelectedProductComponent]] = {}
+        for added_component in added_components:
+            added_component.component = products[added_component.component_id]
+            components_by_selected_product.setdefault(
+                added_component.selected_product_id, []
+            ).append(added_component)
+
+        selected_products_by_purchase: Dict[int, List[PurchaseSelectedProducts]] = {}
+        for psp in purchase_selected_products:
+            selected_product: SelectedProduct = psp.product
+            selected_product.product = products[selected_product.product_id]
+            selected_product.added_components = components_by_selected_product.get(
+                selected_product.id, []
+            )
+            selected_products_by_purchase.setdefault(psp.purchase_id, []).append(psp)
+
+        payments_by_purchase: Dict[int, List[Payment]] = {}
+        for payment in cls.select_payments(purchase_ids):
+            payments_by_purchase.setdefault(payment.purchase_id, []).append(payment)
+
+        result = []
+        for purchase in purchases:
+            purchase.selected_products = selected_products_by_purchase.get(
+                purchase.id, []
+            )
+            result.append((purchase, payments_by_purchase.get(purchase.id, [])))
+        return result
+
+    @classmethod
+    def select_payments(cls, purchase_ids: List[int]) -> ModelSelect:
+        return (
+            Payment.select(Payment, PaymentMethod, Currency)
+            .join(PaymentMethod)
+            .switch(Payment)
+            .join(Currency)
+            .where(Payment.purchase << purchase_ids)
+        )
+
+    @classmethod
+    def select_rows(cls) -> ModelSelect:
+        """select_purchases, as the columns load_rows reads."""
+        return cls.select_purchases().select(
+            *select_columns(
+                PURCHASE_COLUMNS, CURRENCY_COLUMNS, PERSONA_COLUMNS, ADDRESS_COLUMNS
+            )
+        )
+
+    @classmethod
+    def load_rows(
+        cls, purchases: Union[ModelSelect, Iterable[tuple]]
+    ) -> List[Tuple[Row, List[Row]]]:
+        """
+        Like load, but for tuple rows of select_rows: the relations are read
+        as tuples too and grouped into one dict per purchase in a single
+        pass, so the queue and order listings skip building a peewee model
+        per row before mapping it.
+        """
+        if isinstance(purchases, ModelSelect):
+            purchases = purchases.tuples()
+        references: Dict[tuple, Row] = {}
+        purchase_rows = [cls._purchase_row(values, references) for values in purchases]
+        if not purchase_rows:
+            return []
+        purchase_ids = [purchase["id"] for purchase in purchase_rows]
+
+        selected_products = [
+            (purchase_id, SELECTED_PRODUCT_COLUMNS.read(values))
+            for purchase_id, *values in (
+                PurchaseSelectedProducts.select(
+                    PurchaseSelectedProducts.purchase,
+                    *select_columns(SELECTED_PRODUCT_COLUMNS),
+                )
+                .join(SelectedProduct)
+                .where(PurchaseSelectedProducts.purchase << purchase_ids)
+                .order_by(PurchaseSelectedProducts.id)
+                .tuples()
+            )
+        ]
+        selected_product_ids = [
+            selected_product["id"] for _, selected_product in selected_products
+        ]
+        added_components = (
+            list(
+                SelectedProductComponent.select(
+                    SelectedProductComponent.selected_product,
+                    SelectedProductComponent.component,
+                )
+                .where(
+                    SelectedProductComponent.selected_product << selected_product_ids
+                )
+                .order_by(SelectedProductComponent.id)
+                .tuples()
+            )
+            if selected_product_ids
+            else []
+        )
+        product_ids = {
+            selected_product["product_id"] for _, selected_product in selected_products
+        } | {component_id for _, component_id in added_components}
+        products = (
+            {
+                product["id"]: product
+                for product in ProdutoLoader.load_rows(
+                    ProdutoLoader.select_rows().where(Product.id << list(product_ids))
+                )
+            }
+            if product_ids
+            else {}
+        )
+
+        components_by_selected_product: Dict[int, List[Row]] = {}
+        for selected_product_id, component_id in added_components:
+            components_by_selected_product.setdefault(selected_product_id, []).append(
+                products[component_id]
+            )
+
+        selected_products_by_purchase: Dict[int, List[Row]] = {}
+        for purchase_id, selected_product in selected_products:
+            selected_product["product"] = products[selected_product["product_id"]]
+            selected_product["added_components"] = components_by_selected_product.get(
+                selected_product["id"], []
+            )
+            selected_products_by_purchase.setdefault(purchase_id, []).append(
+                selected_product
+            )
+
+        payments_by_purchase: Dict[int, List[Row]] = {}
+        for values in (
+            Payment.select(
+                *select_columns(
+                    PAYMENT_COLUMNS, PAYMENT_METHOD_COLUMNS, CURRENCY_COLUMNS
+                )
+            )
+            .join(PaymentMethod)
+            .switch(Payment)
+            .join(Currency)
+            .where(Payment.purchase << purchase_ids)
+            .tuples()
+        ):
+            payment, payment_method, currency = read_row(
+                values, PAYMENT_COLUMNS, PAYMENT_METHOD_COLUMNS, CURRENCY_COLUMNS
+            )
+            payment["payment_method"] = references.setdefault(
+                (PaymentMethod, payment_method["id"]), payment_method
+            )
+            payment["currency"] = references.setdefault(
+                (Currency, currency["id"]), currency
+            )
+            payments_by_purchase.setdefault(payment["purchase_id"], []).append(payment)
+
+        result = []
+        for purchase in purchase_rows:
+            purchase["selected_products"] = selected_products_by_purchase.get(
+                purchase["id"], []
+            )
+            result.append((purchase, payments_by_purchase.get(purchase["id"], [])))
+        return result
+
+    @classmethod
+    def _purchase_row(cls, values: tuple, references: Dict[tuple, Row]) -> Row:
+        purchase, currency, client, address = read_row(
+            values, PURCHASE_COLUMNS, CURRENCY_COLUMNS, PERSONA_COLUMNS, ADDRESS_COLUMNS
+        )
+        if currency is not None:
+            currency = references.setdefault((Currency, currency["id"]), currency)
+        if client is not None:
+            client["address"] = address
+        purchase["currency"] = currency
+        purchase["client"] = client
+        return purchase
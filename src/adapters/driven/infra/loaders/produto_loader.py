@@ -0,0 +1,171 @@
+from typing import Dict, Iterable, List
+from peewee import JOIN, ModelSelect
+
+from src.adapters.driven.infra.loaders.row_columns import (
+    Row,
+    RowColumns,
+    read_row,
+    select_columns,
+)
+from src.adapters.driven.infra.models.categories import Category
+from src.adapters.driven.infra.models.currencies import Currency
+from src.adapters.driven.infra.models.product_components import ProductComponent
+from src.adapters.driven.infra.models.products import Product
+
+PRODUCT_COLUMNS = RowColumns(Product)
+CATEGORY_COLUMNS = RowColumns(Category)
+CURRENCY_COLUMNS = RowColumns(Currency)
+
+
+class ProdutoLoader:
+    """
+    Batch loader for products: category, currency and the whole component tree
+    are fetched with two queries per component level, never one per row.
+    """
+
+    @classmethod
+    def load(cls, product_ids: Iterable[int]) -> Dict[int, Product]:
+        products: Dict[int, Product] = {}
+        product_components: List[ProductComponent] = []
+        pending = set(product_ids)
+        while pending:
+            for product in cls._select_products(pending):
+                products[product.id] = product
+            level_components = list(
+                ProductComponent.select()
+                .where(ProductComponent.product << list(pending))
+                .order_by(ProductComponent.id)
+            )
+            product_components.extend(level_components)
+            pending = {component.component_id for component in level_components} - set(
+                products
+            )
+
+        for product in products.values():
+            product.components = []
+        for product_component in product_components:
+            component = products.get(product_component.component_id)
+            product = products.get(product_component.product_id)
+            if component is None or product is None:
+                continue
+            product_component.component = component
+            product.components.append(product_component)
+        return products
+
+    @classmethod
+    def load_references(
+        cls, product: Product, component_ids: Iterable[int] = ()
+    ) -> Product:
+        """
+        Attaches category, currency and components to a product row returned
+        by a write (INSERT/UPDATE ... RETURNING), without selecting the product
+        again.
+        """
+        component_ids = list(component_ids)
+        product.category = (
+            Category.get_or_none(Category.id == product.category_id)
+            if product.category_id
+            else None
+        )
+        product.currency = (
+            Currency.get_or_none(Currency.id == product.currency_id)
+            if product.currency_id
+            else None
+        )
+        components = cls.load(component_ids) if component_ids else {}
+        product.components = [
+            ProductComponent(product=product.id, component=components[component_id])
+            for component_id in component_ids
+            if component_id in components
+        ]
+        return product
+
+    @classmethod
+    def select_rows(cls) -> ModelSelect:
+        """Product, category and currency columns, for load_rows."""
+        return (
+            Product.select(
+                *select_columns(PRODUCT_COLUMNS, CATEGORY_COLUMNS, CURRENCY_COLUMNS)
+            )
+            .join(
+                Category,
+                join_type=JOIN.LEFT_OUTER,
+            )
+            .switch(Product)
+            .join(
+                Currency,
+                join_type=JOIN.LEFT_OUTER,
+            )
+        )
+
+    @classmethod
+    def load_rows(cls, query: ModelSelect) -> List[Row]:
+        """
+        Like load, but as dicts read from tuple rows of query (built on
+        select_rows), in its order: listings skip building a peewee model per
+        row before mapping it. Each row carries its category and currency and
+        the rows of its components, loaded a level at a time.
+        """
+        references: Dict[tuple, Row] = {}
+        products: Dict[int, Row] = {}
+        result = [cls._product_row(values, references) for values in query.tuples()]
+        for product in result:
+            products[product["id"]] = product
+
+        links = []
+        pending = set(products)
+        while pending:
+            level_links = list(
+                ProductComponent.select(
+                    ProductComponent.product, ProductComponent.component
+                )
+                .where(ProductComponent.product << list(pending))
+                .order_by(ProductComponent.id)
+                .tuples()
+            )
+            links.extend(level_links)
+            pending = {component_id for _, component_id in level_links} - set(products)
+            if pending:
+                for values in (
+                    cls.select_rows().where(Product.id << list(pending)).tuples()
+                ):
+                    product = cls._product_row(values, references)
+                    products[product["id"]] = product
+
+        for product_id, component_id in links:
+            component = products.get(component_id)
+            product = products.get(product_id)
+            if component is not None and product is not None:
+                product["components"].append(component)
+        return result
+
+    @classmethod
+    def _product_row(cls, values: tuple, references: Dict[tuple, Row]) -> Row:
+        """Categories and currencies are shared by the rows of one load."""
+        product, category, currency = read_row(
+            values, PRODUCT_COLUMNS, CATEGORY_COLUMNS, CURRENCY_COLUMNS
+        )
+        if category is not None:
+            category = references.setdefault((Category, category["id"]), category)
+        if currency is not None:
+            currency = references.setdefault((Currency, currency["id"]), currency)
+        product["category"] = category
+        product["currency"] = currency
+        product["components"] = []
+        return product
+
+    @classmethod
+    def _select_products(cls, product_ids: Iterable[int]):
+        return (
+            Product.select(Product, Category, Currency)
+            .join(
+                Category,
+                join_type=JOIN.LEFT_OUTER,
+            )
+            .switch(Product)
+            .join(
+                Currency,
+                join_type=JOIN.LEFT_OUTER,
+            )
+            .where(Product.id << list(product_ids))
+        )
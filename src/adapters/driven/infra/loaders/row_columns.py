@@ -0,0 +1,38 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from peewee import Field, Model
+
+Row = Dict[str, Any]
+
+
+class RowColumns:
+    """
+    The columns of one model within a flat tuple row (``.tuples()``), read
+    back as a dict keyed by column name, e.g. ``category_id`` for a foreign
+    key. A LEFT JOIN miss, a row without id, reads as None.
+    """
+
+    def __init__(self, model: Type[Model]):
+        self.fields: Tuple[Field, ...] = tuple(model._meta.sorted_fields)
+        self.names: Tuple[str, ...] = tuple(field.column_name for field in self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def read(self, values: Sequence[Any], start: int = 0) -> Optional[Row]:
+        row = dict(zip(self.names, values[start : start + len(self.names)]))
+        return row if row["id"] is not None else None
+
+
+def select_columns(*columns: RowColumns) -> List[Field]:
+    return [field for model_columns in columns for field in model_columns.fields]
+
+
+def read_row(values: Sequence[Any], *columns: RowColumns) -> List[Optional[Row]]:
+    """Splits a row selected with select_columns(*columns), one dict per model."""
+    rows = []
+    start = 0
+    for model_columns in columns:
+        rows.append(model_columns.read(values, start))
+        start += len(model_columns)
+    return rows
@@ -7,7 +7,7 @@ from src.adapters.driven.infra.models.products import Product
 class ProductComponent(BaseModel):
     class Meta:
         db_table = "product_component"
-        # indexes = ((("product", "components"), True),)
+        indexes = ((("product", "component"), True),)
 
     product = ForeignKeyField(Product, backref="components")
     component = ForeignKeyField(Product, backref="product")
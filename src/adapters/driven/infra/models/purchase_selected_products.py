@@ -8,7 +8,7 @@ from src.adapters.driven.infra.models.select_product import SelectedProduct
 class PurchaseSelectedProducts(BaseModel):
     class Meta:
         db_table = "purchase_selected_product"
-        # indexes = ((("selected_products", "purchase"), True),)
+        indexes = ((("purchase", "product"), True),)
 
     product = ForeignKeyField(SelectedProduct, backref="purchases")
     purchase = ForeignKeyField(Purchase, backref="selected_products")
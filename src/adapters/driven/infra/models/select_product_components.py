@@ -8,7 +8,7 @@ from src.adapters.driven.infra.models.select_product import SelectedProduct
 class SelectedProductComponent(BaseModel):
     class Meta:
         db_table = "selected_product_component"
-        # indexes = ((("selected_product_component", "added_components"), True),)
+        indexes = ((("selected_product", "component"), False),)
 
     selected_product = ForeignKeyField(SelectedProduct, backref="added_components")
     component = ForeignKeyField(Product, backref="selected_product_component")
@@ -1,154 +1,120 @@
-from peewee import JOIN
+from contextlib import closing
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Union
+from peewee import JOIN, ModelSelect, Tuple, fn
 from src.adapters.data_mappers.pedido_aggregate_data_mapper import (
     PedidoAggregateDataMapper,
 )
-from src.adapters.driven.infra.models.categories import Category
-from src.adapters.driven.infra.models.currencies import Currency
+from src.adapters.driven.infra.database.chunked_cursor import iterate_chunks
+from src.adapters.driven.infra.loaders.pedido_loader import PedidoLoader
 from src.adapters.driven.infra.models.payments import Payment
-from src.adapters.driven.infra.models.persona import Persona
-from src.adapters.driven.infra.models.purchase_selected_products import (
-    PurchaseSelectedProducts,
-)
 from src.adapters.driven.infra.models.purchases import Purchase
-from src.adapters.driven.infra.models.select_product import SelectedProduct
-from src.adapters.driven.infra.models.select_product_components import (
-    SelectedProductComponent,
-)
 from src.core.application.ports.pedido_query import PedidoQuery
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
+from src.core.helpers.base.page import Page
+from src.core.helpers.functions.keyset_cursor import decode_cursor, encode_cursor
 from src.core.helpers.options.pedido_find_options import PedidoFindOptions
 
 
 class OrmPedidoQuery(PedidoQuery):
     def get(self, item_id: int) -> PedidoAggregate:
-        product: Purchase = (
-            Purchase.select()
-            .where(Purchase.id == item_id)
-            .join(
-                Currency,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Purchase)
-            .join(
-                Persona,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Purchase)
-            .join(
-                Payment,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Purchase)
-            .join(
-                PurchaseSelectedProducts,
-                on=(PurchaseSelectedProducts.purchase == Purchase.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .join(
-                SelectedProduct,
-                on=(SelectedProduct.product == PurchaseSelectedProducts.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .join(
-                SelectedProductComponent,
-                on=(SelectedProductComponent.selected_product == SelectedProduct.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .distinct()
-        )
-        parsed_result = [
-            PedidoAggregateDataMapper.from_db_to_domain(res) for res in product
-        ]
+        query = PedidoLoader.select_rows().where(Purchase.id == item_id)
+        parsed_result = self._load(query)
         if len(parsed_result) == 1:
             return parsed_result[0]
         return None
 
-    def get_all(self) -> list[PedidoAggregate]:
-        result: Purchase = (
-            Purchase.select()
-            .join(
-                Currency,
-                join_type=JOIN.LEFT_OUTER,
+    def get_version(self, item_id: int) -> Optional[datetime]:
+        row = (
+            Purchase.select(
+                Purchase.updated_at,
+                fn.MAX(Payment.updated_at).python_value(
+                    Payment.updated_at.python_value
+                ),
             )
-            .switch(Purchase)
-            .join(
-                Persona,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Purchase)
             .join(
                 Payment,
                 join_type=JOIN.LEFT_OUTER,
+                on=(Payment.purchase == Purchase.id),
             )
-            .switch(Purchase)
-            .join(
-                PurchaseSelectedProducts,
-                on=(PurchaseSelectedProducts.purchase == Purchase.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .join(
-                SelectedProduct,
-                on=(SelectedProduct.product == PurchaseSelectedProducts.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .join(
-                SelectedProductComponent,
-                on=(SelectedProductComponent.selected_product == SelectedProduct.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .distinct()
+            .where(Purchase.id == item_id)
+            .group_by(Purchase.id)
+            .tuples()
+            .first()
         )
-        parsed_result = [
-            PedidoAggregateDataMapper.from_db_to_domain(res) for res in result
-        ]
-        return parsed_result
+        if row is None:
+            return None
+        return max(updated_at for updated_at in row if updated_at is not None)
+
+    def get_all(self) -> list[PedidoAggregate]:
+        query = PedidoLoader.select_rows().order_by(Purchase.id)
+        return self._load(query)
 
     def find(self, query_options: PedidoFindOptions) -> list[PedidoAggregate]:
+        query = (
+            PedidoLoader.select_rows()
+            .where(*self._filters(query_options))
+            .order_by(Purchase.id)
+        )
+        return self._load(query)
+
+    def find_page(self, query_options: PedidoFindOptions) -> Page[PedidoAggregate]:
+        """Keyset pagination over (created_at, id), oldest purchases first."""
+        query = self._page_query(query_options)
+        if not query_options.limit:
+            return Page(items=self._load(query))
+
+        purchases = list(query.limit(query_options.limit + 1).tuples())
+        items = self._load(purchases[: query_options.limit])
+        if len(purchases) <= query_options.limit:
+            return Page(items=items)
+        last = items[-1].purchase
+        return Page(items=items, next_cursor=encode_cursor(last.created_at, last.id))
+
+    def stream(self, query_options: PedidoFindOptions) -> Iterator[PedidoAggregate]:
+        """
+        Every purchase find_page would page through from the cursor on,
+        ignoring limit, read from a server-side cursor: each chunk is loaded
+        and mapped only after the previous one was consumed. The options
+        are checked before anything is read.
+        """
+        return self._stream(self._page_query(query_options))
+
+    def _stream(self, query: ModelSelect) -> Iterator[PedidoAggregate]:
+        with closing(iterate_chunks(query)) as chunks:
+            for purchases in chunks:
+                yield from self._load(purchases)
+
+    def _page_query(self, query_options: PedidoFindOptions) -> ModelSelect:
+        queries = self._filters(query_options)
+        if query_options.cursor:
+            created_at, purchase_id = decode_cursor(query_options.cursor, datetime, int)
+            queries.append(
+                Tuple(Purchase.created_at, Purchase.id) > Tuple(created_at, purchase_id)
+            )
+        return (
+            PedidoLoader.select_rows()
+            .where(*queries)
+            .order_by(Purchase.created_at, Purchase.id)
+        )
+
+    def _filters(self, query_options: PedidoFindOptions) -> list:
         queries = []
         if query_options.status:
             status = [status.value for status in query_options.status]
             queries.append(Purchase.status << status)
-        if query_options.total_value_range:
+        if query_options.total_value_range and any(
+            value is not None for value in query_options.total_value_range
+        ):
             queries.append(
                 Purchase.total_value.between(*query_options.total_value_range)
             )
+        return queries
 
-        result: Purchase = (
-            Purchase.select()
-            .join(
-                Currency,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Purchase)
-            .join(
-                Persona,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Purchase)
-            .join(
-                Payment,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Purchase)
-            .join(
-                PurchaseSelectedProducts,
-                on=(PurchaseSelectedProducts.purchase == Purchase.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .join(
-                SelectedProduct,
-                on=(SelectedProduct.product == PurchaseSelectedProducts.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .join(
-                SelectedProductComponent,
-                on=(SelectedProductComponent.selected_product == SelectedProduct.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .where(*queries)
-            .distinct()
-        )
-        parsed_result = [
-            PedidoAggregateDataMapper.from_db_to_domain(res) for res in result
+    def _load(
+        self, purchases: Union[ModelSelect, Iterable[tuple]]
+    ) -> List[PedidoAggregate]:
+        return [
+            PedidoAggregateDataMapper.from_row_to_domain(purchase, payments)
+            for purchase, payments in PedidoLoader.load_rows(purchases)
         ]
-        return parsed_result
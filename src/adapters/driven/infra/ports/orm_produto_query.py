@@ -1,9 +1,11 @@
-from peewee import JOIN
-from typing import List, Union
+from datetime import datetime
+from peewee import JOIN, ModelSelect, fn
+from typing import List, Optional, Union
 from src.adapters.data_mappers.produto_aggregate_data_mapper import (
     ProdutoAggregateDataMapper,
 )
 from src.adapters.data_mappers.produto_entity_data_mapper import ProdutoEntityDataMapper
+from src.adapters.driven.infra.loaders.produto_loader import ProdutoLoader
 from src.adapters.driven.infra.models.categories import Category
 from src.adapters.driven.infra.models.currencies import Currency
 from src.adapters.driven.infra.models.product_components import ProductComponent
@@ -11,6 +13,8 @@ from src.adapters.driven.infra.models.products import Product
 from src.core.application.ports.produto_query import ProdutoQuery
 from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
 from src.core.domain.entities.produto_entity import ProdutoEntity
+from src.core.helpers.base.page import Page
+from src.core.helpers.functions.keyset_cursor import decode_cursor, encode_cursor
 from src.core.helpers.options.produto_find_options import ProdutoFindOptions
 
 
@@ -69,59 +73,92 @@ class OrmProductQuery(ProdutoQuery):
             return None
         return parsed_result[0]
 
-    def get_all(self) -> List[ProdutoAggregate]:
-        result: Product = (
-            Product.select()
-            .join(
-                Category,
-                join_type=JOIN.LEFT_OUTER,
+    def get_version(self, item_id: int) -> Optional[datetime]:
+        Component = Product.alias()
+        row = (
+            Product.select(
+                Product.updated_at,
+                fn.MAX(Component.updated_at).python_value(
+                    Product.updated_at.python_value
+                ),
             )
-            .switch(Product)
             .join(
                 ProductComponent,
                 on=(ProductComponent.product == Product.id),
                 join_type=JOIN.LEFT_OUTER,
             )
-            .switch(Product)
             .join(
-                Currency,
+                Component,
+                on=(ProductComponent.component == Component.id),
                 join_type=JOIN.LEFT_OUTER,
             )
+            .where(Product.id == item_id)
+            .group_by(Product.id)
+            .tuples()
+            .first()
         )
-        parsed_result = [
-            ProdutoAggregateDataMapper.from_db_to_domain(res) for res in result
-        ]
-        return parsed_result
+        if row is None:
+            return None
+        return max(updated_at for updated_at in row if updated_at is not None)
+
+    def get_all(self) -> List[ProdutoAggregate]:
+        return self._load(ProdutoLoader.select_rows().order_by(Product.id))
 
     def find(self, query_options: ProdutoFindOptions) -> List[ProdutoAggregate]:
-        queries = []
-        if query_options.name:
-            queries.append(Product.name.contains(query_options.name))
-        if query_options.category:
-            queries.append(Category.name.contains(query_options.category))
-        if query_options.price_range:
-            queries.append(Product.price.between(*query_options.price_range))
+        return self._load(
+            ProdutoLoader.select_rows()
+            .where(*self._filters(query_options))
+            .order_by(Product.id)
+        )
 
-        result = (
-            Product.select()
-            .join(
-                Currency,
-                join_type=JOIN.LEFT_OUTER,
-            )
-            .switch(Product)
+    def find_page(self, query_options: ProdutoFindOptions) -> Page[ProdutoAggregate]:
+        """Keyset pagination over the product id."""
+        queries = self._filters(query_options)
+        if query_options.cursor:
+            (last_id,) = decode_cursor(query_options.cursor, int)
+            queries.append(Product.id > last_id)
+        query = (
+            Product.select(Product.id)
             .join(
                 Category,
                 join_type=JOIN.LEFT_OUTER,
             )
-            .switch(Product)
-            .join(
-                ProductComponent,
-                on=(ProductComponent.product == Product.id),
-                join_type=JOIN.LEFT_OUTER,
-            )
             .where(*queries)
+            .order_by(Product.id)
         )
-        parsed_result = [
-            ProdutoAggregateDataMapper.from_db_to_domain(res) for res in result
+        if query_options.limit:
+            query = query.limit(query_options.limit + 1)
+        product_ids = [product.id for product in query]
+        next_cursor = None
+        if query_options.limit and len(product_ids) > query_options.limit:
+            product_ids = product_ids[: query_options.limit]
+            next_cursor = encode_cursor(product_ids[-1])
+
+        items = (
+            self._load(
+                ProdutoLoader.select_rows()
+                .where(Product.id << product_ids)
+                .order_by(Product.id)
+            )
+            if product_ids
+            else []
+        )
+        return Page(items=items, next_cursor=next_cursor)
+
+    def _load(self, query: ModelSelect) -> List[ProdutoAggregate]:
+        return [
+            ProdutoAggregateDataMapper.from_row_to_domain(product)
+            for product in ProdutoLoader.load_rows(query)
         ]
-        return parsed_result
+
+    def _filters(self, query_options: ProdutoFindOptions) -> list:
+        queries = []
+        if query_options.name:
+            queries.append(Product.name.contains(query_options.name))
+        if query_options.category:
+            queries.append(Category.name.contains(query_options.category))
+        if query_options.price_range and any(
+            value is not None for value in query_options.price_range
+        ):
+            queries.append(Product.price.between(*query_options.price_range))
+        return queries
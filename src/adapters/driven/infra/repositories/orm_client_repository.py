@@ -1,9 +1,8 @@
 from typing import Any
 
-from src.adapters.data_mappers.cliente_aggregate_data_mapper import (
-    ClienteAggregateDataMapper,
-)
 from src.adapters.data_mappers.cliente_entity_data_mapper import ClientEntityDataMapper
+from src.adapters.driven.infra import db
+from src.adapters.driven.infra.models.address import Address
 from src.adapters.driven.infra.models.persona import Persona
 from src.adapters.driven.infra.ports.orm_cliente_query import OrmClienteQuery
 from src.adapters.driven.infra.repositories.orm_repository import OrmRepository
@@ -17,9 +16,19 @@ class OrmClientRepository(OrmRepository, ClienteRepository):
 
     def create(self, produto: PartialClienteEntity) -> ClienteAggregate:
         db_item = ClientEntityDataMapper.from_domain_to_db(produto)
-        client: Persona = Persona.create(**db_item)
-        client.save()
-        return ClienteAggregateDataMapper.from_db_to_domain(client)
+        db_item.pop("id", None)
+        address = db_item.pop("address", None)
+        with db.atomic():
+            if address:
+                db_item["address"] = (
+                    Address.insert(**address).returning(Address.id).execute()[0].id
+                )
+            client: Persona = Persona.insert(**db_item).returning(Persona).execute()[0]
+        self._notify_write(client.id)
+        return ClienteAggregate(
+            client=ClientEntityDataMapper.from_returning_to_domain(client, produto),
+            orders=[],
+        )
 
     def update(self, produto: ClienteEntity) -> ClienteAggregate:
         raise NotImplementedError()
@@ -4,6 +4,7 @@ from src.adapters.data_mappers.pagamento_aggregate_data_mapper import (
 from src.adapters.data_mappers.pagamento_data_mapper import PagamentoEntityDataMapper
 from src.adapters.driven.infra.models.payments import Payment
 from src.adapters.driven.infra.repositories.orm_repository import OrmRepository
+from src.core.domain.aggregates.pagamento_aggregate import PagamentoAggregate
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
 from src.core.domain.entities.compra_entity import PartialCompraEntity
 from src.core.domain.entities.pagamento_entity import PartialPagamentoEntity
@@ -15,9 +16,14 @@ class OrmPagamentoRepository(OrmRepository, PagamentoRepository):
         self, payment: PartialPagamentoEntity, purchase: PartialCompraEntity
     ) -> PedidoAggregate:
         db_item = PagamentoEntityDataMapper.from_domain_to_db(payment, purchase)
-        payment: Payment = Payment.create(**db_item)
-        payment.save()
-        return PagamentoAggregateDataMapper.from_db_to_domain(payment)
+        db_item.pop("id", None)
+        created: Payment = Payment.insert(**db_item).returning(Payment).execute()[0]
+        return PagamentoAggregate(
+            payment=PagamentoEntityDataMapper.from_returning_to_domain(
+                created, payment
+            ),
+            purchase=purchase,
+        )
 
     def get(self, payment_id: int) -> PedidoAggregate:
         payment = Payment.get_by_id(payment_id)
@@ -27,9 +33,17 @@ class OrmPagamentoRepository(OrmRepository, PagamentoRepository):
         self, payment: PartialPagamentoEntity, purchase: PartialCompraEntity
     ) -> PedidoAggregate:
         db_item = PagamentoEntityDataMapper.from_domain_to_db(payment, purchase)
-        update_query: Payment = Payment.update(**db_item).where(
-            Payment.id == db_item["id"]
+        updated = list(
+            Payment.update(**db_item)
+            .where(Payment.id == db_item["id"])
+            .returning(Payment)
+            .execute()
+        )
+        if not updated:
+            raise ValueError("Pagamento não encontrado.")
+        return PagamentoAggregate(
+            payment=PagamentoEntityDataMapper.from_returning_to_domain(
+                updated[0], payment
+            ),
+            purchase=purchase,
         )
-        update_query.execute()
-        payment = Payment.get_by_id(db_item["id"])
-        return PagamentoAggregateDataMapper.from_db_to_domain(payment)
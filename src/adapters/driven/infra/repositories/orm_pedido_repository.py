@@ -1,10 +1,14 @@
+from collections import Counter, defaultdict, deque
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import Deque, Dict, List, Optional, Union
+from peewee import JOIN
 from src.adapters.data_mappers.compra_data_mapper import CompraEntityDataMapper
 from src.adapters.data_mappers.pagamento_data_mapper import PagamentoEntityDataMapper
 from src.adapters.data_mappers.pedido_aggregate_data_mapper import (
     PedidoAggregateDataMapper,
 )
+from src.adapters.driven.infra import db
+from src.adapters.driven.infra.loaders.pedido_loader import PedidoLoader
 from src.adapters.driven.infra.models.payments import Payment
 from src.adapters.driven.infra.models.purchase_selected_products import (
     PurchaseSelectedProducts,
@@ -28,13 +32,24 @@ class OrmPedidoRepository(OrmRepository, PedidoRepository):
     def create(self, pedido: PartialCompraEntity) -> PedidoAggregate:
         db_item = CompraEntityDataMapper.from_domain_to_db(pedido)
         purchase_selected_products = db_item.pop("purchase_selected_products", [])
-        purchase: Purchase = Purchase.create(**db_item)
-        purchase.save()
-        self._create_purchase_selected_products(purchase.id, purchase_selected_products)
-        purchase = Purchase.get(Purchase.id == purchase.id)
-        pedido_aggregate = PedidoAggregateDataMapper.from_db_to_domain(purchase)
+        db_item.pop("id", None)
+        with db.atomic():
+            purchase: Purchase = (
+                Purchase.insert(**db_item).returning(Purchase).execute()[0]
+            )
+            created_selected_products = self._create_purchase_selected_products(
+                purchase.id, purchase_selected_products
+            )
+        PedidoLoader.load_references(purchase)
+        pedido_aggregate = PedidoAggregate(
+            purchase=CompraEntityDataMapper.from_returning_to_domain(
+                purchase, pedido, created_selected_products, with_references=True
+            ),
+            payments=[],
+        )
         self.cache_service.set(pedido_aggregate.purchase.id, pedido_aggregate)
-        return PedidoAggregateDataMapper.from_db_to_domain(purchase)
+        self._notify_write(pedido_aggregate.purchase.id)
+        return pedido_aggregate
 
     def update(self, pedido: CompraEntity) -> PedidoAggregate:
         db_item = CompraEntityDataMapper.from_domain_to_db(pedido)
@@ -42,40 +57,62 @@ class OrmPedidoRepository(OrmRepository, PedidoRepository):
         current_purchase: Union[PedidoAggregate, None] = self.cache_service.get(
             pedido.id
         )
-        current_selected_products: List[int] = []
-        if current_purchase:
-            current_selected_products = [
-                sp.id for sp in current_purchase.purchase.selected_products
-            ]
-        else:
-            current_selected_products = [
-                sp.product.id
-                for sp in PurchaseSelectedProducts.select().where(
-                    PurchaseSelectedProducts.purchase == pedido.id
-                )
-            ]
+        current_components: Dict[int, List[int]] = (
+            {
+                sp.id: [component.id for component in sp.added_components or []]
+                for sp in current_purchase.purchase.selected_products
+            }
+            if current_purchase
+            else self._select_current_components(pedido.id)
+        )
         selected_product_ids = [
             sp["selected_product"]["id"] for sp in purchase_selected_products
         ]
         selected_products_to_delete = [
-            csp for csp in current_selected_products if csp not in selected_product_ids
+            csp for csp in current_components if csp not in selected_product_ids
         ]
         new_selected_products = [
             sp
             for sp in purchase_selected_products
-            if sp["selected_product"]["id"] not in current_selected_products
+            if sp["selected_product"]["id"] not in current_components
         ]
-        update_query: Purchase = Purchase.update(**db_item).where(
-            Purchase.id == db_item["id"]
+        new_components = self._new_components(
+            purchase_selected_products, current_components
+        )
+        with db.atomic():
+            updated = list(
+                Purchase.update(**db_item)
+                .where(Purchase.id == db_item["id"])
+                .returning(Purchase)
+                .execute()
+            )
+            if not updated:
+                raise ValueError("Pedido não encontrado.")
+            if selected_products_to_delete:
+                PurchaseSelectedProducts.delete().where(
+                    (PurchaseSelectedProducts.purchase == pedido.id)
+                    & (PurchaseSelectedProducts.product << selected_products_to_delete)
+                ).execute()
+            if new_components:
+                SelectedProductComponent.insert_many(
+                    new_components
+                ).as_rowcount().execute()
+            created_selected_products = self._create_purchase_selected_products(
+                pedido.id, new_selected_products
+            )
+        pedido_aggregate = PedidoAggregate(
+            purchase=CompraEntityDataMapper.from_returning_to_domain(
+                updated[0], pedido, created_selected_products
+            ),
+            # Payments are written by the pagamento repository, so the cached
+            # ones may be stale; they are always read again.
+            payments=[
+                PagamentoEntityDataMapper.from_db_to_domain(payment)
+                for payment in PedidoLoader.select_payments([pedido.id])
+            ],
         )
-        update_query.execute()
-        if selected_products_to_delete:
-            PurchaseSelectedProducts.delete().where(
-                PurchaseSelectedProducts.purchase << selected_products_to_delete
-            ).execute()
-        self._create_purchase_selected_products(pedido.id, new_selected_products)
-        pedido_aggregate = OrmPedidoQuery().get(db_item["id"])
         self.cache_service.set(pedido_aggregate.purchase.id, pedido_aggregate)
+        self._notify_write(pedido_aggregate.purchase.id)
         return pedido_aggregate
 
     def delete(self, pedido_id: int):
@@ -83,28 +120,128 @@ class OrmPedidoRepository(OrmRepository, PedidoRepository):
             Purchase.id == pedido_id
         )
         update_query.execute()
+        self.cache_service.delete(pedido_id)
+        self._notify_write(pedido_id)
 
     def get_by_purchase_id(self, pedido_id: int) -> PedidoAggregate:
-        pedido = self.cache_service.get(pedido_id) or OrmPedidoQuery().get(pedido_id)
-        return pedido
+        return self.cache_service.get_or_load(
+            pedido_id, lambda: OrmPedidoQuery().get(pedido_id)
+        )
 
     def find(self, query_options: PedidoFindOptions) -> list[PedidoAggregate]:
         return OrmPedidoQuery().find(query_options)
 
+    def _select_current_components(self, purchase_id: int) -> Dict[int, List[int]]:
+        """Maps every order line of the purchase to its added component ids."""
+        current_components: Dict[int, List[int]] = {}
+        for selected_product_id, component_id in (
+            PurchaseSelectedProducts.select(
+                PurchaseSelectedProducts.product,
+                SelectedProductComponent.component,
+            )
+            .join(
+                SelectedProductComponent,
+                join_type=JOIN.LEFT_OUTER,
+                on=(
+                    (
+                        SelectedProductComponent.selected_product
+                        == PurchaseSelectedProducts.product
+                    )
+                    & SelectedProductComponent.deleted_at.is_null()
+                ),
+            )
+            .where(PurchaseSelectedProducts.purchase == purchase_id)
+            .tuples()
+        ):
+            components = current_components.setdefault(selected_product_id, [])
+            if component_id is not None:
+                components.append(component_id)
+        return current_components
+
+    def _new_components(
+        self,
+        purchase_selected_products: List[dict],
+        current_components: Dict[int, List[int]],
+    ) -> List[dict]:
+        """Components added to order lines that already exist in the database."""
+        new_components = []
+        for sp in purchase_selected_products:
+            selected_product = sp["selected_product"]
+            if selected_product["id"] not in current_components:
+                continue
+            added_components = Counter(
+                component["component"]
+                for component in selected_product["added_components"]
+            ) - Counter(current_components[selected_product["id"]])
+            new_components.extend(
+                {"selected_product": selected_product["id"], "component": component}
+                for component in added_components.elements()
+            )
+        return new_components
+
     def _create_purchase_selected_products(
         self, purchase_id: int, purchase_selected_products: List[dict]
-    ):
-        for selected_product in purchase_selected_products:
-            selected_product_data = selected_product["selected_product"]
-            new_selected_product = SelectedProduct.create(
-                product=selected_product_data["product"]
-            )
-            for component in selected_product_data["added_components"]:
-                SelectedProductComponent.create(
-                    component=component["component"],
-                    selected_product=selected_product_data["product"],
+    ) -> List[SelectedProduct]:
+        """
+        Persists the new order lines with one multi-row INSERT per table and
+        returns the created selected product rows, in input order.
+
+        RETURNING rows carry no guaranteed order, so each is matched back to
+        an input line by its natural key, (purchase, product); within one
+        purchase that is the product. Lines of the same product are created
+        identical, so any of their rows may take any of those lines.
+        """
+        if not purchase_selected_products:
+            return []
+        selected_products_data = [
+            selected_product["selected_product"]
+            for selected_product in purchase_selected_products
+        ]
+        with db.atomic():
+            created_by_product: Dict[int, Deque[SelectedProduct]] = defaultdict(deque)
+            for created_selected_product in (
+                SelectedProduct.insert_many(
+                    [
+                        {"product": selected_product_data["product"]}
+                        for selected_product_data in selected_products_data
+                    ]
                 )
-            PurchaseSelectedProducts.create(
-                purchase=purchase_id,
-                product=new_selected_product.id,
-            )
+                .returning(
+                    SelectedProduct.id,
+                    SelectedProduct.product,
+                    SelectedProduct.created_at,
+                    SelectedProduct.updated_at,
+                )
+                .execute()
+            ):
+                created_by_product[created_selected_product.product_id].append(
+                    created_selected_product
+                )
+            created_selected_products: List[SelectedProduct] = [
+                created_by_product[selected_product_data["product"]].popleft()
+                for selected_product_data in selected_products_data
+            ]
+            new_selected_product_ids = [
+                selected_product.id for selected_product in created_selected_products
+            ]
+            new_components = [
+                {
+                    "component": component["component"],
+                    "selected_product": new_selected_product_id,
+                }
+                for new_selected_product_id, selected_product_data in zip(
+                    new_selected_product_ids, selected_products_data
+                )
+                for component in selected_product_data["added_components"]
+            ]
+            if new_components:
+                SelectedProductComponent.insert_many(
+                    new_components
+                ).as_rowcount().execute()
+            PurchaseSelectedProducts.insert_many(
+                [
+                    {"purchase": purchase_id, "product": new_selected_product_id}
+                    for new_selected_product_id in new_selected_product_ids
+                ]
+            ).as_rowcount().execute()
+        return created_selected_products
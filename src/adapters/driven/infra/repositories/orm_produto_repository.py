@@ -1,8 +1,11 @@
 from datetime import datetime
+from typing import List
 from src.adapters.data_mappers.produto_entity_data_mapper import ProdutoEntityDataMapper
 from src.adapters.data_mappers.produto_aggregate_data_mapper import (
     ProdutoAggregateDataMapper,
 )
+from src.adapters.driven.infra import db
+from src.adapters.driven.infra.loaders.produto_loader import ProdutoLoader
 from src.adapters.driven.infra.models.product_components import ProductComponent
 from src.adapters.driven.infra.models.products import Product
 from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
@@ -17,29 +20,38 @@ class OrmProdutoRepository(OrmRepository, ProdutoRepository):
 
     def create(self, produto: PartialProdutoEntity) -> ProdutoAggregate:
         db_item = ProdutoEntityDataMapper.from_domain_to_db(produto)
-        product: Product = Product.create(**db_item)
-        product.save()
-        return ProdutoAggregateDataMapper.from_db_to_domain(product)
+        db_item.pop("id", None)
+        db_item.pop("components", None)
+        product: Product = Product.insert(**db_item).returning(Product).execute()[0]
+        self._invalidate(product.id)
+        return ProdutoAggregateDataMapper.from_db_to_domain(
+            ProdutoLoader.load_references(product)
+        )
 
     def update(self, produto: ProdutoEntity) -> ProdutoAggregate:
         db_item = ProdutoEntityDataMapper.from_domain_to_db(produto)
-        new_component = db_item.pop("components", [])
-
-        update_query: Product = Product.update(**db_item).where(
-            Product.id == db_item["id"]
+        # A component requested twice is stored, and returned, once.
+        component_ids = list(
+            dict.fromkeys(
+                component["component"]
+                for component in db_item.pop("components", None) or []
+            )
         )
-        update_query.execute()
-
-        ProductComponent.delete().where(
-            ProductComponent.product == produto.id
-        ).execute()
 
-        for component in new_component:
-            ProductComponent.create(
-                product=component["product"], component=component["component"]
+        with db.atomic():
+            updated = list(
+                Product.update(**db_item)
+                .where(Product.id == db_item["id"])
+                .returning(Product)
+                .execute()
             )
+            if not updated:
+                raise ValueError("Produto não encontrado")
+
+            self._update_components(produto.id, component_ids)
+        self._invalidate(produto.id)
         return ProdutoAggregateDataMapper.from_db_to_domain(
-            Product.get(Product.id == db_item["id"])
+            ProdutoLoader.load_references(updated[0], component_ids)
         )
 
     def delete(self, produto_id: int):
@@ -47,9 +59,37 @@ class OrmProdutoRepository(OrmRepository, ProdutoRepository):
             Product.id == produto_id
         )
         update_query.execute()
+        self._invalidate(produto_id)
 
     def get_by_product_id(self, produto_id: int) -> ProdutoAggregate:
         return OrmProductQuery().get(produto_id)
 
     def find(self, query_options: ProdutoFindOptions) -> list[ProdutoAggregate]:
         return OrmProductQuery().find(query_options)
+
+    def _update_components(self, product_id: int, component_ids: List[int]):
+        """Applies only the delta between stored and requested components."""
+        current_component_ids = {
+            component_id
+            for (component_id,) in ProductComponent.select(ProductComponent.component)
+            .where(ProductComponent.product == product_id)
+            .tuples()
+        }
+        components_to_delete = current_component_ids - set(component_ids)
+        components_to_add = [
+            component_id
+            for component_id in component_ids
+            if component_id not in current_component_ids
+        ]
+        if components_to_delete:
+            ProductComponent.delete().where(
+                (ProductComponent.product == product_id)
+                & (ProductComponent.component << list(components_to_delete))
+            ).execute()
+        if components_to_add:
+            ProductComponent.insert_many(
+                [
+                    {"product": product_id, "component": component_id}
+                    for component_id in components_to_add
+                ]
+            ).as_rowcount().execute()
@@ -0,0 +1,54 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from src.adapters.driver.container import get_container
+from src.core.application.services.catalog_snapshot_service import (
+    CatalogSnapshotService,
+)
+from src.core.application.services.cliente_service import ClienteCommand
+from src.core.application.services.pagamento_service import PagamentoService
+from src.core.application.services.pedido_service_command import PedidoServiceCommand
+from src.core.application.services.pedido_service_query import PedidoServiceQuery
+from src.core.application.services.produto_service_command import ProductServiceCommand
+from src.core.application.services.produto_service_query import ProdutoServiceQuery
+
+# The providers are async so FastAPI resolves them on the event loop instead of
+# spending a worker thread on a lookup.
+
+
+async def get_pedido_command() -> PedidoServiceCommand:
+    return get_container().pedido_command
+
+
+async def get_pedido_query() -> PedidoServiceQuery:
+    return get_container().pedido_query_service
+
+
+async def get_produto_command() -> ProductServiceCommand:
+    return get_container().produto_command
+
+
+async def get_produto_query() -> ProdutoServiceQuery:
+    return get_container().produto_query_service
+
+
+async def get_cliente_service() -> ClienteCommand:
+    return get_container().cliente_service
+
+
+async def get_catalog_snapshot() -> CatalogSnapshotService:
+    return get_container().catalog_snapshot
+
+
+async def get_pagamento_service() -> PagamentoService:
+    return get_container().create_pagamento_service()
+
+
+PedidoCommandDep = Annotated[PedidoServiceCommand, Depends(get_pedido_command)]
+PedidoQueryDep = Annotated[PedidoServiceQuery, Depends(get_pedido_query)]
+ProdutoCommandDep = Annotated[ProductServiceCommand, Depends(get_produto_command)]
+ProdutoQueryDep = Annotated[ProdutoServiceQuery, Depends(get_produto_query)]
+ClienteServiceDep = Annotated[ClienteCommand, Depends(get_cliente_service)]
+PagamentoServiceDep = Annotated[PagamentoService, Depends(get_pagamento_service)]
+CatalogSnapshotDep = Annotated[CatalogSnapshotService, Depends(get_catalog_snapshot)]
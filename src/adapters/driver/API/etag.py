@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+# Clients may keep the body but must revalidate it with If-None-Match.
+CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as RFC 9110 asks for GET."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return etag.removeprefix("W/") in (
+        candidate.removeprefix("W/") for candidate in candidates
+    )
+
+
+def version_etag(version: datetime) -> str:
+    """Weak: the same version serializes to equivalent, not identical, JSON."""
+    return f'W/"{version:%Y%m%d%H%M%S%f}"'
+
+
+def http_date(moment: datetime) -> str:
+    """Naive datetimes are taken as local time, as the models store them."""
+    return format_datetime(moment.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    If-None-Match takes precedence over If-Modified-Since, which only has
+    second precision (RFC 9110, 13.2.2).
+    """
+    if "if-none-match" in request.headers:
+        return etag_matches(request, etag)
+    header = request.headers.get("if-modified-since")
+    if last_modified is None or not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.astimezone(timezone.utc).replace(microsecond=0) <= since
+
+
+def validator_headers(
+    etag: str, last_modified: Optional[datetime] = None
+) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """The JSON body, or an empty 304 when the client already has it."""
+    headers = validator_headers(etag)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def latest(*moments: Optional[datetime]) -> Optional[datetime]:
+    """The last change of a resource made of parts, such as an order and its payments."""
+    known = [moment for moment in moments if moment is not None]
+    return max(known) if known else None
+
+
+def not_modified_response(
+    request: Request, version: Optional[datetime]
+) -> Optional[Response]:
+    """
+    Checks the request against a resource's last change, read before the
+    resource is loaded: returns the 304 to send, or None for the handler to
+    go on and load it. Resources without a version (not found) never match.
+    """
+    if version is None:
+        return None
+    etag = version_etag(version)
+    if is_not_modified(request, etag, version):
+        return Response(status_code=304, headers=validator_headers(etag, version))
+    return None
+
+
+def add_validators(response: Response, version: Optional[datetime]) -> None:
+    """
+    Adds the validators of the version actually served, which a cached copy
+    may trail: a client must never store a newer validator with an older
+    body, or it would get 304s for data it does not have.
+    """
+    if version is not None:
+        response.headers.update(validator_headers(version_etag(version), version))
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from loguru import logger
 from builder import build_db, seed_db
+from src.adapters.driven.infra.database.db import get_pool_stats
+from src.adapters.driver.container import get_container
 
 router = APIRouter(
     prefix="/maintenance",
@@ -9,7 +11,7 @@ router = APIRouter(
 
 
 @router.post("/build_db", include_in_schema=False)
-async def build_db_api() -> bool:
+def build_db_api() -> bool:
     try:
         build_db()
         return True
@@ -22,9 +24,10 @@ async def build_db_api() -> bool:
 
 
 @router.post("/seed_db", include_in_schema=False)
-async def seed_db_api() -> bool:
+def seed_db_api() -> bool:
     try:
         seed_db()
+        get_container().invalidate_caches()
         return True
     except (ValueError, AttributeError) as e:
         logger.exception(e)
@@ -32,3 +35,17 @@ async def seed_db_api() -> bool:
     except Exception as e:
         logger.exception(e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/db_pool", include_in_schema=False)
+async def db_pool_stats() -> dict:
+    return get_pool_stats()
+
+
+@router.get("/cache_stats", include_in_schema=False)
+def cache_stats() -> dict:
+    """
+    Per-namespace lookups, load-time histogram (seconds), entries, bytes,
+    evictions and expirations of this process's cache.
+    """
+    return get_container().cache_keyspace.stats()
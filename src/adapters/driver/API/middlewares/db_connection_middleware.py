@@ -0,0 +1,27 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.adapters.driven.infra.database.db import (
+    close_connection_scope,
+    open_connection_scope,
+)
+
+
+class DBConnectionMiddleware:
+    """
+    Request scoped database connection: every HTTP request gets its own
+    connection state, lazily checked out of the pool on the first query and
+    returned once the response (including streamed bodies) has been sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = open_connection_scope()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            close_connection_scope(token)
@@ -1,30 +1,23 @@
 import json
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from loguru import logger
 from peewee import DoesNotExist
 from src.adapters.driven.events.factory.notification_factory import NotificationFactory
 from src.adapters.driven.events.model.notification import Notification
-from src.adapters.driven.infra.ports.orm_meio_de_pagamento_query import (
-    OrmMeioDePagamentoQuery,
-)
-from src.adapters.driven.infra.ports.orm_pedido_query import OrmPedidoQuery
-from src.adapters.driven.infra.repositories.orm_pagamento_repository import (
-    OrmPagamentoRepository,
-)
-from src.adapters.driven.infra.repositories.orm_pedido_repository import (
-    OrmPedidoRepository,
-)
 from src.adapters.driven.payment_providers.functions.get_payment_provider_from_sys_name import (
     get_payment_provider_from_sys_name,
 )
-from src.adapters.driven.payment_providers.providers.default_provider import (
-    DefaultPaymentProvider,
+from src.adapters.driver.API.dependencies import (
+    CatalogSnapshotDep,
+    PagamentoServiceDep,
 )
+from src.adapters.driver.API.etag import etag_response
 from src.adapters.driver.API.schemas.create_payment_schema import CreatePaymentSchema
-from src.core.application.services.pagamento_service import PagamentoService
+from src.core.application.services.catalog_snapshot_service import (
+    CatalogSnapshotService,
+)
 from src.core.domain.aggregates.pagamento_aggregate import PagamentoAggregate
 from src.core.domain.entities.meio_de_pagamento_entity import MeioDePagamentoEntity
-from src.core.helpers.services.in_memory_cache import InMemoryCacheService
 
 router = APIRouter(
     prefix="/payment",
@@ -33,17 +26,10 @@ router = APIRouter(
 
 
 @router.post("/")
-async def initiate_payment(payment: CreatePaymentSchema) -> PagamentoAggregate:
+def initiate_payment(
+    payment: CreatePaymentSchema, pagamento_service: PagamentoServiceDep
+) -> PagamentoAggregate:
     try:
-
-        pagamento_service = PagamentoService(
-            OrmPagamentoRepository(),
-            OrmPedidoRepository(InMemoryCacheService()),
-            OrmPedidoQuery(),
-            OrmMeioDePagamentoQuery(),
-            DefaultPaymentProvider(),
-            [],
-        )
         if payment.webhook_url:
             pagamento_service.notification_services.append(
                 NotificationFactory.create_web_hook_service(payment.webhook_url)
@@ -69,18 +55,11 @@ async def initiate_payment(payment: CreatePaymentSchema) -> PagamentoAggregate:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/methods")
-async def list_payment_methods() -> list[MeioDePagamentoEntity]:
+@router.get("/methods", response_model=list[MeioDePagamentoEntity])
+def list_payment_methods(request: Request, catalog: CatalogSnapshotDep) -> Response:
     try:
-        pagamento_service = PagamentoService(
-            OrmPagamentoRepository(),
-            OrmPedidoRepository(InMemoryCacheService()),
-            OrmPedidoQuery(),
-            OrmMeioDePagamentoQuery(),
-            DefaultPaymentProvider(),
-            [],
-        )
-        return pagamento_service.list_payment_methods()
+        section = catalog.section(CatalogSnapshotService.PAYMENT_METHODS)
+        return etag_response(request, section.body, section.etag)
     except (ValueError, AttributeError) as e:
         logger.exception(e)
         raise HTTPException(status_code=400, detail=str(e))
@@ -90,16 +69,10 @@ async def list_payment_methods() -> list[MeioDePagamentoEntity]:
 
 
 @router.get("/{payment_id}")
-async def get_payment(payment_id: str) -> PagamentoAggregate | None:
+def get_payment(
+    payment_id: str, pagamento_service: PagamentoServiceDep
+) -> PagamentoAggregate | None:
     try:
-        pagamento_service = PagamentoService(
-            OrmPagamentoRepository(),
-            OrmPedidoRepository(InMemoryCacheService()),
-            OrmPedidoQuery(),
-            OrmMeioDePagamentoQuery(),
-            DefaultPaymentProvider(),
-            [],
-        )
         return pagamento_service.get_payment(payment_id)
     except DoesNotExist as e:
         logger.exception(e)
@@ -1,43 +1,55 @@
-from typing import Annotated, List, Optional, Union
+from typing import Annotated, Optional
 from loguru import logger
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
-from src.adapters.driven.infra.ports.orm_pedido_query import OrmPedidoQuery
-from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
-from src.adapters.driven.infra.repositories.orm_pedido_repository import (
-    OrmPedidoRepository,
+from src.adapters.driver.API.dependencies import PedidoCommandDep, PedidoQueryDep
+from src.adapters.driver.API.etag import (
+    add_validators,
+    latest,
+    not_modified_response,
 )
 from src.adapters.driver.API.schemas.create_purchase_schema import CreatePurchaseSchema
-from src.core.application.services.pedido_service_command import PedidoServiceCommand
-from src.core.application.services.pedido_service_query import PedidoServiceQuery
+from src.adapters.driver.API.streaming import stream_response, wants_ndjson
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
 from src.core.domain.entities.cliente_entity import PartialClienteEntity
 from src.core.domain.entities.compra_entity import CompraEntity, PartialCompraEntity
 from src.core.domain.entities.currency_entity import PartialCurrencyEntity
 from src.core.domain.value_objects.preco_value_object import PrecoValueObject
+from src.core.helpers.base.page import Page
 from src.core.helpers.enums.compra_status import CompraStatus
 from src.core.helpers.functions.structure_value_range import structure_value_range
 from src.core.helpers.options.pedido_find_options import PedidoFindOptions
-from src.core.helpers.services.in_memory_cache import InMemoryCacheService
 
 router = APIRouter(
     prefix="/pedido",
     tags=["Pedidos"],
 )
 
-pedido_command = PedidoServiceCommand(
-    OrmPedidoRepository(InMemoryCacheService()),
-    OrmPedidoQuery(),
-    OrmProductQuery(),
-    InMemoryCacheService(),
-)
-
 
 @router.get("/{pedido_id}")
-async def get_pedido(pedido_id: int) -> PedidoAggregate:
+def get_pedido(
+    pedido_id: int, request: Request, response: Response, query: PedidoQueryDep
+) -> PedidoAggregate:
+    """
+    Send the ETag back in If-None-Match (or Last-Modified in
+    If-Modified-Since) to get a 304, without the order being loaded, while
+    it is unchanged. The validators sent describe the copy served, which may
+    trail a change while it is cached.
+    """
     try:
-        query = PedidoServiceQuery(OrmPedidoQuery())
-        return query.get(pedido_id=pedido_id)
+        not_modified = not_modified_response(request, query.get_version(pedido_id))
+        if not_modified:
+            return not_modified
+        pedido = query.get(pedido_id=pedido_id)
+        if pedido:
+            add_validators(
+                response,
+                latest(
+                    pedido.purchase.updated_at,
+                    *(payment.updated_at for payment in pedido.payments or []),
+                ),
+            )
+        return pedido
     except (ValueError, AttributeError) as e:
         logger.exception(e)
         raise HTTPException(status_code=400, detail=str(e))
@@ -47,25 +59,36 @@ async def get_pedido(pedido_id: int) -> PedidoAggregate:
 
 
 @router.get("/")
-async def list_pedidos(
+def list_pedidos(
+    request: Request,
+    query: PedidoQueryDep,
     status: Annotated[list[int] | None, Query()] = None,
     min_value: Optional[float] = None,
     max_value: Optional[float] = None,
-) -> Union[List[PedidoAggregate], None]:
-
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    stream: bool = False,
+) -> Page[PedidoAggregate]:
+    """
+    With stream=true, or an Accept of application/x-ndjson, every matching
+    order from the cursor on is streamed (limit does not apply) as a JSON
+    array or as NDJSON, for exports and back-office views.
+    """
     try:
-        query_options = None
-        if any([status, min_value, max_value]):
-            query_status = []
-            status = status or []
-            for s in status:
-                query_status.append(CompraStatus(s))
-            price_range = structure_value_range(min_value, max_value)
-            query_options = PedidoFindOptions(
-                status=query_status, price_range=price_range
-            )
-        query = PedidoServiceQuery(OrmPedidoQuery())
-        return query.index(query_options) or []
+        query_status = []
+        status = status or []
+        for s in status:
+            query_status.append(CompraStatus(s))
+        price_range = structure_value_range(min_value, max_value)
+        query_options = PedidoFindOptions(
+            status=query_status,
+            total_value_range=price_range,
+            cursor=cursor,
+            limit=limit,
+        )
+        if stream or wants_ndjson(request):
+            return stream_response(request, query.export(query_options))
+        return query.index(query_options)
     except (ValueError, AttributeError) as e:
         logger.exception(e)
         raise HTTPException(status_code=400, detail=str(e))
@@ -75,7 +98,9 @@ async def list_pedidos(
 
 
 @router.post("/")
-async def create_pedido(pedido: CreatePurchaseSchema) -> CompraEntity:
+def create_pedido(
+    pedido: CreatePurchaseSchema, pedido_command: PedidoCommandDep
+) -> CompraEntity:
     try:
         purchase = PartialCompraEntity(
             client=PartialClienteEntity(id=pedido.client_id),
@@ -96,7 +121,9 @@ async def create_pedido(pedido: CreatePurchaseSchema) -> CompraEntity:
 
 
 @router.patch("/{pedido_id}/add_product/{product_id}")
-async def add_new_product_to_pedido(pedido_id: int, product_id: int) -> CompraEntity:
+def add_new_product_to_pedido(
+    pedido_id: int, product_id: int, pedido_command: PedidoCommandDep
+) -> CompraEntity:
     try:
         return pedido_command.add_new_product(pedido_id, product_id).purchase
     except (ValueError, AttributeError) as e:
@@ -108,8 +135,11 @@ async def add_new_product_to_pedido(pedido_id: int, product_id: int) -> CompraEn
 
 
 @router.patch("/{pedido_id}/{product_id}/add_component/{component_id}")
-async def add_new_component_to_product_in_pedido(
-    pedido_id: int, product_id: int, component_id: int
+def add_new_component_to_product_in_pedido(
+    pedido_id: int,
+    product_id: int,
+    component_id: int,
+    pedido_command: PedidoCommandDep,
 ) -> CompraEntity:
     try:
         return pedido_command.add_component_to_select_product(
@@ -124,7 +154,9 @@ async def add_new_component_to_product_in_pedido(
 
 
 @router.patch("/conclude/{pedido_id}")
-async def concludes_pedido(pedido_id: int) -> PedidoAggregate:
+def concludes_pedido(
+    pedido_id: int, pedido_command: PedidoCommandDep
+) -> PedidoAggregate:
     try:
         return pedido_command.concludes_pedido(pedido_id)
     except (ValueError, AttributeError) as e:
@@ -136,7 +168,7 @@ async def concludes_pedido(pedido_id: int) -> PedidoAggregate:
 
 
 @router.patch("/cancel/{pedido_id}")
-async def cancel_pedido(pedido_id: int) -> PedidoAggregate:
+def cancel_pedido(pedido_id: int, pedido_command: PedidoCommandDep) -> PedidoAggregate:
     try:
         return pedido_command.cancel_pedido(pedido_id)
     except (ValueError, AttributeError) as e:
@@ -1,17 +1,22 @@
-from typing import List, Optional, Union
-from fastapi import APIRouter, HTTPException
+from typing import Annotated, List, Optional, Union
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from loguru import logger
-from src.adapters.driven.infra.ports.orm_categoria_query import OrmCategoriaQuery
-from src.adapters.driven.infra.ports.orm_currency_query import OrmCurrencyQuery
-from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
-from src.adapters.driven.infra.repositories.orm_produto_repository import (
-    OrmProdutoRepository,
+from src.adapters.driver.API.dependencies import (
+    CatalogSnapshotDep,
+    ProdutoCommandDep,
+    ProdutoQueryDep,
+)
+from src.adapters.driver.API.etag import (
+    add_validators,
+    etag_response,
+    latest,
+    not_modified_response,
 )
 from src.adapters.driver.API.schemas.create_product_schema import CreateProductSchema
 from src.adapters.driver.API.schemas.update_product_schema import UpdateProductSchema
-from src.core.application.services.produto_service_command import ProductServiceCommand
-from src.core.application.services.produto_service_query import (
-    ProdutoServiceQuery,
+from src.core.application.services.catalog_snapshot_service import (
+    CatalogMenu,
+    CatalogSnapshotService,
 )
 from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
 from src.core.domain.entities.categoria_entity import (
@@ -23,6 +28,7 @@ from src.core.domain.entities.currency_entity import (
 )
 from src.core.domain.entities.produto_entity import PartialProdutoEntity
 from src.core.domain.value_objects.preco_value_object import PrecoValueObject
+from src.core.helpers.base.page import Page
 from src.core.helpers.functions.structure_value_range import structure_value_range
 from src.core.helpers.options.produto_find_options import ProdutoFindOptions
 
@@ -32,13 +38,29 @@ router = APIRouter(
 )
 
 
-@router.get("/categories")
-async def list_categories() -> Union[List[CategoriaEntity], None]:
+@router.get("/menu", response_model=CatalogMenu)
+def get_menu(request: Request, catalog: CatalogSnapshotDep) -> Response:
+    """
+    The active products, categories, currencies and payment methods in one
+    pre-serialized document. Send its ETag back in If-None-Match to get a 304
+    while the menu is unchanged.
+    """
     try:
-        query = ProdutoServiceQuery(
-            OrmProductQuery(), OrmCategoriaQuery(), OrmCurrencyQuery()
-        )
-        return query.list_categories()
+        section = catalog.section(CatalogSnapshotService.MENU)
+        return etag_response(request, section.body, section.etag)
+    except (ValueError, AttributeError) as e:
+        logger.exception(e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/categories", response_model=List[CategoriaEntity])
+def list_categories(request: Request, catalog: CatalogSnapshotDep) -> Response:
+    try:
+        section = catalog.section(CatalogSnapshotService.CATEGORIES)
+        return etag_response(request, section.body, section.etag)
     except (ValueError, AttributeError) as e:
         logger.exception(e)
         raise HTTPException(status_code=400, detail=str(e))
@@ -48,22 +70,28 @@ async def list_categories() -> Union[List[CategoriaEntity], None]:
 
 
 @router.get("/index")
-async def list_itens(
+def list_itens(
+    query: ProdutoQueryDep,
     name: Optional[str] = None,
     category: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-) -> Union[List[ProdutoAggregate], None]:
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+) -> Page[ProdutoAggregate]:
+    """
+    Queried per request rather than served from the menu snapshot: it lists
+    inactive products too, filtered and paginated by keyset.
+    """
     try:
-        query = ProdutoServiceQuery(
-            OrmProductQuery(), OrmCategoriaQuery(), OrmCurrencyQuery()
+        price_range = structure_value_range(min_price, max_price)
+        query_options = ProdutoFindOptions(
+            name=name,
+            category=category,
+            price_range=price_range,
+            cursor=cursor,
+            limit=limit,
         )
-        query_options = None
-        if any([name, category, min_price, max_price]):
-            price_range = structure_value_range(min_price, max_price)
-            query_options = ProdutoFindOptions(
-                name=name, category=category, price_range=price_range
-            )
         return query.index(query_options)
     except (ValueError, AttributeError) as e:
         logger.exception(e)
@@ -74,12 +102,30 @@ async def list_itens(
 
 
 @router.get("/{item_id}")
-async def get_item(item_id: int) -> Union[ProdutoAggregate, None]:
+def get_item(
+    item_id: int, request: Request, response: Response, query: ProdutoQueryDep
+) -> Union[ProdutoAggregate, None]:
+    """
+    Answers 304, without loading the product, when If-None-Match or
+    If-Modified-Since show the client has its latest version. The validators
+    sent describe the copy served, which may trail a change while it is
+    cached.
+    """
     try:
-        query = ProdutoServiceQuery(
-            OrmProductQuery(), OrmCategoriaQuery(), OrmCurrencyQuery()
-        )
+        not_modified = not_modified_response(request, query.get_version(item_id))
+        if not_modified:
+            return not_modified
         result = query.get(item_id)
+        add_validators(
+            response,
+            latest(
+                result.product.updated_at,
+                *(
+                    component.updated_at
+                    for component in result.product.components or []
+                ),
+            ),
+        )
         return result
     except (ValueError, AttributeError) as e:
         logger.exception(e)
@@ -90,14 +136,10 @@ async def get_item(item_id: int) -> Union[ProdutoAggregate, None]:
 
 
 @router.post("/", status_code=201)
-async def create_item(produto: CreateProductSchema) -> ProdutoAggregate:
+def create_item(
+    produto: CreateProductSchema, command: ProdutoCommandDep
+) -> ProdutoAggregate:
     try:
-        command = ProductServiceCommand(
-            OrmProdutoRepository(),
-            OrmProductQuery(),
-            OrmCategoriaQuery(),
-            OrmCurrencyQuery(),
-        )
         product = PartialProdutoEntity(
             name=produto.name,
             allow_components=produto.allow_components,
@@ -118,14 +160,10 @@ async def create_item(produto: CreateProductSchema) -> ProdutoAggregate:
 
 
 @router.put("/")
-async def update_item(produto: UpdateProductSchema) -> ProdutoAggregate:
+def update_item(
+    produto: UpdateProductSchema, command: ProdutoCommandDep
+) -> ProdutoAggregate:
     try:
-        command = ProductServiceCommand(
-            OrmProdutoRepository(),
-            OrmProductQuery(),
-            OrmCategoriaQuery(),
-            OrmCurrencyQuery(),
-        )
         product = PartialProdutoEntity(
             id=produto.id,
             name=produto.name,
@@ -150,14 +188,8 @@ async def update_item(produto: UpdateProductSchema) -> ProdutoAggregate:
 
 
 @router.delete("/{item_id}")
-async def delete_item(item_id: int):
+def delete_item(item_id: int, command: ProdutoCommandDep):
     try:
-        command = ProductServiceCommand(
-            OrmProdutoRepository(),
-            OrmProductQuery(),
-            OrmCategoriaQuery(),
-            OrmCurrencyQuery(),
-        )
         command.delete_product(item_id)
     except (ValueError, AttributeError) as e:
         logger.exception(e)
@@ -168,22 +200,10 @@ async def delete_item(item_id: int):
 
 
 @router.patch("/activate/{item_id}")
-async def activate_item(item_id: int) -> ProdutoAggregate:
-    command = ProductServiceCommand(
-        OrmProdutoRepository(),
-        OrmProductQuery(),
-        OrmCategoriaQuery(),
-        OrmCurrencyQuery(),
-    )
+def activate_item(item_id: int, command: ProdutoCommandDep) -> ProdutoAggregate:
     return command.activate_product(item_id)
 
 
 @router.patch("/deactivate/{item_id}")
-async def deactivate_item(item_id: int) -> ProdutoAggregate:
-    command = ProductServiceCommand(
-        OrmProdutoRepository(),
-        OrmProductQuery(),
-        OrmCategoriaQuery(),
-        OrmCurrencyQuery(),
-    )
+def deactivate_item(item_id: int, command: ProdutoCommandDep) -> ProdutoAggregate:
     return command.deactivate_product(item_id)
@@ -1,46 +1,43 @@
-from typing import List, Union
-from fastapi import APIRouter, HTTPException
+from typing import Annotated, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
 from loguru import logger
 
-from src.adapters.driven.infra.ports.orm_pedido_query import OrmPedidoQuery
-from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
-from src.adapters.driven.infra.repositories.orm_pedido_repository import (
-    OrmPedidoRepository,
-)
-from src.core.application.services.pedido_service_command import PedidoServiceCommand
-from src.core.application.services.pedido_service_query import PedidoServiceQuery
+from src.adapters.driver.API.dependencies import PedidoCommandDep, PedidoQueryDep
+from src.adapters.driver.API.streaming import stream_response, wants_ndjson
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
+from src.core.helpers.base.page import Page
 from src.core.helpers.enums.compra_status import CompraStatus
 from src.core.helpers.options.pedido_find_options import PedidoFindOptions
-from src.core.helpers.services.in_memory_cache import InMemoryCacheService
 
 router = APIRouter(
     prefix="/queue",
     tags=["Fila de Pedidos"],
 )
 
-pedido_command = PedidoServiceCommand(
-    OrmPedidoRepository(InMemoryCacheService()),
-    OrmPedidoQuery(),
-    OrmProductQuery(),
-    InMemoryCacheService(),
-)
-
 
 @router.get("/")
-async def get_queue() -> Union[List[PedidoAggregate], None]:
+def get_queue(
+    request: Request,
+    query: PedidoQueryDep,
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    stream: bool = False,
+) -> Page[PedidoAggregate]:
+    """Streams the whole queue like GET /pedido with stream=true or NDJSON."""
     try:
-        query = PedidoServiceQuery(OrmPedidoQuery())
         query_options = PedidoFindOptions(
             status=(
                 CompraStatus.CONCLUIDO,
                 CompraStatus.EM_PREPARO,
                 CompraStatus.PRONTO_PARA_ENTREGA,
                 CompraStatus.ENTREGUE,
-            )
+            ),
+            cursor=cursor,
+            limit=limit,
         )
-
-        return query.index(query_options) or []
+        if stream or wants_ndjson(request):
+            return stream_response(request, query.export(query_options))
+        return query.index(query_options)
     except (ValueError, AttributeError) as e:
         logger.exception(e)
         raise HTTPException(status_code=400, detail=str(e))
@@ -50,8 +47,8 @@ async def get_queue() -> Union[List[PedidoAggregate], None]:
 
 
 @router.put("/")
-async def update_queue_item_status(
-    pedido_id: int, new_status_number: int
+def update_queue_item_status(
+    pedido_id: int, new_status_number: int, pedido_command: PedidoCommandDep
 ) -> PedidoAggregate:
     try:
         return pedido_command.update_status(
@@ -0,0 +1,80 @@
+from typing import AsyncIterator, Iterable, Iterator
+
+import anyio
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Items are serialized into buffers of about this size, so a large listing
+# costs a worker thread hop per buffer instead of per item.
+STREAM_BUFFER_BYTES = 64 * 1024
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_lines(items: Iterable[BaseModel]) -> Iterator[bytes]:
+    """One JSON document per line."""
+    for item in items:
+        yield item.model_dump_json().encode() + b"\n"
+
+
+def json_array_chunks(items: Iterable[BaseModel]) -> Iterator[bytes]:
+    """A single JSON array, written one item at a time."""
+    yield b"["
+    separator = b""
+    for item in items:
+        yield separator + item.model_dump_json().encode()
+        separator = b","
+    yield b"]"
+
+
+def stream_response(request: Request, items: Iterator[BaseModel]) -> StreamingResponse:
+    """
+    Streams items as NDJSON when the client accepts it, as a JSON array
+    otherwise. Headers go out before the first item is read, so an error
+    while reading ends the body early (an incomplete document) and is logged.
+    """
+    if wants_ndjson(request):
+        chunks, media_type = ndjson_lines(items), NDJSON_MEDIA_TYPE
+    else:
+        chunks, media_type = json_array_chunks(items), "application/json"
+    return StreamingResponse(_iterate(_buffered(chunks), items), media_type=media_type)
+
+
+def _buffered(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_BUFFER_BYTES:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def _iterate(
+    chunks: Iterator[bytes], items: Iterator[BaseModel]
+) -> AsyncIterator[bytes]:
+    """
+    Runs the blocking generators on the worker threads and closes them even
+    when the client disconnects midway, so the database cursor behind items
+    is released before the request's connection goes back to the pool.
+    """
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    except Exception as e:
+        logger.exception(e)
+    finally:
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(chunks.close)
+            if hasattr(items, "close"):
+                await run_in_threadpool(items.close)
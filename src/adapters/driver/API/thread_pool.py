@@ -0,0 +1,30 @@
+import os
+from anyio import to_thread
+from loguru import logger
+
+from src.adapters.driven.infra.database.db import get_pool_stats
+
+DEFAULT_THREAD_POOL_SIZE = 40
+
+
+def thread_pool_size() -> int:
+    """
+    The route handlers are sync and run on the anyio worker threads, each one
+    holding at most one connection, so by default the pool matches the DB
+    connection pool: requests queue for a thread instead of timing out while
+    waiting for a connection.
+    """
+    configured = os.getenv("API_THREAD_POOL_SIZE")
+    if configured:
+        return int(configured)
+    pool_stats = get_pool_stats()
+    if pool_stats["pooled"]:
+        return pool_stats["max_connections"]
+    return DEFAULT_THREAD_POOL_SIZE
+
+
+def configure_thread_pool():
+    """Must run inside the event loop (e.g. on application startup)."""
+    size = thread_pool_size()
+    to_thread.current_default_thread_limiter().total_tokens = size
+    logger.info(f"Request thread pool sized to {size} workers")
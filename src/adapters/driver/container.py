@@ -0,0 +1,277 @@
+import os
+import threading
+from typing import Dict, Optional
+
+from src.adapters.driven.infra.cache.redis_cache_service import RedisCacheService
+from src.adapters.driven.infra.cache.redis_client import RedisConnectionPool
+from src.adapters.driven.infra.cache.redis_invalidation_bus import (
+    RedisInvalidationBus,
+)
+from src.adapters.driven.infra.ports.orm_categoria_query import OrmCategoriaQuery
+from src.adapters.driven.infra.ports.orm_cliente_query import OrmClienteQuery
+from src.adapters.driven.infra.ports.orm_currency_query import OrmCurrencyQuery
+from src.adapters.driven.infra.ports.orm_meio_de_pagamento_query import (
+    OrmMeioDePagamentoQuery,
+)
+from src.adapters.driven.infra.ports.orm_pedido_query import OrmPedidoQuery
+from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
+from src.adapters.driven.infra.repositories.orm_client_repository import (
+    OrmClientRepository,
+)
+from src.adapters.driven.infra.repositories.orm_pagamento_repository import (
+    OrmPagamentoRepository,
+)
+from src.adapters.driven.infra.repositories.orm_pedido_repository import (
+    OrmPedidoRepository,
+)
+from src.adapters.driven.infra.repositories.orm_produto_repository import (
+    OrmProdutoRepository,
+)
+from src.adapters.driven.payment_providers.providers.default_provider import (
+    DefaultPaymentProvider,
+)
+from src.core.application.services.catalog_snapshot_service import (
+    CatalogSnapshotService,
+)
+from src.core.application.services.cliente_service import ClienteCommand
+from src.core.application.services.pagamento_service import PagamentoService
+from src.core.application.services.pedido_service_command import PedidoServiceCommand
+from src.core.application.services.pedido_service_query import PedidoServiceQuery
+from src.core.application.services.produto_service_command import ProductServiceCommand
+from src.core.application.services.produto_service_query import ProdutoServiceQuery
+from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
+from src.core.domain.entities.produto_entity import ProdutoEntity
+from src.core.helpers.enums.eviction_policy import EvictionPolicy
+from src.core.helpers.interfaces.chace_service import CacheService
+from src.core.helpers.services.cache_namespace import CacheKeyspace
+from src.core.helpers.services.cached_query import CachedMethod, CachedQuery
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from src.core.helpers.services.tiered_cache import TieredCacheService
+
+# Shared by every namespace; the pods are limited to 512Mi
+# (k8s/app-deployment.yaml).
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Matches DB_POOL_MAX_CONNECTIONS: one per concurrent request thread.
+DEFAULT_REDIS_CONNECTIONS = 20
+# Upper bound on how long another pod's write can go unseen in L1.
+DEFAULT_CACHE_L1_TTL = 5
+
+PEDIDO_CACHE_TTL = 300
+CLIENTE_CACHE_TTL = 300
+PRODUTO_CACHE_TTL = 300
+# Past the TTL one request reloads a product while the others keep using the
+# previous version for up to this long, instead of all querying it at once.
+PRODUTO_CACHE_STALE_TTL = 60
+CATALOG_QUERY_CACHE_TTL = 600
+# Ids and documents that do not exist yet; creating them drops the entry.
+NEGATIVE_CACHE_TTL = 30
+
+
+def build_memory_cache() -> InMemoryCacheService:
+    max_entries = os.getenv("CACHE_MAX_ENTRIES")
+    return InMemoryCacheService(
+        max_entries=int(max_entries) if max_entries else None,
+        max_bytes=int(os.getenv("CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)),
+        eviction_policy=EvictionPolicy(os.getenv("CACHE_EVICTION_POLICY", "tinylfu")),
+    )
+
+
+def build_cache() -> CacheService:
+    """
+    With CACHE_REDIS_URL, a bounded in-memory L1 per process in front of the
+    Redis shared by every pod, kept coherent by invalidation messages;
+    otherwise just the in-memory cache.
+    """
+    redis_url = os.getenv("CACHE_REDIS_URL")
+    if not redis_url:
+        return build_memory_cache()
+    redis_secret = os.getenv("CACHE_REDIS_SECRET")
+    if not redis_secret:
+        raise ValueError("CACHE_REDIS_SECRET é obrigatório com CACHE_REDIS_URL.")
+    pool = RedisConnectionPool(
+        redis_url,
+        max_connections=int(
+            os.getenv("CACHE_REDIS_MAX_CONNECTIONS", DEFAULT_REDIS_CONNECTIONS)
+        ),
+    )
+    return TieredCacheService(
+        build_memory_cache(),
+        RedisCacheService(pool, redis_secret.encode()),
+        RedisInvalidationBus(pool),
+        l1_ttl=int(os.getenv("CACHE_L1_TTL", DEFAULT_CACHE_L1_TTL)),
+    )
+
+
+class Container:
+    """
+    Application-lifetime singletons: caches, ports, repositories and the
+    stateless application services are built once per process and shared by
+    every router and event handler.
+    """
+
+    def __init__(self):
+        self.cache = build_cache()
+        self.cache_keyspace = CacheKeyspace(self.cache)
+        self.pedido_cache = self.cache_keyspace.namespace(
+            "pedido",
+            PedidoAggregate,
+            ttl=PEDIDO_CACHE_TTL,
+            negative_ttl=NEGATIVE_CACHE_TTL,
+        )
+        self.produto_cache = self.cache_keyspace.namespace(
+            "produto",
+            ProdutoEntity,
+            ttl=PRODUTO_CACHE_TTL,
+            stale_ttl=PRODUTO_CACHE_STALE_TTL,
+            negative_ttl=NEGATIVE_CACHE_TTL,
+        )
+
+        self.pedido_query = OrmPedidoQuery()
+        self.cached_pedido_query = self._cached_query(
+            "pedido",
+            self.pedido_query,
+            {
+                "get": CachedMethod(
+                    PEDIDO_CACHE_TTL, by_item=True, negative_ttl=NEGATIVE_CACHE_TTL
+                ),
+            },
+        )
+        # Commands validate writes against the database, so only the read
+        # side goes through the cache.
+        self.produto_query = OrmProductQuery()
+        self.cached_produto_query = self._cached_query(
+            "produto",
+            self.produto_query,
+            {
+                "get": CachedMethod(
+                    PRODUTO_CACHE_TTL, by_item=True, negative_ttl=NEGATIVE_CACHE_TTL
+                ),
+                "get_all": CachedMethod(PRODUTO_CACHE_TTL),
+                "find": CachedMethod(PRODUTO_CACHE_TTL),
+                "find_page": CachedMethod(PRODUTO_CACHE_TTL),
+            },
+        )
+        self.categoria_query = self._cached_catalog_query(
+            "categoria", OrmCategoriaQuery()
+        )
+        self.currency_query = self._cached_catalog_query("currency", OrmCurrencyQuery())
+        self.cliente_query = OrmClienteQuery()
+        self.cached_cliente_query = self._cached_query(
+            "cliente",
+            self.cliente_query,
+            {
+                "find": CachedMethod(
+                    CLIENTE_CACHE_TTL, negative_ttl=NEGATIVE_CACHE_TTL
+                ),
+            },
+        )
+        self.meio_de_pagamento_query = self._cached_catalog_query(
+            "meio_de_pagamento", OrmMeioDePagamentoQuery()
+        )
+        self.catalog_snapshot = CatalogSnapshotService(
+            self.produto_query,
+            self.categoria_query,
+            self.currency_query,
+            self.meio_de_pagamento_query,
+            self.cache_keyspace.namespace("catalog_snapshot", str),
+        )
+
+        self.pedido_repository = OrmPedidoRepository(
+            self.pedido_cache, [self.cached_pedido_query.invalidate]
+        )
+        self.produto_repository = OrmProdutoRepository(
+            self.produto_cache,
+            [self.cached_produto_query.invalidate, self.catalog_snapshot.invalidate],
+        )
+        self.pagamento_repository = OrmPagamentoRepository()
+        self.cliente_repository = OrmClientRepository(
+            [self.cached_cliente_query.invalidate]
+        )
+
+        self.pedido_command = PedidoServiceCommand(
+            self.pedido_repository,
+            self.pedido_query,
+            self.produto_query,
+            self.produto_cache,
+        )
+        self.pedido_query_service = PedidoServiceQuery(self.cached_pedido_query)
+        self.produto_command = ProductServiceCommand(
+            self.produto_repository,
+            self.produto_query,
+            self.categoria_query,
+            self.currency_query,
+        )
+        self.produto_query_service = ProdutoServiceQuery(
+            self.cached_produto_query, self.categoria_query, self.currency_query
+        )
+        # Persona.document is unique, so a stale cached miss cannot create a
+        # duplicate client.
+        self.cliente_service = ClienteCommand(
+            self.cliente_repository, self.cached_cliente_query
+        )
+
+    def _cached_query(
+        self, name: str, query: object, methods: Dict[str, CachedMethod]
+    ) -> CachedQuery:
+        namespace = self.cache_keyspace.namespace(f"{name}_query", object)
+        return CachedQuery(query, namespace, methods)
+
+    def _cached_catalog_query(self, name: str, query: object) -> CachedQuery:
+        """Categories, currencies and payment methods only change by seed."""
+        return self._cached_query(
+            name,
+            query,
+            {
+                "get": CachedMethod(CATALOG_QUERY_CACHE_TTL, by_item=True),
+                "get_all": CachedMethod(CATALOG_QUERY_CACHE_TTL),
+                "find": CachedMethod(CATALOG_QUERY_CACHE_TTL),
+            },
+        )
+
+    def create_pagamento_service(self) -> PagamentoService:
+        """
+        PagamentoService carries the payment provider and notification services
+        of a single payment, so it is built per use on top of the shared ports.
+        """
+        return PagamentoService(
+            self.pagamento_repository,
+            self.pedido_repository,
+            self.pedido_query,
+            self.meio_de_pagamento_query,
+            DefaultPaymentProvider(),
+            [],
+        )
+
+    def invalidate_caches(self):
+        """
+        For writes made outside the repositories, such as the seed: drops
+        every namespace, then runs the product repository's hooks so the
+        menu snapshot is rebuilt, in every pod.
+        """
+        self.cache_keyspace.clear()
+        for hook in self.produto_repository.invalidation_hooks:
+            hook()
+
+    def shutdown(self):
+        self.cache.close()
+
+
+_container: Optional[Container] = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> Container:
+    global _container
+    if _container is None:
+        with _container_lock:
+            if _container is None:
+                _container = Container()
+    return _container
+
+
+def reset_container():
+    global _container
+    with _container_lock:
+        if _container is not None:
+            _container.shutdown()
+        _container = None
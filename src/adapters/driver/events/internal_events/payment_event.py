@@ -2,24 +2,10 @@ import json
 from loguru import logger
 from src.adapters.driven.events.model.notification import Notification
 from src.adapters.driven.events.services.webhook.web_hook_service import WebHookService
-from src.adapters.driven.infra.ports.orm_meio_de_pagamento_query import (
-    OrmMeioDePagamentoQuery,
-)
-from src.adapters.driven.infra.ports.orm_pedido_query import OrmPedidoQuery
-from src.adapters.driven.infra.repositories.orm_pagamento_repository import (
-    OrmPagamentoRepository,
-)
-from src.adapters.driven.infra.repositories.orm_pedido_repository import (
-    OrmPedidoRepository,
-)
 from src.adapters.driven.payment_providers.functions.get_payment_provider_from_sys_name import (
     get_payment_provider_from_sys_name,
 )
-from src.adapters.driven.payment_providers.providers.default_provider import (
-    DefaultPaymentProvider,
-)
-from src.core.application.services.pagamento_service import PagamentoService
-from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from src.adapters.driver.container import get_container
 from src.adapters.driver.events.interface.event import Event
 
 
@@ -28,14 +14,7 @@ class PaymentEvent(Event):
         super().__init__(notification)
         notification_body = json.loads(notification.message)
 
-        self.pagamento_service = PagamentoService(
-            OrmPagamentoRepository(),
-            OrmPedidoRepository(InMemoryCacheService()),
-            OrmPedidoQuery(),
-            OrmMeioDePagamentoQuery(),
-            DefaultPaymentProvider(),
-            [],
-        )
+        self.pagamento_service = get_container().create_pagamento_service()
         payment = self.pagamento_service.get_payment(notification_body["payment_id"])
         web_hook_service = (
             WebHookService(payment.payment.webhook_url)
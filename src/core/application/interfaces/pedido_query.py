@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterator, Optional
 
 from src.core.application.ports.pedido_query import PedidoQuery
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
+from src.core.helpers.base.page import Page
 from src.core.helpers.options.pedido_find_options import PedidoFindOptions
 
 
@@ -17,8 +19,18 @@ class IPedidoQuery(ABC):
     def get(self, pedido_id: int) -> PedidoAggregate:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_version(self, pedido_id: int) -> Optional[datetime]:
+        raise NotImplementedError()
+
     @abstractmethod
     def index(
         self, options: Optional[PedidoFindOptions] = None
-    ) -> List[PedidoAggregate]:
+    ) -> Page[PedidoAggregate]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def export(
+        self, options: Optional[PedidoFindOptions] = None
+    ) -> Iterator[PedidoAggregate]:
         raise NotImplementedError()
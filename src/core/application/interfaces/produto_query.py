@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 
 from src.core.application.ports.produto_query import ProdutoQuery
@@ -6,6 +7,7 @@ from src.core.application.ports.categoria_query import CategoriaQuery
 from src.core.application.ports.currency_query import CurrencyQuery
 from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
 from src.core.domain.entities.categoria_entity import CategoriaEntity
+from src.core.helpers.base.page import Page
 from src.core.helpers.options.produto_find_options import ProdutoFindOptions
 
 
@@ -24,10 +26,14 @@ class IProdutoQuery(ABC):
     def get(self, product_id: int) -> ProdutoAggregate:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_version(self, product_id: int) -> Optional[datetime]:
+        raise NotImplementedError()
+
     @abstractmethod
     def index(
         self, options: Optional[ProdutoFindOptions] = None
-    ) -> List[ProdutoAggregate]:
+    ) -> Page[ProdutoAggregate]:
         raise NotImplementedError()
 
     @abstractmethod
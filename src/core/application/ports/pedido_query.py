@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterator, Optional
 
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
+from src.core.helpers.base.page import Page
 from src.core.helpers.options.pedido_find_options import PedidoFindOptions
 
 
@@ -9,6 +12,14 @@ class PedidoQuery(ABC):
     def get(self, item_id: int) -> PedidoAggregate:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_version(self, item_id: int) -> Optional[datetime]:
+        """
+        When the order or its payments last changed, without loading the
+        aggregate; None if the order does not exist.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def get_all(self) -> list[PedidoAggregate]:
         raise NotImplementedError()
@@ -16,3 +27,15 @@ class PedidoQuery(ABC):
     @abstractmethod
     def find(self, query_options: PedidoFindOptions) -> list[PedidoAggregate]:
         raise NotImplementedError()
+
+    @abstractmethod
+    def find_page(self, query_options: PedidoFindOptions) -> Page[PedidoAggregate]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def stream(self, query_options: PedidoFindOptions) -> Iterator[PedidoAggregate]:
+        """
+        What find_page pages through, without limit, as a generator that
+        keeps a bounded number of orders in memory.
+        """
+        raise NotImplementedError()
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
 
 from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
 from src.core.domain.entities.produto_entity import ProdutoEntity
+from src.core.helpers.base.page import Page
 from src.core.helpers.options.produto_find_options import ProdutoFindOptions
 
 
@@ -14,6 +17,14 @@ class ProdutoQuery(ABC):
     def get(self, item_id: int) -> ProdutoAggregate:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_version(self, item_id: int) -> Optional[datetime]:
+        """
+        When the product or one of its components last changed, without
+        loading the aggregate; None if the product does not exist.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def get_all(self) -> list[ProdutoAggregate]:
         raise NotImplementedError()
@@ -21,3 +32,7 @@ class ProdutoQuery(ABC):
     @abstractmethod
     def find(self, query_options: ProdutoFindOptions) -> list[ProdutoAggregate]:
         raise NotImplementedError()
+
+    @abstractmethod
+    def find_page(self, query_options: ProdutoFindOptions) -> Page[ProdutoAggregate]:
+        raise NotImplementedError()
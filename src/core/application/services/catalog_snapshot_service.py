@@ -0,0 +1,124 @@
+from hashlib import sha1
+from typing import Dict, List, NamedTuple, Optional
+import threading
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.core.application.ports.categoria_query import CategoriaQuery
+from src.core.application.ports.currency_query import CurrencyQuery
+from src.core.application.ports.meio_de_pagamento_query import MeioDePagamentoQuery
+from src.core.application.ports.produto_query import ProdutoQuery
+from src.core.domain.entities.categoria_entity import CategoriaEntity
+from src.core.domain.entities.currency_entity import CurrencyEntity
+from src.core.domain.entities.meio_de_pagamento_entity import MeioDePagamentoEntity
+from src.core.domain.entities.produto_entity import ProdutoEntity
+from src.core.helpers.interfaces.chace_service import CacheService
+from src.core.helpers.services.cache_generation import CacheGeneration
+from src.core.helpers.options.produto_find_options import ProdutoFindOptions
+
+VERSION_KEY = "version"
+
+
+class CatalogMenu(BaseModel):
+    version: str
+    products: List[ProdutoEntity]
+    categories: List[CategoriaEntity]
+    currencies: List[CurrencyEntity]
+    payment_methods: List[MeioDePagamentoEntity]
+
+
+class CatalogSection(NamedTuple):
+    body: bytes
+    # Quoted digest of body, so every pod serving the same data agrees on it.
+    etag: str
+
+
+class CatalogSnapshot(NamedTuple):
+    version: str
+    sections: Dict[str, CatalogSection]
+
+
+class CatalogSnapshotService:
+    """
+    The active menu (products with their components, categories, currencies
+    and payment methods) kept serialized in memory, so kiosk reads skip the
+    queries, the mappers and the JSON encoding.
+
+    The snapshot is rebuilt on the first read after invalidate, which the
+    product repository calls on every write. The version is a token stored in
+    the shared cache, so a write on any pod makes every pod rebuild.
+    """
+
+    MENU = "menu"
+    CATEGORIES = "categories"
+    PAYMENT_METHODS = "payment_methods"
+
+    def __init__(
+        self,
+        product_query: ProdutoQuery,
+        category_query: CategoriaQuery,
+        currency_query: CurrencyQuery,
+        payment_method_query: MeioDePagamentoQuery,
+        cache: CacheService,
+    ):
+        self.product_query = product_query
+        self.category_query = category_query
+        self.currency_query = currency_query
+        self.payment_method_query = payment_method_query
+        self.cache = cache
+        self._version = CacheGeneration(cache, VERSION_KEY)
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+
+    def section(self, name: str) -> CatalogSection:
+        return self.snapshot().sections[name]
+
+    def snapshot(self) -> CatalogSnapshot:
+        version = self._version.current()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = self._build(version)
+            return self._snapshot
+
+    def invalidate(self, item_id: Optional[int] = None) -> None:
+        self._version.bump()
+
+    def _build(self, version: str) -> CatalogSnapshot:
+        """
+        Reads the data after the version, so a write landing meanwhile
+        changes the version again and the next read rebuilds.
+        """
+        products = self.product_query.find_page(ProdutoFindOptions()).items
+        categories = self.category_query.get_all()
+        currencies = self.currency_query.get_all()
+        payment_methods = self.payment_method_query.get_all()
+        menu = CatalogMenu(
+            version=version,
+            products=[
+                aggregate.product
+                for aggregate in products
+                if aggregate.product.is_active and aggregate.product.deleted_at is None
+            ],
+            categories=categories,
+            currencies=[currency for currency in currencies if currency.is_active],
+            payment_methods=[method for method in payment_methods if method.is_active],
+        )
+        return CatalogSnapshot(
+            version,
+            {
+                self.MENU: _section(menu.model_dump_json().encode()),
+                self.CATEGORIES: _section(
+                    TypeAdapter(List[CategoriaEntity]).dump_json(categories)
+                ),
+                self.PAYMENT_METHODS: _section(
+                    TypeAdapter(List[MeioDePagamentoEntity]).dump_json(payment_methods)
+                ),
+            },
+        )
+
+
+def _section(body: bytes) -> CatalogSection:
+    return CatalogSection(body, f'"{sha1(body).hexdigest()}"')
@@ -42,10 +42,7 @@ class PedidoServiceCommand(IPedidoCommand):
         pedido = self.purchase_repository.get_by_purchase_id(pedido_id)
         if not pedido:
             raise ValueError("Pedido não encontrado")
-        produto = self.cache_service.get(
-            product_id
-        ) or self.produto_query.get_only_entity(product_id)
-        self.cache_service.set(product_id, produto)
+        produto = self._get_product(product_id)
         if not produto:
             raise ValueError("Produto não encontrado")
         if pedido.purchase.status != CompraStatus.CRIANDO:
@@ -74,20 +71,14 @@ class PedidoServiceCommand(IPedidoCommand):
         self, pedido_id: int, selected_product_id: int, component_id: int
     ):
         pedido = self.purchase_repository.get_by_purchase_id(pedido_id)
-        adding_product = self.cache_service.get(
-            selected_product_id
-        ) or self.produto_query.get_only_entity(selected_product_id)
-        self.cache_service.set(selected_product_id, adding_product)
+        adding_product = self._get_product(selected_product_id)
         if not any(
             component
             for component in adding_product.components
             if component.id == component_id
         ):
             raise ValueError("Produto não possui esse adicional.")
-        new_component = self.cache_service.get(
-            component_id
-        ) or self.produto_query.get_only_entity(component_id)
-        self.cache_service.set(component_id, new_component)
+        new_component = self._get_product(component_id)
         target_selected_product = next(
             (
                 selected_product
@@ -120,6 +111,11 @@ class PedidoServiceCommand(IPedidoCommand):
         pedido.purchase.status = new_status
         return self.purchase_repository.update(pedido.purchase)
 
+    def _get_product(self, product_id: int):
+        return self.cache_service.get_or_load(
+            product_id, lambda: self.produto_query.get_only_entity(product_id)
+        )
+
     def _calculate_total_value(self, compra: CompraEntity):
         total = 0
         for selected_product in compra.selected_products:
@@ -1,6 +1,8 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterator, Optional
 from src.core.application.interfaces.pedido_query import IPedidoQuery
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
+from src.core.helpers.base.page import Page
 from src.core.helpers.options.pedido_find_options import PedidoFindOptions
 
 
@@ -10,10 +12,15 @@ class PedidoServiceQuery(IPedidoQuery):
         result = self.purchase_query.get(pedido_id)
         return result or None
 
+    def get_version(self, pedido_id: int) -> Optional[datetime]:
+        return self.purchase_query.get_version(pedido_id)
+
     def index(
         self, options: Optional[PedidoFindOptions] = None
-    ) -> List[PedidoAggregate]:
-        if not options:
-            return self.purchase_query.get_all()
-        result = self.purchase_query.find(options)
-        return result or None
+    ) -> Page[PedidoAggregate]:
+        return self.purchase_query.find_page(options or PedidoFindOptions())
+
+    def export(
+        self, options: Optional[PedidoFindOptions] = None
+    ) -> Iterator[PedidoAggregate]:
+        return self.purchase_query.stream(options or PedidoFindOptions())
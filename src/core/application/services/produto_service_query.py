@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import List, Optional
 from src.core.application.interfaces.produto_query import IProdutoQuery
 from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
 from src.core.domain.entities.categoria_entity import CategoriaEntity
+from src.core.helpers.base.page import Page
 from src.core.helpers.options.produto_find_options import ProdutoFindOptions
 
 
@@ -13,12 +15,13 @@ class ProdutoServiceQuery(IProdutoQuery):
             raise ValueError("Produto não encontrado")
         return product
 
+    def get_version(self, product_id: int) -> Optional[datetime]:
+        return self.product_query.get_version(product_id)
+
     def index(
         self, options: Optional[ProdutoFindOptions] = None
-    ) -> List[ProdutoAggregate]:
-        if not options:
-            return self.product_query.get_all()
-        return self.product_query.find(options)
+    ) -> Page[ProdutoAggregate]:
+        return self.product_query.find_page(options or ProdutoFindOptions())
 
     def list_categories(self) -> List[CategoriaEntity]:
         return self.category_query.get_all()
@@ -1,8 +1,22 @@
 from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+InvalidationHook = Callable[[Optional[int]], None]
 
 
 class Repository(ABC):
 
+    def __init__(self, invalidation_hooks: Optional[List[InvalidationHook]] = None):
+        """
+        invalidation_hooks are called with the written id after each write,
+        e.g. to drop cached query results.
+        """
+        self.invalidation_hooks = invalidation_hooks or []
+
+    def _notify_write(self, item_id: Optional[int]):
+        for hook in self.invalidation_hooks:
+            hook(item_id)
+
     @abstractmethod
     def __enter__(self):
         raise NotImplementedError()
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
 from src.core.domain.aggregates.pedido_aggregate import PedidoAggregate
-from src.core.domain.base.repository import Repository
+from src.core.domain.base.repository import InvalidationHook, Repository
 from src.core.domain.entities.compra_entity import CompraEntity, PartialCompraEntity
 from src.core.domain.entities.pagamento_entity import (
     PagamentoEntity,
@@ -14,8 +14,12 @@ from src.core.helpers.options.pedido_find_options import PedidoFindOptions
 
 class PedidoRepository(Repository, ABC):
 
-    def __init__(self, cache_service: CacheService):
-        super().__init__()
+    def __init__(
+        self,
+        cache_service: CacheService,
+        invalidation_hooks: Optional[List[InvalidationHook]] = None,
+    ):
+        super().__init__(invalidation_hooks)
         self.cache_service = cache_service
 
     @abstractmethod
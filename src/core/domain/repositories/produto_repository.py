@@ -1,14 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional
 
 from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
-from src.core.domain.base.repository import Repository
+from src.core.domain.base.repository import InvalidationHook, Repository
 from src.core.domain.entities.produto_entity import PartialProdutoEntity, ProdutoEntity
+from src.core.helpers.interfaces.chace_service import CacheService
 from src.core.helpers.options.produto_find_options import ProdutoFindOptions
 
 
 class ProdutoRepository(Repository, ABC):
 
+    def __init__(
+        self,
+        cache_service: CacheService,
+        invalidation_hooks: Optional[List[InvalidationHook]] = None,
+    ):
+        super().__init__(invalidation_hooks)
+        self.cache_service = cache_service
+
+    def _invalidate(self, produto_id: int):
+        """Also drops a cached miss when produto_id is a new product."""
+        self.cache_service.delete(produto_id)
+        self._notify_write(produto_id)
+
     @abstractmethod
     def create(self, produto: PartialProdutoEntity) -> ProdutoAggregate:
         raise NotImplementedError()
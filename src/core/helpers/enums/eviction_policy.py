@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class EvictionPolicy(Enum):
+    LRU = "lru"
+    LFU = "lfu"
+    TINY_LFU = "tinylfu"
@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    """
+    The values of cursor, one per type: int or datetime (sent as an ISO
+    string). Anything else, e.g. a cursor edited by the client, is invalid.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        raise ValueError("Cursor inválido.")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Cursor inválido.")
+    return [
+        _decode_value(value, value_type) for value, value_type in zip(values, types)
+    ]
+
+
+def _decode_value(value: Any, value_type: type) -> Any:
+    if value_type is datetime and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError("Cursor inválido.")
+    if value_type is int and isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise ValueError("Cursor inválido.")
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+# Receives the invalidated keys, or None when every key must be dropped
+# (clear, or messages may have been missed while disconnected).
+InvalidationHandler = Callable[[Optional[List[str]]], None]
+
+
+class CacheInvalidationBus(ABC):
+    """Broadcasts cache invalidations to the other processes."""
+
+    @abstractmethod
+    def publish(self, keys: Optional[List[str]]) -> None:
+        pass
+
+    @abstractmethod
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        """handler is not called for messages published by this process."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+
+from src.core.helpers.interfaces.cache_invalidation_bus import InvalidationHandler
 
 
 class CacheService(ABC):
     @abstractmethod
-    def set(self, key: str, value: any, ttl: int = 300) -> None:
+    def set(self, key: str, value: any, ttl: int = 300, pin: bool = False) -> None:
+        """
+        pin keeps the entry until it expires or is replaced, exempt from the
+        eviction of a bounded cache; for control keys such as generations.
+        """
         pass
 
     @abstractmethod
@@ -17,3 +24,66 @@ class CacheService(ABC):
     @abstractmethod
     def clear(self) -> None:
         pass
+
+    @abstractmethod
+    def get_or_set(
+        self, key: str, value: any, ttl: int = 300, pin: bool = False
+    ) -> any:
+        """
+        Atomically stores value if key is absent; returns the cached value,
+        or None if value was absent and could not be stored (refused by a
+        bounded cache). Pinned values are never refused.
+        """
+        pass
+
+    @abstractmethod
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], any],
+        ttl: int = 300,
+        stale_ttl: int = 0,
+        early_refresh_beta: float = 1.0,
+        negative_ttl: int = 0,
+    ) -> any:
+        """
+        Returns the cached value or loads and caches it, running loader once
+        for all concurrent misses of the key. A None result is only cached,
+        for negative_ttl seconds, when negative_ttl is given.
+        """
+        pass
+
+    @abstractmethod
+    def get_with_version(self, key: str) -> Tuple[any, Optional[int]]:
+        """Returns the value and the version to pass to compare_and_set."""
+        pass
+
+    @abstractmethod
+    def compare_and_set(
+        self, key: str, version: Optional[int], value: any, ttl: int = 300
+    ) -> bool:
+        """
+        Stores value only if key still holds the given version (None: only if
+        absent). Returns False, leaving the entry untouched, otherwise.
+        """
+        pass
+
+    def stats(self) -> Optional[Dict[str, Dict[str, int]]]:
+        """
+        Backend counters by namespace (the key up to its first ":"), such as
+        entries, bytes, evictions and expirations. None for backends that do
+        not track them per key.
+        """
+        return None
+
+    def subscribe_invalidations(self, handler: InvalidationHandler) -> None:
+        """
+        Calls handler with the keys other processes write or delete, after
+        this cache has dropped its own copies. A no-op for caches private to
+        this process.
+        """
+        pass
+
+    def close(self) -> None:
+        """Releases background threads and connections on shutdown."""
+        pass
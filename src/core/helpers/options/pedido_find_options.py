@@ -7,3 +7,5 @@ from src.core.helpers.enums.compra_status import CompraStatus
 class PedidoFindOptions(RepositoryOptions):
     status: Optional[List[CompraStatus]] = None
     total_value_range: Optional[Tuple[Optional[float], Optional[float]]] = None
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
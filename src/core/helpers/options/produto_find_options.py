@@ -6,3 +6,5 @@ class ProdutoFindOptions(RepositoryOptions):
     name: Optional[str] = None
     category: Optional[str] = None
     price_range: Optional[Tuple[Optional[float], Optional[float]]] = None
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
@@ -0,0 +1,188 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from typing import Dict, Hashable, Optional
+
+from src.core.helpers.enums.eviction_policy import EvictionPolicy
+
+_MASK_64 = (1 << 64) - 1
+
+
+class CacheEviction(ABC):
+    """
+    Tracks the keys of a bounded cache and picks which one to drop. The cache
+    calls every method while holding its lock.
+    """
+
+    @abstractmethod
+    def record_access(self, key: Hashable) -> None:
+        """Called on every hit and on every set, before the key is inserted."""
+
+    @abstractmethod
+    def record_insert(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def victim(self) -> Optional[Hashable]:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def admit(self, candidate: Hashable, victim: Hashable) -> bool:
+        return True
+
+
+class LRUEviction(CacheEviction):
+    def __init__(self):
+        self._order: OrderedDict = OrderedDict()
+
+    def record_access(self, key: Hashable) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def record_insert(self, key: Hashable) -> None:
+        self._order[key] = None
+
+    def remove(self, key: Hashable) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[Hashable]:
+        return next(iter(self._order), None)
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class LFUEviction(CacheEviction):
+    """O(1) LFU: keys are bucketed by hit count, LRU order inside a bucket."""
+
+    def __init__(self):
+        self._frequency: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, OrderedDict] = defaultdict(OrderedDict)
+        self._min_frequency = 0
+
+    def record_access(self, key: Hashable) -> None:
+        frequency = self._frequency.get(key)
+        if frequency is None:
+            return
+        self._unlink(key, frequency)
+        if self._min_frequency == frequency and frequency not in self._buckets:
+            self._min_frequency = frequency + 1
+        self._frequency[key] = frequency + 1
+        self._buckets[frequency + 1][key] = None
+
+    def record_insert(self, key: Hashable) -> None:
+        self._frequency[key] = 1
+        self._buckets[1][key] = None
+        self._min_frequency = 1
+
+    def remove(self, key: Hashable) -> None:
+        frequency = self._frequency.pop(key, None)
+        if frequency is not None:
+            self._unlink(key, frequency)
+
+    def victim(self) -> Optional[Hashable]:
+        if not self._frequency:
+            return None
+        if self._min_frequency not in self._buckets:
+            self._min_frequency = min(self._buckets)
+        return next(iter(self._buckets[self._min_frequency]))
+
+    def clear(self) -> None:
+        self._frequency.clear()
+        self._buckets.clear()
+        self._min_frequency = 0
+
+    def _unlink(self, key: Hashable, frequency: int):
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+
+
+class FrequencySketch:
+    """
+    Count-min sketch with 4-bit saturating counters. Every counter is halved
+    after sample_factor * width increments, so old popularity fades out.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, width: int = 1 << 14, sample_factor: int = 10):
+        self._mask = (1 << (width - 1).bit_length()) - 1
+        self._rows = [bytearray(self._mask + 1) for _ in range(self.DEPTH)]
+        self._sample_size = sample_factor * (self._mask + 1)
+        self._additions = 0
+
+    def increment(self, key: Hashable) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def reset(self) -> None:
+        for row in self._rows:
+            row[:] = bytes(len(row))
+        self._additions = 0
+
+    def _indexes(self, key: Hashable):
+        # Double hashing over a mixed 64-bit hash keeps the rows independent;
+        # hashing (key, seed) tuples gives nearly identical low bits per row.
+        mixed = _mix64(hash(key))
+        first, second = mixed & 0xFFFFFFFF, (mixed >> 32) | 1
+        return [(first + row * second) & self._mask for row in range(self.DEPTH)]
+
+    def _age(self):
+        for row in self._rows:
+            row[:] = bytes(count >> 1 for count in row)
+        self._additions //= 2
+
+
+def _mix64(value: int) -> int:
+    """splitmix64 finalizer."""
+    value &= _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+class TinyLFUEviction(LRUEviction):
+    """
+    LRU order with TinyLFU admission: a new key only displaces the LRU victim
+    if it has been requested more often recently, so a one-off scan (e.g. a
+    backoffice listing) cannot flush the hot menu and queue entries.
+    """
+
+    def __init__(self, sketch_width: int = 1 << 14):
+        super().__init__()
+        self._sketch = FrequencySketch(sketch_width)
+
+    def record_access(self, key: Hashable) -> None:
+        self._sketch.increment(key)
+        super().record_access(key)
+
+    def admit(self, candidate: Hashable, victim: Hashable) -> bool:
+        return self._sketch.estimate(candidate) > self._sketch.estimate(victim)
+
+    def clear(self) -> None:
+        super().clear()
+        self._sketch.reset()
+
+
+def build_cache_eviction(policy: EvictionPolicy) -> CacheEviction:
+    if policy == EvictionPolicy.LFU:
+        return LFUEviction()
+    if policy == EvictionPolicy.TINY_LFU:
+        return TinyLFUEviction()
+    return LRUEviction()
@@ -0,0 +1,72 @@
+from time import monotonic
+from typing import Callable, List, Optional, Tuple
+import threading
+import uuid
+
+from src.core.helpers.interfaces.chace_service import CacheService
+
+# Upper bound, in seconds, on how long a lost invalidation message can keep a
+# process on a replaced generation.
+DEFAULT_LOCAL_TTL = 1
+
+
+class CacheGeneration:
+    """
+    A token stored in a shared cache under key; replacing it orphans every
+    entry keyed under the previous one, in every process sharing the cache.
+
+    Reads are served from a local copy for local_ttl seconds, so building a
+    key costs no cache lookup. The copy is dropped as soon as the cache
+    reports key invalidated by another process, and a token is only drawn
+    when the cache holds none. While the cache cannot store one, the process
+    keeps its own, so its keys stay stable until the cache is back.
+    """
+
+    def __init__(
+        self,
+        cache: CacheService,
+        key: str,
+        local_ttl: float = DEFAULT_LOCAL_TTL,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.cache = cache
+        self.key = key
+        self.local_ttl = local_ttl
+        self._clock = clock
+        # The token and when the copy expires, replaced as one.
+        self._local: Optional[Tuple[str, float]] = None
+        self._last: Optional[str] = None
+        self._lock = threading.Lock()
+        cache.subscribe_invalidations(self._on_invalidate)
+
+    def current(self) -> str:
+        local = self._local
+        if local is not None and self._clock() < local[1]:
+            return local[0]
+        with self._lock:
+            local = self._local
+            if local is not None and self._clock() < local[1]:
+                return local[0]
+            token = self.cache.get(self.key)
+            if token is None:
+                token = self.cache.get_or_set(
+                    self.key, uuid.uuid4().hex, ttl=0, pin=True
+                )
+            if token is None:
+                token = self._last or uuid.uuid4().hex
+            self._keep(token)
+            return token
+
+    def bump(self) -> None:
+        token = uuid.uuid4().hex
+        self.cache.set(self.key, token, ttl=0, pin=True)
+        with self._lock:
+            self._keep(token)
+
+    def _keep(self, token: str):
+        self._last = token
+        self._local = (token, self._clock() + self.local_ttl)
+
+    def _on_invalidate(self, keys: Optional[List[str]]):
+        if keys is None or self.key in keys:
+            self._local = None
@@ -0,0 +1,273 @@
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Type
+import threading
+
+from src.core.helpers.interfaces.cache_invalidation_bus import InvalidationHandler
+from src.core.helpers.interfaces.chace_service import CacheService
+from src.core.helpers.services.cache_generation import CacheGeneration
+
+# Upper bounds, in seconds, from a primary-key lookup to a full catalog scan.
+LOAD_SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram; the snapshot counts are cumulative, each bucket
+    holding the observations up to its bound, as Prometheus exposes them.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LOAD_SECONDS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+
+    def observe(self, seconds: float):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+
+    def snapshot(self) -> Dict[str, any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {"count": running, "sum": total, "buckets": cumulative}
+
+
+class CacheStats:
+    """Hit/miss counters of one namespace, safe to bump from request threads."""
+
+    FIELDS = ("hits", "misses", "loads", "sets", "deletes")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+        self.load_seconds = LatencyHistogram()
+
+    def record(self, field: str, amount: int = 1):
+        with self._lock:
+            self._counts[field] += amount
+
+    def snapshot(self) -> Dict[str, any]:
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_ratio"] = counts["hits"] / lookups if lookups else 0.0
+        counts["load_seconds"] = self.load_seconds.snapshot()
+        return counts
+
+
+class CacheNamespace(CacheService):
+    """
+    A typed view over a shared cache: keys are prefixed with the namespace,
+    the entity type and its schema version, so product 5 and pedido 5 never
+    collide and bumping version orphans snapshots of an older entity shape.
+    Only values of entity_type are accepted. ttl and stale_ttl are the
+    namespace defaults, used when a call does not give its own, as is
+    negative_ttl, how long get_or_load remembers that a key has no value.
+    """
+
+    def __init__(
+        self,
+        cache: CacheService,
+        name: str,
+        entity_type: Type,
+        ttl: int = 300,
+        stale_ttl: int = 0,
+        version: int = 1,
+        negative_ttl: int = 0,
+    ):
+        self.cache = cache
+        self.name = name
+        self.entity_type = entity_type
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.version = version
+        self.stats = CacheStats()
+        self._generation = CacheGeneration(cache, self.generation_key)
+
+    @property
+    def generation_key(self) -> str:
+        # Outside the namespace's own prefix, so its entry stats leave it out.
+        return f"generation:{self.name}:{self.entity_type.__name__}:v{self.version}"
+
+    @property
+    def prefix(self) -> str:
+        return (
+            f"{self.name}:{self.entity_type.__name__}:v{self.version}"
+            f":g{self._generation.current()}:"
+        )
+
+    def key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key}"
+
+    def set(
+        self, key: Hashable, value: any, ttl: Optional[int] = None, pin: bool = False
+    ) -> None:
+        self._check_type(value)
+        self.stats.record("sets")
+        self.cache.set(self.key(key), value, self._ttl(ttl), pin)
+
+    def get(self, key: Hashable) -> any:
+        value = self.cache.get(self.key(key))
+        self.stats.record("misses" if value is None else "hits")
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        self.stats.record("deletes")
+        self.cache.delete(self.key(key))
+
+    def clear(self) -> None:
+        """
+        Moves the namespace to a new generation instead of scanning the shared
+        cache; the orphaned entries age out by TTL or eviction. The generation
+        lives in the shared cache, so every process sharing it sees the clear
+        once its invalidation arrives.
+        """
+        self._generation.bump()
+
+    def get_or_set(
+        self, key: Hashable, value: any, ttl: Optional[int] = None, pin: bool = False
+    ) -> any:
+        self._check_type(value)
+        return self.cache.get_or_set(self.key(key), value, self._ttl(ttl), pin)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], any],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        early_refresh_beta: float = 1.0,
+        negative_ttl: Optional[int] = None,
+    ) -> any:
+        loaded = False
+
+        def typed_loader():
+            nonlocal loaded
+            loaded = True
+            started = perf_counter()
+            value = loader()
+            self.stats.load_seconds.observe(perf_counter() - started)
+            if value is not None:
+                self._check_type(value)
+            return value
+
+        value = self.cache.get_or_load(
+            self.key(key),
+            typed_loader,
+            ttl=self._ttl(ttl),
+            stale_ttl=self.stale_ttl if stale_ttl is None else stale_ttl,
+            early_refresh_beta=early_refresh_beta,
+            negative_ttl=self.negative_ttl if negative_ttl is None else negative_ttl,
+        )
+        if loaded:
+            self.stats.record("loads")
+        self.stats.record("misses" if loaded else "hits")
+        return value
+
+    def get_with_version(self, key: Hashable) -> Tuple[any, Optional[int]]:
+        value, version = self.cache.get_with_version(self.key(key))
+        self.stats.record("misses" if value is None else "hits")
+        return value, version
+
+    def compare_and_set(
+        self,
+        key: Hashable,
+        version: Optional[int],
+        value: any,
+        ttl: Optional[int] = None,
+    ) -> bool:
+        self._check_type(value)
+        stored = self.cache.compare_and_set(
+            self.key(key), version, value, self._ttl(ttl)
+        )
+        if stored:
+            self.stats.record("sets")
+        return stored
+
+    def subscribe_invalidations(self, handler: InvalidationHandler) -> None:
+        """handler gets the namespace's own keys; a clear invalidates them all."""
+
+        def relative(keys: Optional[List[str]]):
+            if keys is None or self.generation_key in keys:
+                handler(None)
+                return
+            prefix = self.prefix
+            own = [key[len(prefix) :] for key in keys if key.startswith(prefix)]
+            if own:
+                handler(own)
+
+        self.cache.subscribe_invalidations(relative)
+
+    def _ttl(self, ttl: Optional[int]) -> int:
+        return self.ttl if ttl is None else ttl
+
+    def _check_type(self, value: any):
+        if not isinstance(value, self.entity_type):
+            raise TypeError(
+                f"O cache {self.name} aceita apenas {self.entity_type.__name__}, "
+                f"recebeu {type(value).__name__}."
+            )
+
+
+class CacheKeyspace:
+    """
+    Registry of the namespaces sharing one process-wide cache. Every
+    namespace name is registered once, with its entity type and TTLs.
+    """
+
+    # Reported for namespaces the backend has no entries or removals of yet.
+    EMPTY_BACKEND_STATS = {"entries": 0, "bytes": 0, "evictions": 0, "expirations": 0}
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self._lock = threading.Lock()
+
+    def namespace(
+        self,
+        name: str,
+        entity_type: Type,
+        ttl: int = 300,
+        stale_ttl: int = 0,
+        version: int = 1,
+        negative_ttl: int = 0,
+    ) -> CacheNamespace:
+        with self._lock:
+            if name in self._namespaces:
+                raise ValueError(f"Namespace de cache {name} já registrado.")
+            namespace = self._namespaces[name] = CacheNamespace(
+                self.cache, name, entity_type, ttl, stale_ttl, version, negative_ttl
+            )
+            return namespace
+
+    def clear(self) -> None:
+        """Drops every namespace, for data rewritten outside the repositories."""
+        for namespace in list(self._namespaces.values()):
+            namespace.clear()
+
+    def stats(self) -> Dict[str, Dict[str, any]]:
+        """
+        Each namespace's lookups and load times, with its entries, bytes,
+        evictions and expirations when the backend counts them.
+        """
+        backend = self.cache.stats()
+        return {
+            name: {
+                **namespace.stats.snapshot(),
+                **(
+                    backend.get(name, self.EMPTY_BACKEND_STATS)
+                    if backend is not None
+                    else {}
+                ),
+            }
+            for name, namespace in self._namespaces.items()
+        }
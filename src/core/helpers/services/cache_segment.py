@@ -0,0 +1,250 @@
+from collections import Counter
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+import threading
+
+from src.core.helpers.enums.eviction_policy import EvictionPolicy
+from src.core.helpers.services.cache_eviction import build_cache_eviction
+
+# The heap is rebuilt once stale entries (overwritten or deleted keys) outnumber
+# the live ones, which keeps it O(n) in size and the rebuild amortized O(1).
+HEAP_COMPACT_FACTOR = 2
+HEAP_COMPACT_MIN_SIZE = 1024
+EVICTED = "evictions"
+EXPIRED = "expirations"
+
+
+class CacheEntry(NamedTuple):
+    payload: bytes
+    expiration: Optional[float]
+    version: int
+    # Kept (and served by get_or_load while one caller reloads) until then.
+    stale_until: Optional[float] = None
+    # How long the loader took, which drives the probabilistic early refresh.
+    load_seconds: float = 0.0
+
+    def is_fresh(self, now: float) -> bool:
+        return self.expiration is None or now < self.expiration
+
+    def is_gone(self, now: float) -> bool:
+        return self.stale_until is not None and now >= self.stale_until
+
+
+class Flight:
+    """A load in progress; concurrent callers of the same key wait on it."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._payload: Optional[bytes] = None
+        self._error: Optional[BaseException] = None
+
+    def resolve(self, payload: Optional[bytes]):
+        self._payload = payload
+        self._done.set()
+
+    def fail(self, error: BaseException):
+        self._error = error
+        self._done.set()
+
+    def wait(self) -> Optional[bytes]:
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._payload
+
+
+class CacheSegment:
+    """
+    One stripe of InMemoryCacheService: its own entries, expiry heap, byte
+    accounting and eviction state behind its own lock. read, touch and the
+    flight methods take the lock themselves; the others expect the caller to
+    hold it.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int],
+        max_bytes: Optional[int],
+        eviction_policy: EvictionPolicy,
+    ):
+        self.lock = threading.Lock()
+        self.entries: Dict[Hashable, CacheEntry] = {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.sizes: Dict[Hashable, int] = {}
+        # Stored with pinned: never evicted nor refused, and outside the
+        # budget, as they are small control values.
+        self.pinned: Set[Hashable] = set()
+        self.eviction = (
+            build_cache_eviction(eviction_policy) if max_entries or max_bytes else None
+        )
+        self.expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self.flights: Dict[Hashable, Flight] = {}
+        # Removals by key group and reason (EVICTED or EXPIRED).
+        self.removals: Counter = Counter()
+        self._sequence = count()
+
+    def read(
+        self, key: Hashable, now: float, allow_stale: bool = False
+    ) -> Optional[CacheEntry]:
+        """
+        Lock-free on a plain hit of an unbounded segment. Expired entries still
+        inside their stale window are only returned with allow_stale.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.is_gone(now):
+            with self.lock:
+                if self.entries.get(key) is entry:
+                    self.remove(key, EXPIRED)
+            return None
+        if not allow_stale and not entry.is_fresh(now):
+            return None
+        self.touch(key)
+        return entry
+
+    def touch(self, key: Hashable):
+        if self.eviction:
+            with self.lock:
+                self.eviction.record_access(key)
+
+    def live_entry(self, key: Hashable, now: float) -> Optional[CacheEntry]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.is_gone(now):
+            self.remove(key, EXPIRED)
+            return None
+        return entry if entry.is_fresh(now) else None
+
+    def join_flight(self, key: Hashable) -> Tuple[Flight, bool]:
+        """Returns the key's flight and whether the caller leads it."""
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self.flights[key] = Flight()
+            return flight, True
+
+    def land_flight(self, key: Hashable):
+        with self.lock:
+            self.flights.pop(key, None)
+
+    def store(
+        self, key: Hashable, entry: CacheEntry, size: int, pinned: bool = False
+    ) -> bool:
+        if self.eviction:
+            if pinned:
+                self._pin(key)
+            else:
+                if key in self.pinned:
+                    self.remove(key)
+                if not self._make_room(key, size):
+                    return False
+        self.entries[key] = entry
+        if entry.stale_until is not None:
+            heappush(self.expiry_heap, (entry.stale_until, next(self._sequence), key))
+            self._compact_expiry_heap()
+        return True
+
+    def remove(self, key: Hashable, reason: Optional[str] = None):
+        if self.entries.pop(key, None) is None:
+            return
+        if reason:
+            self.removals[key_group(key), reason] += 1
+        if key in self.pinned:
+            self.pinned.discard(key)
+        elif self.eviction:
+            self.size_bytes -= self.sizes.pop(key)
+            self.eviction.remove(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.expiry_heap.clear()
+        self.sizes.clear()
+        self.pinned.clear()
+        self.size_bytes = 0
+        if self.eviction:
+            self.eviction.clear()
+
+    def clean_expired(self, now: float) -> int:
+        """
+        Pops every due entry off the expiry heap, O(log n) each. Heap entries
+        whose key was deleted or re-set since are skipped.
+        """
+        removed = 0
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            stale_until, _, key = heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.stale_until == stale_until:
+                self.remove(key, EXPIRED)
+                removed += 1
+        return removed
+
+    def _pin(self, key: Hashable):
+        if key in self.pinned:
+            return
+        if key in self.sizes:
+            self.size_bytes -= self.sizes.pop(key)
+            self.eviction.remove(key)
+        self.pinned.add(key)
+
+    def _make_room(self, key: Hashable, size: int) -> bool:
+        """
+        Evicts until key fits within the budget. Returns False, dropping any
+        previous value of key, when the value is larger than the whole budget
+        or the policy does not admit it.
+        """
+        self.eviction.record_access(key)
+        if self.max_bytes and size > self.max_bytes:
+            self.remove(key)
+            return False
+        if key in self.entries:
+            self.size_bytes += size - self.sizes[key]
+            self.sizes[key] = size
+            self._evict_over_budget(key, 0, new_entry=False)
+            return True
+        if not self._evict_over_budget(key, size, new_entry=True):
+            return False
+        self.sizes[key] = size
+        self.size_bytes += size
+        self.eviction.record_insert(key)
+        return True
+
+    def _evict_over_budget(self, key: Hashable, size: int, new_entry: bool) -> bool:
+        entries = len(self.entries) - len(self.pinned) + new_entry
+        while (self.max_entries and entries > self.max_entries) or (
+            self.max_bytes and self.size_bytes + size > self.max_bytes
+        ):
+            victim = self.eviction.victim()
+            if victim is None or victim == key:
+                break
+            if new_entry and not self.eviction.admit(key, victim):
+                return False
+            self.remove(victim, EVICTED)
+            entries -= 1
+        return True
+
+    def _compact_expiry_heap(self):
+        heap_size = len(self.expiry_heap)
+        if heap_size < HEAP_COMPACT_MIN_SIZE:
+            return
+        if heap_size <= HEAP_COMPACT_FACTOR * len(self.entries):
+            return
+        self.expiry_heap = [
+            (entry.stale_until, next(self._sequence), key)
+            for key, entry in self.entries.items()
+            if entry.stale_until is not None
+        ]
+        heapify(self.expiry_heap)
+
+
+def key_group(key: Hashable) -> str:
+    """The namespace of a "namespace:..." key, or "" for any other key."""
+    if isinstance(key, str) and ":" in key:
+        return key.split(":", 1)[0]
+    return ""
@@ -0,0 +1,116 @@
+from enum import Enum
+from hashlib import sha1
+from typing import Callable, Dict, NamedTuple, Optional
+import inspect
+import json
+
+from pydantic import BaseModel
+
+from src.core.helpers.interfaces.chace_service import CacheService
+from src.core.helpers.services.cache_generation import CacheGeneration
+
+# Longer argument keys are replaced by their digest.
+MAX_READABLE_KEY_LENGTH = 64
+GENERATION_KEY = "generation"
+
+
+class CachedMethod(NamedTuple):
+    ttl: int
+    # Keyed by its first argument, the item id, so a change of that item only
+    # drops its own entries; other methods are dropped on any change.
+    by_item: bool = False
+    # How long a None (or, for collections, empty) result is remembered.
+    negative_ttl: int = 0
+
+
+class CachedQuery:
+    """
+    Read-through cache in front of a query port: the methods listed in
+    methods are answered from cache, keyed by method and arguments, and any
+    other attribute is delegated to the wrapped query. Results are loaded
+    through get_or_load, so concurrent misses hit the database once.
+
+    Pass invalidate as a hook to the repositories writing the same data.
+    Collection results are keyed under a generation stored in the cache
+    itself, so one write drops them in every process sharing the cache.
+    """
+
+    def __init__(
+        self, query: object, cache: CacheService, methods: Dict[str, CachedMethod]
+    ):
+        self.query = query
+        self.cache = cache
+        self.methods = methods
+        self._generation = CacheGeneration(cache, GENERATION_KEY)
+        self._cached: Dict[str, Callable] = {
+            name: self._read_through(name, policy) for name, policy in methods.items()
+        }
+
+    def __getattr__(self, name: str):
+        cached = self.__dict__.get("_cached", {}).get(name)
+        if cached is not None:
+            return cached
+        return getattr(self.query, name)
+
+    def invalidate(self, item_id: Optional[int] = None) -> None:
+        """
+        Drops item_id's entries, including a cached miss of a new id, and
+        every collection result.
+        """
+        if item_id is not None:
+            for name, policy in self.methods.items():
+                if policy.by_item:
+                    self.cache.delete(f"{name}:{item_id}")
+        if not all(policy.by_item for policy in self.methods.values()):
+            self._generation.bump()
+
+    def _read_through(self, name: str, policy: CachedMethod) -> Callable:
+        method = getattr(self.query, name)
+        signature = inspect.signature(method)
+
+        def load(*args, **kwargs):
+            result = method(*args, **kwargs)
+            # An empty collection is cached as a miss, for negative_ttl.
+            empty = isinstance(result, list) and not result
+            return None if empty and not policy.by_item else result
+
+        def cached(*args, **kwargs):
+            key = self._key(name, policy, signature, args, kwargs)
+            result = self.cache.get_or_load(
+                key,
+                lambda: load(*args, **kwargs),
+                ttl=policy.ttl,
+                negative_ttl=policy.negative_ttl,
+            )
+            return [] if result is None and not policy.by_item else result
+
+        cached.__name__ = name
+        cached.__doc__ = method.__doc__
+        return cached
+
+    def _key(
+        self,
+        name: str,
+        policy: CachedMethod,
+        signature: inspect.Signature,
+        args: tuple,
+        kwargs: dict,
+    ) -> str:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if policy.by_item:
+            return f"{name}:{next(iter(bound.arguments.values()))}"
+        arguments = json.dumps(
+            bound.arguments, sort_keys=True, default=_jsonable, separators=(",", ":")
+        )
+        if len(arguments) > MAX_READABLE_KEY_LENGTH:
+            arguments = sha1(arguments.encode()).hexdigest()
+        return f"{name}:{self._generation.current()}:{arguments}"
+
+
+def _jsonable(value: any) -> any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, Enum):
+        return value.value
+    return repr(value)
@@ -1,62 +1,281 @@
-from copy import deepcopy
-from datetime import datetime, timedelta
-from time import sleep
+from itertools import count
+from math import log
+from random import random
+from time import monotonic, perf_counter
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple
 import threading
 
-import schedule
-
+from src.core.helpers.enums.eviction_policy import EvictionPolicy
+from src.core.helpers.functions.cache_serializer import deserialize, serialize
 from src.core.helpers.interfaces.chace_service import CacheService
+from src.core.helpers.services.cache_segment import (
+    EVICTED,
+    EXPIRED,
+    CacheEntry,
+    CacheSegment,
+    Flight,
+    key_group,
+)
+
+DEFAULT_SEGMENTS = 16
 
 
 class InMemoryCacheService(CacheService):
-    def __init__(self, start_cleaner_deamon: bool = True, cleaner_interval: int = 10):
-        self.cache = {}
-        self.exit_event: threading.Event = None
+    def __init__(
+        self,
+        start_cleaner_deamon: bool = True,
+        cleaner_interval: float = 10,
+        clock: Callable[[], float] = monotonic,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: EvictionPolicy = EvictionPolicy.LRU,
+        sizer: Callable[[bytes], int] = len,
+        segments: int = DEFAULT_SEGMENTS,
+    ):
+        """
+        Values are stored as serialized snapshots and every get decodes a
+        private copy. Keys are striped over segments, each with its own lock,
+        so request threads only contend on keys of the same segment.
+
+        Unbounded unless max_entries and/or max_bytes are given; then the
+        budget is split evenly between the segments and every set evicts by
+        eviction_policy within its segment until the snapshot fits.
+        """
+        if max_entries:
+            segments = min(segments, max_entries)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._segments = [
+            CacheSegment(
+                max_entries and max(1, max_entries // segments),
+                max_bytes and max(1, max_bytes // segments),
+                eviction_policy,
+            )
+            for _ in range(segments)
+        ]
+        self._sizer = sizer
+        self._bounded = bool(max_entries or max_bytes)
+        self._versions = count(1)
+        self._clock = clock
+        self.exit_event: threading.Event = threading.Event()
+        self._cleaner: Optional[threading.Thread] = None
         if start_cleaner_deamon:
             self.start_cleaner(cleaner_interval)
 
-    def set(self, key: str, value: any, ttl: int = 300) -> None:
-        expiration = datetime.now() + timedelta(seconds=ttl) if ttl else None
-        self.cache[key] = (value, expiration)
+    def set(self, key: str, value: any, ttl: int = 300, pin: bool = False) -> None:
+        segment = self._segment(key)
+        entry, size = self._entry(value, ttl)
+        with segment.lock:
+            segment.store(key, entry, size, pin)
 
     def get(self, key: str) -> any:
-        value, expiration = self.cache.get(key, (None, None))
-        if expiration and datetime.now() > expiration:
-            self.delete(key)
-            return None
-        return deepcopy(value)
+        entry = self._segment(key).read(key, self._clock())
+        return deserialize(entry.payload) if entry else None
 
     def delete(self, key: str) -> None:
-        if key in self.cache:
-            del self.cache[key]
+        segment = self._segment(key)
+        with segment.lock:
+            segment.remove(key)
 
     def clear(self) -> None:
-        self.cache.clear()
+        for segment in self._segments:
+            with segment.lock:
+                segment.clear()
 
-    def start_cleaner(self, interval: int = 10):
-        self._start_cache_cleaner(interval)
+    def get_or_set(
+        self, key: str, value: any, ttl: int = 300, pin: bool = False
+    ) -> any:
+        segment = self._segment(key)
+        entry, size = self._entry(value, ttl)
+        with segment.lock:
+            current = segment.live_entry(key, self._clock())
+            if current is None:
+                return value if segment.store(key, entry, size, pin) else None
+            if segment.eviction:
+                segment.eviction.record_access(key)
+        return deserialize(current.payload)
 
-    def stop_cleaner(self):
-        self.exit_event.set()
-        schedule.clear()
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], any],
+        ttl: int = 300,
+        stale_ttl: int = 0,
+        early_refresh_beta: float = 1.0,
+        negative_ttl: int = 0,
+    ) -> any:
+        """
+        Concurrent misses of a key share a single loader call; the other
+        callers wait for its result. A hit close to expiry may be refreshed
+        early, with a probability that grows with the loader's duration
+        (XFetch), so popular keys are rarely all reloaded at once. Entries
+        are kept stale_ttl seconds past their expiry: meanwhile one caller
+        reloads and the others are served the stale value. None is cached
+        for negative_ttl seconds, if at all, so repeated lookups of a missing
+        id do not reach the loader either.
+        """
+        segment = self._segment(key)
+        now = self._clock()
+        entry = segment.read(key, now, allow_stale=True)
+        if entry is not None and not self._needs_refresh(
+            entry, now, early_refresh_beta
+        ):
+            return deserialize(entry.payload)
+        flight, leader = segment.join_flight(key)
+        if leader:
+            loaded = entry is None and segment.read(key, self._clock())
+            if loaded:
+                # A previous flight landed between the miss and the join.
+                flight.resolve(loaded.payload)
+                segment.land_flight(key)
+                return deserialize(loaded.payload)
+            return self._load(
+                segment, key, flight, loader, ttl, stale_ttl, negative_ttl
+            )
+        if entry is not None:
+            return deserialize(entry.payload)
+        payload = flight.wait()
+        return deserialize(payload) if payload is not None else None
+
+    def get_with_version(self, key: str) -> Tuple[any, Optional[int]]:
+        entry = self._segment(key).read(key, self._clock())
+        if entry is None:
+            return None, None
+        return deserialize(entry.payload), entry.version
+
+    def compare_and_set(
+        self, key: str, version: Optional[int], value: any, ttl: int = 300
+    ) -> bool:
+        segment = self._segment(key)
+        entry, size = self._entry(value, ttl)
+        with segment.lock:
+            current = segment.live_entry(key, self._clock())
+            if (current.version if current else None) != version:
+                return False
+            return segment.store(key, entry, size)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(segment.size_bytes for segment in self._segments)
+
+    def keys(self) -> Iterator[Hashable]:
+        for segment in self._segments:
+            with segment.lock:
+                keys = list(segment.entries)
+            yield from keys
+
+    def __len__(self) -> int:
+        return sum(len(segment.entries) for segment in self._segments)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._segment(key).entries
 
-    def _start_cache_cleaner(self, interval: int):
-        """Starts the background thread for cache cleanup using schedule."""
-        schedule.every(interval).seconds.do(self._clean_expired_entries)
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """O(entries): walks every segment, one lock at a time."""
+        stats: Dict[str, Dict[str, int]] = {}
+
+        def group(name: str) -> Dict[str, int]:
+            if name not in stats:
+                stats[name] = dict.fromkeys(("entries", "bytes", EVICTED, EXPIRED), 0)
+            return stats[name]
+
+        for segment in self._segments:
+            with segment.lock:
+                for key, entry in segment.entries.items():
+                    counts = group(key_group(key))
+                    counts["entries"] += 1
+                    counts["bytes"] += len(entry.payload)
+                for (name, reason), removed in segment.removals.items():
+                    group(name)[reason] += removed
+        return stats
+
+    def close(self) -> None:
+        self.stop_cleaner()
+
+    def start_cleaner(self, interval: float = 10):
+        if self._cleaner and self._cleaner.is_alive():
+            return
         self.exit_event = threading.Event()
+        self._cleaner = threading.Thread(
+            target=self._run_cleaner,
+            args=(interval, self.exit_event),
+            name="in-memory-cache-cleaner",
+            daemon=True,
+        )
+        self._cleaner.start()
+
+    def stop_cleaner(self, timeout: Optional[float] = None):
+        self.exit_event.set()
+        if self._cleaner:
+            self._cleaner.join(timeout)
+            self._cleaner = None
 
-        def run_schedule():
-            while True:
-                schedule.run_pending()
-                sleep(1)
+    def _run_cleaner(self, interval: float, exit_event: threading.Event):
+        while not exit_event.wait(interval):
+            self._clean_expired_entries()
 
-        threading.Thread(target=run_schedule, daemon=True)
+    def _clean_expired_entries(self) -> int:
+        removed = 0
+        for segment in self._segments:
+            with segment.lock:
+                removed += segment.clean_expired(self._clock())
+        return removed
 
-    def _clean_expired_entries(self):
-        """Remove expired cache entries."""
-        now = datetime.now()
-        expired_keys = [
-            key for key, (_, expiry) in self.cache.items() if expiry and now > expiry
-        ]
-        for key in expired_keys:
-            self.delete(key)
+    def _needs_refresh(self, entry: CacheEntry, now: float, beta: float) -> bool:
+        if not entry.is_fresh(now):
+            return True
+        if entry.expiration is None or not beta or not entry.load_seconds:
+            return False
+        gap = -entry.load_seconds * beta * log(1.0 - random())
+        return now + gap >= entry.expiration
+
+    def _load(
+        self,
+        segment: CacheSegment,
+        key: Hashable,
+        flight: Flight,
+        loader: Callable[[], any],
+        ttl: int,
+        stale_ttl: int,
+        negative_ttl: int = 0,
+    ) -> any:
+        try:
+            started = perf_counter()
+            value = loader()
+            payload = None
+            if value is not None or negative_ttl:
+                entry, size = (
+                    self._entry(
+                        value, ttl, stale_ttl, load_seconds=perf_counter() - started
+                    )
+                    if value is not None
+                    else self._entry(None, negative_ttl)
+                )
+                payload = entry.payload
+                with segment.lock:
+                    segment.store(key, entry, size)
+            flight.resolve(payload)
+            return value
+        except BaseException as error:
+            flight.fail(error)
+            raise
+        finally:
+            segment.land_flight(key)
+
+    def _segment(self, key: Hashable) -> CacheSegment:
+        return self._segments[hash(key) % len(self._segments)]
+
+    def _entry(
+        self, value: any, ttl: int, stale_ttl: int = 0, load_seconds: float = 0.0
+    ) -> Tuple[CacheEntry, int]:
+        """Serializes outside the segment lock."""
+        payload = serialize(value)
+        expiration = self._clock() + ttl if ttl else None
+        entry = CacheEntry(
+            payload=payload,
+            expiration=expiration,
+            version=next(self._versions),
+            stale_until=expiration + stale_ttl if expiration is not None else None,
+            load_seconds=load_seconds,
+        )
+        return entry, self._sizer(payload) if self._bounded else 0
@@ -0,0 +1,196 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.core.helpers.interfaces.cache_invalidation_bus import (
+    CacheInvalidationBus,
+    InvalidationHandler,
+)
+from src.core.helpers.interfaces.chace_service import CacheService
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+
+
+class TieredCacheService(CacheService):
+    """
+    Two-level cache: hits are served by the in-process l1, misses fall back to
+    the shared l2 and are kept in l1 for at most l1_ttl seconds. Every write
+    goes to l2 first and is then broadcast on the bus, so the other processes
+    drop their l1 copy; a write is visible everywhere after the bus latency,
+    or l1_ttl at worst if a message is lost.
+
+    l2 and the bus are best-effort: their errors are logged, never raised.
+    l1 is updated or invalidated even when l2 fails, and loads go straight
+    to the loader, so requests keep being served while l2 is down.
+    """
+
+    def __init__(
+        self,
+        l1: InMemoryCacheService,
+        l2: CacheService,
+        bus: CacheInvalidationBus,
+        l1_ttl: int = 5,
+    ):
+        self.l1 = l1
+        self.l2 = l2
+        self.bus = bus
+        self.l1_ttl = l1_ttl
+        self._handlers: List[InvalidationHandler] = []
+        bus.subscribe(self._on_invalidate)
+
+    def set(self, key: str, value: any, ttl: int = 300, pin: bool = False) -> None:
+        self._on_l2("set", lambda: self.l2.set(key, value, ttl, pin))
+        self.l1.set(key, value, self._l1_ttl(ttl), pin)
+        self._publish([key])
+
+    def get(self, key: str) -> any:
+        return self.l1.get_or_load(
+            key, lambda: self._on_l2("get", lambda: self.l2.get(key)), ttl=self.l1_ttl
+        )
+
+    def delete(self, key: str) -> None:
+        self._on_l2("delete", lambda: self.l2.delete(key))
+        self.l1.delete(key)
+        self._publish([key])
+
+    def clear(self) -> None:
+        self._on_l2("clear", self.l2.clear)
+        self.l1.clear()
+        self._publish(None)
+
+    def get_or_set(
+        self, key: str, value: any, ttl: int = 300, pin: bool = False
+    ) -> any:
+        """
+        An l1 hit is answered without l2, which other processes' writes keep
+        coherent through the bus. Without l2, failing or returning None, only
+        this process agrees on the value, through l1's own get_or_set.
+        """
+        current = self.l1.get(key)
+        if current is not None:
+            return current
+        try:
+            current = self.l2.get_or_set(key, value, ttl, pin)
+        except Exception as error:
+            self._l2_failed("get_or_set", error)
+            current = None
+        if current is None:
+            return self.l1.get_or_set(key, value, self._l1_ttl(ttl), pin)
+        self.l1.set(key, current, self._l1_ttl(ttl), pin)
+        return current
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], any],
+        ttl: int = 300,
+        stale_ttl: int = 0,
+        early_refresh_beta: float = 1.0,
+        negative_ttl: int = 0,
+    ) -> any:
+        """
+        Concurrent misses are coalesced twice: within the process by l1 and
+        across processes by l2.
+        """
+
+        def load():
+            loader_error = None
+
+            def tracked_loader():
+                nonlocal loader_error
+                try:
+                    return loader()
+                except BaseException as error:
+                    loader_error = error
+                    raise
+
+            try:
+                return self.l2.get_or_load(
+                    key,
+                    tracked_loader,
+                    ttl,
+                    stale_ttl,
+                    early_refresh_beta,
+                    negative_ttl,
+                )
+            except Exception as error:
+                if error is loader_error:
+                    raise
+                self._l2_failed("get_or_load", error)
+                return loader()
+
+        return self.l1.get_or_load(
+            key,
+            load,
+            ttl=self._l1_ttl(ttl),
+            negative_ttl=self._l1_ttl(negative_ttl) if negative_ttl else 0,
+        )
+
+    def get_with_version(self, key: str) -> Tuple[any, Optional[int]]:
+        """Versions belong to l2, the copy every process agrees on."""
+        try:
+            return self.l2.get_with_version(key)
+        except Exception as error:
+            self._l2_failed("get_with_version", error)
+            return None, None
+
+    def compare_and_set(
+        self, key: str, version: Optional[int], value: any, ttl: int = 300
+    ) -> bool:
+        """Fails, as on a version conflict, while l2 is unavailable."""
+        try:
+            stored = self.l2.compare_and_set(key, version, value, ttl)
+        except Exception as error:
+            self._l2_failed("compare_and_set", error)
+            self.l1.delete(key)
+            return False
+        if not stored:
+            return False
+        self.l1.set(key, value, self._l1_ttl(ttl))
+        self._publish([key])
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Those of this process's l1; Redis keeps its own (INFO stats)."""
+        return self.l1.stats()
+
+    def subscribe_invalidations(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+    def close(self) -> None:
+        self.bus.close()
+        self.l1.close()
+        self.l2.close()
+
+    def _on_invalidate(self, keys: Optional[List[str]]):
+        if keys is None:
+            self.l1.clear()
+        else:
+            for key in keys:
+                self.l1.delete(key)
+        for handler in self._handlers:
+            try:
+                handler(keys)
+            except Exception as error:
+                logger.exception(error)
+
+    def _on_l2(self, operation: str, call: Callable[[], any]) -> any:
+        """call's result, or None (a miss) if l2 raised."""
+        try:
+            return call()
+        except Exception as error:
+            self._l2_failed(operation, error)
+            return None
+
+    def _publish(self, keys: Optional[List[str]]):
+        """Lost messages are bounded by l1_ttl, like any other lost message."""
+        try:
+            self.bus.publish(keys)
+        except Exception as error:
+            logger.warning(f"Cache invalidation not published: {error}")
+
+    @staticmethod
+    def _l2_failed(operation: str, error: Exception):
+        logger.warning(f"Shared cache failed on {operation}: {error}")
+
+    def _l1_ttl(self, ttl: int) -> int:
+        return min(ttl, self.l1_ttl) if ttl else self.l1_ttl
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from src.adapters.data_mappers.produto_entity_data_mapper import (
+    ProdutoEntityDataMapper,
+)
+from src.adapters.driven.infra.loaders.produto_loader import (
+    CATEGORY_COLUMNS,
+    CURRENCY_COLUMNS,
+    PRODUCT_COLUMNS,
+)
+from src.adapters.driven.infra.models.categories import Category
+from src.adapters.driven.infra.models.currencies import Currency
+from src.adapters.driven.infra.models.product_components import ProductComponent
+from src.adapters.driven.infra.models.products import Product
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def model_row(model, columns) -> dict:
+    """The row load_rows reads for model: foreign keys hold the id."""
+    return {
+        name: model.__data__.get(field.name)
+        for name, field in zip(columns.names, columns.fields)
+    }
+
+
+class TestProdutoEntityDataMapper:
+    def test_row_maps_like_the_model(self):
+        currency = Currency(
+            id=1, symbol="R$", name="Real", code="BRL", created_at=NOW, updated_at=NOW
+        )
+        category = Category(id=1, name="Lanche", created_at=NOW, updated_at=NOW)
+        component = Product(
+            id=2,
+            name="Queijo",
+            price=2.5,
+            currency=currency,
+            category=category,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        component.components = []
+        product = Product(
+            id=1,
+            name="X-Burger",
+            price=19.9,
+            currency=currency,
+            category=category,
+            allow_components=True,
+            is_active=True,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        product.components = [ProductComponent(product=1, component=component)]
+
+        def row(product: Product) -> dict:
+            return {
+                **model_row(product, PRODUCT_COLUMNS),
+                "category": model_row(category, CATEGORY_COLUMNS),
+                "currency": model_row(currency, CURRENCY_COLUMNS),
+                "components": [row(comp.component) for comp in product.components],
+            }
+
+        from_model = ProdutoEntityDataMapper.from_db_to_domain(product)
+        from_row = ProdutoEntityDataMapper.from_row_to_domain(row(product))
+
+        assert from_row == from_model
+        assert from_row.model_dump_json() == from_model.model_dump_json()
+
+    def test_row_without_price_or_category(self):
+        row = {name: None for name in PRODUCT_COLUMNS.names} | {
+            "id": 3,
+            "name": "Água",
+            "allow_components": False,
+            "is_active": True,
+        }
+        row.update(category=None, currency=None, components=[])
+
+        produto = ProdutoEntityDataMapper.from_row_to_domain(row)
+
+        assert produto.price is None
+        assert produto.category is None
+        assert produto.components == []
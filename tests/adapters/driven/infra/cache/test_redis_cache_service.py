@@ -0,0 +1,222 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.adapters.driven.infra.cache.redis_cache_service import RedisCacheService
+from src.adapters.driven.infra.cache.redis_client import (
+    RedisConnectionPool,
+    RedisError,
+)
+from src.core.helpers.services.cache_namespace import CacheKeyspace
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from src.core.helpers.services.tiered_cache import TieredCacheService
+from tests.test_resources.redis_stand_in import RedisStandIn
+
+SECRET = b"test-secret"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class TestRedisCacheService:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def server(self, clock):
+        server = RedisStandIn(clock).start()
+        yield server
+        server.stop()
+
+    @pytest.fixture
+    def pool(self, server):
+        pool = RedisConnectionPool(server.url, max_connections=4, timeout=0.5)
+        yield pool
+        pool.close()
+
+    @pytest.fixture
+    def cache(self, pool, clock):
+        return RedisCacheService(pool, SECRET, clock=clock)
+
+    def test_reads_return_private_copies(self, cache):
+        value = {"items": [1]}
+        cache.set("a", value)
+        value["items"].append(2)
+        cache.get("a")["items"].append(3)
+        assert cache.get("a") == {"items": [1]}
+
+    def test_entry_expires_after_ttl(self, cache, clock):
+        cache.set("a", 1, ttl=10)
+        clock.advance(9)
+        assert cache.get("a") == 1
+        clock.advance(1)
+        assert cache.get("a") is None
+
+    def test_keys_are_prefixed_and_clear_keeps_other_data(self, server, pool, clock):
+        first = RedisCacheService(pool, SECRET, prefix="first:", clock=clock)
+        second = RedisCacheService(pool, SECRET, prefix="second:", clock=clock)
+        first.set("a", 1)
+        second.set("a", 2)
+        first.clear()
+        assert first.get("a") is None
+        assert second.get("a") == 2
+        assert list(server.data) == [b"second:a"]
+
+    def test_get_or_set_keeps_the_first_value(self, cache):
+        assert cache.get_or_set("a", 1) == 1
+        assert cache.get_or_set("a", 2) == 1
+
+    def test_compare_and_set_rejects_stale_versions(self, cache):
+        assert cache.compare_and_set("a", None, 1)
+        value, version = cache.get_with_version("a")
+        assert value == 1
+        cache.set("a", 2)
+        assert not cache.compare_and_set("a", version, 3)
+        _, version = cache.get_with_version("a")
+        assert cache.compare_and_set("a", version, 3)
+        assert cache.get("a") == 3
+
+    def test_connections_are_pooled(self, server, cache):
+        for key in range(50):
+            cache.set(key, key)
+            cache.get_or_set(key, key)
+        assert server.connections == 1
+
+    def test_pipeline_reads_every_reply_before_raising(self, pool):
+        with pytest.raises(RedisError):
+            pool.pipeline([("SET", "a", "1"), ("NOPE",), ("GET", "a")])
+        assert pool.execute("GET", "a") == b"1"
+
+    def test_pool_waits_for_a_free_connection(self, pool):
+        with pool.connection(), pool.connection(), pool.connection():
+            with pool.connection():
+                with pytest.raises(TimeoutError):
+                    pool.execute("PING")
+
+    def test_stale_value_is_served_while_another_pod_reloads(self, pool, clock):
+        pod_a = RedisCacheService(pool, SECRET, clock=clock)
+        pod_b = RedisCacheService(pool, SECRET, clock=clock)
+        pod_a.get_or_load("a", lambda: "v1", ttl=10, stale_ttl=30)
+        clock.advance(11)
+        pool.execute("SET", "cache:a:lock", "pod-a", "NX", "PX", 10_000)
+        assert pod_b.get_or_load("a", lambda: "v2", ttl=10, stale_ttl=30) == "v1"
+        pool.execute("DEL", "cache:a:lock")
+        assert pod_b.get_or_load("a", lambda: "v2", ttl=10, stale_ttl=30) == "v2"
+        clock.advance(41)
+        assert pod_a.get_or_load("a", lambda: None, ttl=10, stale_ttl=30) is None
+
+    def test_misses_are_cached_for_negative_ttl(self, cache, clock):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return None if len(calls) == 1 else "v"
+
+        assert cache.get_or_load("a", loader, negative_ttl=5) is None
+        assert cache.get_or_load("a", loader, negative_ttl=5) is None
+        assert len(calls) == 1
+        clock.advance(5)
+        assert cache.get_or_load("a", loader, negative_ttl=5) == "v"
+
+    def test_entries_not_signed_with_the_secret_are_misses(self, pool, clock):
+        cache = RedisCacheService(pool, SECRET, clock=clock)
+        RedisCacheService(pool, b"other-secret", clock=clock).set("a", 1)
+        assert cache.get("a") is None
+        pool.execute("SET", "cache:b", b"garbage")
+        assert cache.get_or_load("b", lambda: 2) == 2
+        assert cache.get("b") == 2
+
+
+class TestRedisCacheServiceUnavailable:
+    @pytest.fixture
+    def cache(self):
+        # Nothing listens on port 1, so every connection is refused.
+        pool = RedisConnectionPool("redis://127.0.0.1:1/0", timeout=0.5)
+        yield RedisCacheService(pool, SECRET)
+        pool.close()
+
+    def test_reads_are_misses(self, cache):
+        assert cache.get("a") is None
+        assert cache.get_with_version("a") == (None, None)
+
+    def test_writes_are_skipped(self, cache):
+        cache.set("a", 1)
+        cache.delete("a")
+        cache.clear()
+        assert not cache.compare_and_set("a", None, 1)
+
+    def test_loads_fall_through_to_the_loader(self, cache):
+        assert cache.get_or_load("a", lambda: 1) == 1
+
+    def test_get_or_set_reports_the_value_as_not_stored(self, cache):
+        assert cache.get_or_set("a", 2) is None
+
+    def test_namespace_prefix_is_stable_behind_an_l1(self, cache):
+        tiered = TieredCacheService(
+            InMemoryCacheService(start_cleaner_deamon=False), cache, MagicMock()
+        )
+        pedidos = CacheKeyspace(tiered).namespace("pedido", dict)
+        prefix = pedidos.prefix
+        pedidos.set(1, {"id": 1})
+        assert pedidos.prefix == prefix
+        assert pedidos.get(1) == {"id": 1}
+
+
+class TestRedisCacheServiceGetOrLoad:
+    @pytest.fixture
+    def server(self):
+        server = RedisStandIn().start()
+        yield server
+        server.stop()
+
+    def test_concurrent_misses_across_pods_load_once(self, server):
+        pods = [
+            RedisCacheService(
+                RedisConnectionPool(server.url), SECRET, poll_interval=0.005
+            )
+            for _ in range(4)
+        ]
+        calls = []
+        start = threading.Barrier(8)
+        results = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"id": 1}
+
+        def worker(cache):
+            start.wait()
+            results.append(cache.get_or_load("produto:1", loader))
+
+        threads = [threading.Thread(target=worker, args=(pod,)) for pod in pods * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for pod in pods:
+            pod.close()
+        assert len(calls) == 1
+        assert results == [{"id": 1}] * 8
+
+    def test_failed_load_releases_the_lock(self, server):
+        cache = RedisCacheService(RedisConnectionPool(server.url), SECRET)
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load("a", failing)
+        assert cache.get_or_load("a", lambda: 1) == 1
+        cache.close()
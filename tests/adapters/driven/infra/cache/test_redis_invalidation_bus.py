@@ -0,0 +1,50 @@
+import queue
+
+import pytest
+
+from src.adapters.driven.infra.cache.redis_client import RedisConnectionPool
+from src.adapters.driven.infra.cache.redis_invalidation_bus import (
+    RedisInvalidationBus,
+)
+from tests.test_resources.redis_stand_in import RedisStandIn
+
+
+class TestRedisInvalidationBus:
+    @pytest.fixture
+    def server(self):
+        server = RedisStandIn().start()
+        yield server
+        server.stop()
+
+    @pytest.fixture
+    def buses(self, server):
+        pool = RedisConnectionPool(server.url)
+        buses = [RedisInvalidationBus(pool, reconnect_interval=0.05) for _ in range(2)]
+        received = [queue.Queue() for _ in buses]
+        for bus, messages in zip(buses, received):
+            bus.subscribe(messages.put)
+            assert bus.wait_subscribed(1)
+        yield buses, received
+        for bus in buses:
+            bus.close()
+        pool.close()
+
+    def test_other_processes_receive_invalidations(self, buses):
+        [sender, _], [own, other] = buses
+        sender.publish(["pedido:PedidoAggregate:v1:g0:1"])
+        sender.publish(None)
+        assert other.get(timeout=1) == ["pedido:PedidoAggregate:v1:g0:1"]
+        assert other.get(timeout=1) is None
+        assert own.empty()
+
+    def test_reconnect_drops_everything(self, server, buses):
+        [_, receiver], [_, received] = buses
+        server.drop_subscribers()
+        assert received.get(timeout=2) is None
+        assert receiver.wait_subscribed(1)
+
+    def test_publish_is_best_effort(self):
+        # Nothing listens on port 1, so every connection is refused.
+        pool = RedisConnectionPool("redis://127.0.0.1:1/0", timeout=0.5)
+        RedisInvalidationBus(pool).publish(["pedido:1"])
+        pool.close()
@@ -0,0 +1,106 @@
+from unittest.mock import MagicMock
+
+import pytest
+from peewee import CharField, Model, SqliteDatabase
+from playhouse.postgres_ext import PostgresqlExtDatabase
+
+from src.adapters.driven.infra.database.chunked_cursor import iterate_chunks
+
+
+class Row(Model):
+    name = CharField()
+
+
+class TestIterateChunks:
+    @pytest.fixture(autouse=True)
+    def database(self):
+        database = SqliteDatabase(":memory:")
+        with database.bind_ctx([Row]):
+            database.create_tables([Row])
+            Row.insert_many([{"name": f"row {index}"} for index in range(7)]).execute()
+            yield database
+        database.close()
+
+    def test_yields_tuples_in_chunks(self):
+        chunks = list(iterate_chunks(Row.select(Row.id, Row.name).order_by(Row.id), 3))
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert chunks[0][0] == (1, "row 0")
+
+    def test_empty_result(self):
+        query = Row.select().where(Row.name == "missing")
+
+        assert list(iterate_chunks(query, 3)) == []
+
+    def test_a_stream_past_the_timeout_is_cut(self):
+        clock = FakeClock()
+        chunks = iterate_chunks(
+            Row.select().order_by(Row.id), 3, timeout=10, clock=clock
+        )
+
+        next(chunks)
+        clock.now = 11
+        with pytest.raises(TimeoutError):
+            next(chunks)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestIterateChunksOnPostgres:
+    """The named cursor path, against a psycopg2 connection stand-in."""
+
+    ROWS = [(index, f"row {index}") for index in range(1, 8)]
+
+    @pytest.fixture
+    def cursor(self):
+        cursor = MagicMock(closed=False, description=[("id",), ("name",)])
+        batches = [self.ROWS[0:3], self.ROWS[3:6], self.ROWS[6:], []]
+        cursor.fetchmany.side_effect = lambda size: batches.pop(0)
+        return cursor
+
+    @pytest.fixture
+    def database(self, monkeypatch, cursor):
+        database = PostgresqlExtDatabase("stream")
+        connection = MagicMock()
+        connection.cursor.return_value = cursor
+        monkeypatch.setattr(database, "connection", lambda: connection)
+        monkeypatch.setattr(database, "execute_sql", MagicMock())
+        monkeypatch.setattr(database, "atomic", MagicMock())
+        with database.bind_ctx([Row]):
+            yield database
+
+    def test_reads_a_plain_named_cursor_by_chunk(self, database, cursor):
+        chunks = list(iterate_chunks(Row.select(Row.id, Row.name), 3))
+
+        assert chunks == [self.ROWS[0:3], self.ROWS[3:6], self.ROWS[6:]]
+        name = database.connection().cursor.call_args
+        assert name.kwargs["name"].startswith("chunks_")
+        assert "withhold" not in name.kwargs
+        assert cursor.execute.call_args.args[0].startswith('SELECT "t1"."id"')
+        assert {call.args for call in cursor.fetchmany.call_args_list} == {(3,)}
+        database.atomic.return_value.__exit__.assert_called_once()
+
+    def test_closing_early_closes_the_cursor_and_the_transaction(
+        self, database, cursor
+    ):
+        chunks = iterate_chunks(Row.select(Row.id, Row.name), 3)
+
+        assert next(chunks) == self.ROWS[0:3]
+        chunks.close()
+
+        cursor.close.assert_called()
+        database.atomic.return_value.__exit__.assert_called_once()
+        assert cursor.fetchmany.call_count == 1
+
+    def test_the_transaction_has_an_idle_timeout(self, database):
+        list(iterate_chunks(Row.select(Row.id, Row.name), 3, timeout=30))
+
+        database.execute_sql.assert_called_once_with(
+            "SET LOCAL idle_in_transaction_session_timeout = %s", (30_000,)
+        )
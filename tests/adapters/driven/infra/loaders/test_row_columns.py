@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from src.adapters.driven.infra.loaders.row_columns import (
+    RowColumns,
+    read_row,
+    select_columns,
+)
+from src.adapters.driven.infra.models.categories import Category
+from src.adapters.driven.infra.models.products import Product
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+class TestRowColumns:
+    def test_reads_columns_by_name(self):
+        columns = RowColumns(Category)
+        values = tuple(
+            {
+                "id": 4,
+                "created_at": NOW,
+                "updated_at": NOW,
+                "deleted_at": None,
+                "name": "Acompanhamento",
+                "description": "Queijo, bacon",
+                "is_component": True,
+            }[name]
+            for name in columns.names
+        )
+
+        row = columns.read(values)
+
+        assert row["id"] == 4
+        assert row["name"] == "Acompanhamento"
+        assert row["is_component"] is True
+
+    def test_foreign_keys_read_as_their_column(self):
+        assert "category_id" in RowColumns(Product).names
+        assert "currency_id" in RowColumns(Product).names
+
+    def test_left_join_miss_reads_as_none(self):
+        columns = RowColumns(Category)
+
+        assert columns.read((None,) * len(columns)) is None
+
+    def test_splits_a_joined_row(self):
+        product_columns = RowColumns(Product)
+        category_columns = RowColumns(Category)
+        fields = select_columns(product_columns, category_columns)
+        values = tuple(
+            7 if field is Product.id else "X-Burger" if field is Product.name else None
+            for field in fields
+        )
+
+        product, category = read_row(values, product_columns, category_columns)
+
+        assert len(fields) == len(product_columns) + len(category_columns)
+        assert product["id"] == 7
+        assert product["name"] == "X-Burger"
+        assert category is None
@@ -0,0 +1,222 @@
+from unittest.mock import MagicMock
+
+import pytest
+from peewee import SqliteDatabase
+
+from src.adapters.driven.infra.models.address import Address
+from src.adapters.driven.infra.models.categories import Category
+from src.adapters.driven.infra.models.currencies import Currency
+from src.adapters.driven.infra.models.payment_methods import PaymentMethod
+from src.adapters.driven.infra.models.payments import Payment
+from src.adapters.driven.infra.models.persona import Persona
+from src.adapters.driven.infra.models.product_components import ProductComponent
+from src.adapters.driven.infra.models.products import Product
+from src.adapters.driven.infra.models.purchase_selected_products import (
+    PurchaseSelectedProducts,
+)
+from src.adapters.driven.infra.models.purchases import Purchase
+from src.adapters.driven.infra.models.select_product import SelectedProduct
+from src.adapters.driven.infra.models.select_product_components import (
+    SelectedProductComponent,
+)
+from src.adapters.driven.infra.ports.orm_meio_de_pagamento_query import (
+    OrmMeioDePagamentoQuery,
+)
+from src.adapters.driven.infra.ports.orm_pedido_query import OrmPedidoQuery
+from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
+from src.adapters.driven.infra.repositories import orm_pedido_repository
+from src.adapters.driven.infra.repositories.orm_pagamento_repository import (
+    OrmPagamentoRepository,
+)
+from src.adapters.driven.infra.repositories.orm_pedido_repository import (
+    OrmPedidoRepository,
+)
+from src.core.application.services.pagamento_service import PagamentoService
+from src.core.application.services.pedido_service_command import PedidoServiceCommand
+from src.core.domain.entities.cliente_entity import PartialClienteEntity
+from src.core.domain.entities.compra_entity import PartialCompraEntity
+from src.core.domain.entities.currency_entity import PartialCurrencyEntity
+from src.core.domain.entities.pagamento_entity import PartialPagamentoEntity
+from src.core.domain.entities.produto_escolhido_entity import (
+    PartialProdutoEscolhidoEntity,
+)
+from src.core.domain.value_objects.preco_value_object import PrecoValueObject
+from src.core.helpers.enums.compra_status import CompraStatus
+from src.core.helpers.enums.pagamento_status import PagamentoStatus
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+
+MODELS = [
+    Address,
+    Category,
+    Currency,
+    PaymentMethod,
+    Payment,
+    Persona,
+    Product,
+    ProductComponent,
+    Purchase,
+    PurchaseSelectedProducts,
+    SelectedProduct,
+    SelectedProductComponent,
+]
+
+
+class TestOrmPedidoRepository:
+    @pytest.fixture(autouse=True)
+    def database(self, monkeypatch):
+        database = SqliteDatabase(":memory:")
+        with database.bind_ctx(MODELS):
+            database.create_tables(MODELS)
+            monkeypatch.setattr(orm_pedido_repository, "db", database)
+            currency = Currency.create(symbol="R$", name="Real", code="BRL")
+            category = Category.create(name="Lanche")
+            Product.create(
+                name="X-Burger",
+                price=19.9,
+                currency=currency,
+                category=category,
+                is_active=True,
+            )
+            Persona.create(name="Cliente", document="12345678900")
+            PaymentMethod.create(
+                name="QR Code",
+                sys_name="DefaultPaymentProvider",
+                description="Pagamento por QR Code.",
+            )
+            yield database
+        database.close()
+
+    @pytest.fixture
+    def pedido_repository(self):
+        return OrmPedidoRepository(InMemoryCacheService(start_cleaner_deamon=False))
+
+    @pytest.fixture
+    def pedido_command(self, pedido_repository):
+        return PedidoServiceCommand(
+            pedido_repository,
+            OrmPedidoQuery(),
+            OrmProductQuery(),
+            InMemoryCacheService(start_cleaner_deamon=False),
+        )
+
+    @pytest.fixture
+    def pagamento_service(self, pedido_repository):
+        payment_provider = MagicMock()
+        payment_provider.initiate_payment.return_value = True
+        payment_provider.finalize_payment.return_value = True
+        return PagamentoService(
+            OrmPagamentoRepository(),
+            pedido_repository,
+            OrmPedidoQuery(),
+            OrmMeioDePagamentoQuery(),
+            payment_provider,
+            [],
+        )
+
+    @pytest.fixture
+    def pedido_id(self, pedido_command):
+        pedido = pedido_command.create_pedido(
+            PartialCompraEntity(
+                client=PartialClienteEntity(id=1),
+                status=CompraStatus.CRIANDO,
+                selected_products=None,
+                total=PrecoValueObject(value=0, currency=PartialCurrencyEntity(id=1)),
+            )
+        )
+        pedido_command.add_new_product(pedido.purchase.id, 1)
+        return pedido.purchase.id
+
+    def test_update_reads_payments_written_after_the_order_was_cached(
+        self, pedido_repository, pagamento_service, pedido_id
+    ):
+        payment = pagamento_service.initiate_purchase_payment(pedido_id, 1, "")
+
+        assert [
+            p.status for p in pedido_repository.get_by_purchase_id(pedido_id).payments
+        ] == [PagamentoStatus.PROCESSANDO]
+
+        pagamento_service.finalize_purchase_payment(payment.payment.id)
+
+        pedido = pedido_repository.get_by_purchase_id(pedido_id)
+        assert pedido.purchase.status == CompraStatus.CONCLUIDO
+        assert [p.status for p in pedido.payments] == [PagamentoStatus.PAGO]
+
+    def test_concludes_an_order_paid_after_it_was_cached(
+        self, pedido_repository, pedido_command, pedido_id
+    ):
+        pedido = pedido_repository.get_by_purchase_id(pedido_id)
+        OrmPagamentoRepository().create(
+            PartialPagamentoEntity(
+                payment_method=OrmMeioDePagamentoQuery().get(1),
+                status=PagamentoStatus.PAGO,
+                payment_value=pedido.purchase.total,
+            ),
+            pedido.purchase,
+        )
+        pedido_repository.update(pedido.purchase)
+
+        pedido = pedido_command.concludes_pedido(pedido_id)
+
+        assert pedido.purchase.status == CompraStatus.CONCLUIDO
+        assert [p.status for p in pedido.payments] == [PagamentoStatus.PAGO]
+
+    def test_matches_returned_lines_by_product_in_any_order(
+        self, monkeypatch, pedido_repository
+    ):
+        currency, category = Currency.get_by_id(1), Category.get_by_id(1)
+        Product.create(
+            name="Batata",
+            price=9.9,
+            currency=currency,
+            category=category,
+            is_active=True,
+        )
+        insert_many = SelectedProduct.insert_many
+
+        class ReversedReturning:
+            def __init__(self, query):
+                self.query = query
+
+            def returning(self, *columns):
+                self.query = self.query.returning(*columns)
+                return self
+
+            def execute(self):
+                return list(reversed(list(self.query.execute())))
+
+        monkeypatch.setattr(
+            SelectedProduct,
+            "insert_many",
+            lambda rows: ReversedReturning(insert_many(rows)),
+        )
+        lanche, batata = (
+            OrmProductQuery().get_only_entity(1),
+            OrmProductQuery().get_only_entity(2),
+        )
+
+        pedido = pedido_repository.create(
+            PartialCompraEntity(
+                client=PartialClienteEntity(id=1),
+                status=CompraStatus.CRIANDO,
+                selected_products=[
+                    PartialProdutoEscolhidoEntity(
+                        product=lanche, added_components=[batata]
+                    ),
+                    PartialProdutoEscolhidoEntity(product=batata),
+                ],
+                total=PrecoValueObject(value=0, currency=PartialCurrencyEntity(id=1)),
+            )
+        )
+
+        lines = pedido.purchase.selected_products
+        assert [line.product.id for line in lines] == [1, 2]
+        assert [SelectedProduct.get_by_id(line.id).product_id for line in lines] == [
+            1,
+            2,
+        ]
+        assert [
+            component.component_id
+            for component in SelectedProductComponent.select().where(
+                SelectedProductComponent.selected_product == lines[0].id
+            )
+        ] == [2]
@@ -0,0 +1,50 @@
+import pytest
+from peewee import SqliteDatabase
+
+from src.adapters.driven.infra.models.categories import Category
+from src.adapters.driven.infra.models.currencies import Currency
+from src.adapters.driven.infra.models.product_components import ProductComponent
+from src.adapters.driven.infra.models.products import Product
+from src.adapters.driven.infra.ports.orm_produto_query import OrmProductQuery
+from src.adapters.driven.infra.repositories import orm_produto_repository
+from src.adapters.driven.infra.repositories.orm_produto_repository import (
+    OrmProdutoRepository,
+)
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+
+MODELS = [Category, Currency, Product, ProductComponent]
+
+
+class TestOrmProdutoRepository:
+    @pytest.fixture(autouse=True)
+    def database(self, monkeypatch):
+        database = SqliteDatabase(":memory:")
+        with database.bind_ctx(MODELS):
+            database.create_tables(MODELS)
+            monkeypatch.setattr(orm_produto_repository, "db", database)
+            currency = Currency.create(symbol="R$", name="Real", code="BRL")
+            category = Category.create(name="Lanche")
+            for name in ("X-Burger", "Queijo"):
+                Product.create(
+                    name=name,
+                    price=10,
+                    currency=currency,
+                    category=category,
+                    allow_components=True,
+                    is_active=True,
+                )
+            yield database
+        database.close()
+
+    def test_update_stores_and_returns_a_repeated_component_once(self):
+        repository = OrmProdutoRepository(
+            InMemoryCacheService(start_cleaner_deamon=False)
+        )
+        produto = OrmProductQuery().get_only_entity(1)
+        component = OrmProductQuery().get_only_entity(2)
+        produto.components = [component, component]
+
+        updated = repository.update(produto)
+
+        assert [c.id for c in updated.product.components] == [2]
+        assert ProductComponent.select().count() == 1
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from src.adapters.driver.API import produto_router
+from src.adapters.driver.API.dependencies import get_produto_query
+from src.adapters.driver.API.etag import (
+    add_validators,
+    etag_response,
+    http_date,
+    not_modified_response,
+    version_etag,
+)
+from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
+from src.core.domain.entities.produto_entity import ProdutoEntity
+
+ETAG = '"abc"'
+VERSION = datetime(2024, 5, 1, 12, 30, 15, 250000)
+
+
+class TestEtagResponse:
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+
+        @app.get("/menu")
+        def menu(request: Request):
+            return etag_response(request, b'{"items":[]}', ETAG)
+
+        return TestClient(app)
+
+    def test_sends_body_with_etag(self, client):
+        response = client.get("/menu")
+        assert response.status_code == 200
+        assert response.json() == {"items": []}
+        assert response.headers["etag"] == ETAG
+        assert response.headers["cache-control"] == "no-cache"
+
+    @pytest.mark.parametrize("header", [ETAG, f'"x", W/{ETAG}', "*"])
+    def test_matching_if_none_match_is_not_modified(self, client, header):
+        response = client.get("/menu", headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == ETAG
+
+    def test_other_etag_gets_the_body(self, client):
+        response = client.get("/menu", headers={"If-None-Match": '"old"'})
+        assert response.status_code == 200
+
+
+class TestVersionedResponse:
+    @pytest.fixture
+    def loads(self):
+        return []
+
+    @pytest.fixture
+    def client(self, loads):
+        app = FastAPI()
+        versions = {1: VERSION}
+
+        @app.get("/pedido/{pedido_id}")
+        def get_pedido(pedido_id: int, request: Request, response: Response):
+            not_modified = not_modified_response(request, versions.get(pedido_id))
+            if not_modified:
+                return not_modified
+            loads.append(pedido_id)
+            add_validators(response, versions.get(pedido_id))
+            return {"id": pedido_id}
+
+        return TestClient(app)
+
+    def test_sends_validators_with_the_body(self, client, loads):
+        response = client.get("/pedido/1")
+        assert response.json() == {"id": 1}
+        assert response.headers["etag"] == version_etag(VERSION)
+        assert response.headers["last-modified"] == http_date(VERSION)
+        assert loads == [1]
+
+    def test_unchanged_version_is_not_loaded(self, client, loads):
+        response = client.get(
+            "/pedido/1", headers={"If-None-Match": version_etag(VERSION)}
+        )
+        assert response.status_code == 304
+        assert loads == []
+
+    def test_if_modified_since_has_second_precision(self, client, loads):
+        same_second = client.get(
+            "/pedido/1", headers={"If-Modified-Since": http_date(VERSION)}
+        )
+        before = client.get(
+            "/pedido/1",
+            headers={"If-Modified-Since": http_date(VERSION - timedelta(seconds=1))},
+        )
+        assert same_second.status_code == 304
+        assert before.status_code == 200
+
+    def test_if_none_match_takes_precedence(self, client):
+        response = client.get(
+            "/pedido/1",
+            headers={"If-None-Match": '"old"', "If-Modified-Since": http_date(VERSION)},
+        )
+        assert response.status_code == 200
+
+    def test_missing_resource_has_no_validators(self, client, loads):
+        response = client.get("/pedido/2", headers={"If-None-Match": "*"})
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert loads == [2]
+
+
+class FakeProdutoQuery:
+    """The database version, and a cached copy that may trail it."""
+
+    def __init__(self):
+        self.version = VERSION
+        self.cached = self.produto(VERSION)
+
+    @staticmethod
+    def produto(updated_at: datetime) -> ProdutoAggregate:
+        return ProdutoAggregate(
+            product=ProdutoEntity(
+                id=1,
+                created_at=VERSION,
+                updated_at=updated_at,
+                name=f"X-Burger {updated_at:%S}",
+            )
+        )
+
+    def get_version(self, item_id: int):
+        return self.version
+
+    def get(self, item_id: int):
+        return self.cached
+
+
+class TestProdutoValidators:
+    @pytest.fixture
+    def query(self):
+        return FakeProdutoQuery()
+
+    @pytest.fixture
+    def client(self, query):
+        app = FastAPI()
+        app.include_router(produto_router.router)
+        app.dependency_overrides[get_produto_query] = lambda: query
+        return TestClient(app)
+
+    def test_update_between_two_gets_while_the_copy_is_cached(self, client, query):
+        first = client.get("/produto/1")
+        assert first.headers["etag"] == version_etag(VERSION)
+
+        updated = VERSION + timedelta(seconds=10)
+        query.version = updated
+        stale = client.get(
+            "/produto/1", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert stale.status_code == 200
+        assert stale.json()["product"]["name"] == first.json()["product"]["name"]
+        assert stale.headers["etag"] == version_etag(VERSION)
+
+        query.cached = query.produto(updated)
+        fresh = client.get(
+            "/produto/1", headers={"If-None-Match": stale.headers["etag"]}
+        )
+        assert fresh.status_code == 200
+        assert fresh.json()["product"]["name"] != first.json()["product"]["name"]
+        assert fresh.headers["etag"] == version_etag(updated)
+        assert (
+            client.get(
+                "/produto/1", headers={"If-None-Match": fresh.headers["etag"]}
+            ).status_code
+            == 304
+        )
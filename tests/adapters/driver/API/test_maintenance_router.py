@@ -0,0 +1,29 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.adapters.driver.API import maintenance_router
+
+
+class TestMaintenanceRouter:
+    @pytest.fixture
+    def container(self, monkeypatch):
+        container = MagicMock()
+        monkeypatch.setattr(maintenance_router, "get_container", lambda: container)
+        return container
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(maintenance_router.router)
+        return TestClient(app)
+
+    def test_seed_invalidates_the_caches(self, monkeypatch, client, container):
+        calls = []
+        monkeypatch.setattr(maintenance_router, "seed_db", lambda: calls.append("seed"))
+        container.invalidate_caches.side_effect = lambda: calls.append("invalidate")
+
+        assert client.post("/maintenance/seed_db").json() is True
+        assert calls == ["seed", "invalidate"]
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.adapters.driver.API import queue_router, thread_pool
+from src.core.application.services.pedido_service_query import PedidoServiceQuery
+from src.core.helpers.base.page import Page
+
+QUERY_SECONDS = 0.2
+PARALLEL_REQUESTS = 10
+
+
+class TestRouterConcurrency:
+    @pytest.fixture
+    def app(self):
+        app = FastAPI()
+        app.include_router(queue_router.router)
+        return app
+
+    @pytest.fixture
+    def slow_queue(self, monkeypatch):
+        def index(self, options=None):
+            # Stands in for a blocking peewee query.
+            time.sleep(QUERY_SECONDS)
+            return Page(items=[])
+
+        monkeypatch.setattr(PedidoServiceQuery, "index", index)
+
+    def test_parallel_requests_do_not_serialize(self, app, slow_queue):
+        async def load():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                started = time.perf_counter()
+                responses = await asyncio.gather(
+                    *[client.get("/queue/") for _ in range(PARALLEL_REQUESTS)]
+                )
+                return time.perf_counter() - started, responses
+
+        elapsed, responses = asyncio.run(load())
+
+        assert all(response.status_code == 200 for response in responses)
+        # Serialized on the event loop this would take PARALLEL_REQUESTS * QUERY_SECONDS.
+        assert elapsed < QUERY_SECONDS * PARALLEL_REQUESTS / 2
+
+    def test_thread_pool_follows_db_pool(self, monkeypatch):
+        monkeypatch.delenv("API_THREAD_POOL_SIZE", raising=False)
+        monkeypatch.setattr(
+            thread_pool,
+            "get_pool_stats",
+            lambda: {"pooled": True, "max_connections": 7},
+        )
+        assert thread_pool.thread_pool_size() == 7
+
+    def test_thread_pool_size_override(self, monkeypatch):
+        monkeypatch.setenv("API_THREAD_POOL_SIZE", "3")
+        assert thread_pool.thread_pool_size() == 3
+
+    def test_thread_pool_without_db_pool(self, monkeypatch):
+        monkeypatch.delenv("API_THREAD_POOL_SIZE", raising=False)
+        monkeypatch.setattr(thread_pool, "get_pool_stats", lambda: {"pooled": False})
+        assert thread_pool.thread_pool_size() == thread_pool.DEFAULT_THREAD_POOL_SIZE
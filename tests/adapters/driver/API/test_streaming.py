@@ -0,0 +1,90 @@
+import json
+from typing import List
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from src.adapters.driver.API import streaming
+from src.adapters.driver.API.streaming import (
+    NDJSON_MEDIA_TYPE,
+    json_array_chunks,
+    ndjson_lines,
+    stream_response,
+)
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+ITEMS = [Item(id=index, name=f"Pedido {index}") for index in range(5)]
+
+
+class TestEncoders:
+    def test_ndjson_lines(self):
+        body = b"".join(ndjson_lines(ITEMS))
+        assert [json.loads(line) for line in body.splitlines()] == [
+            item.model_dump() for item in ITEMS
+        ]
+
+    @pytest.mark.parametrize("items", [ITEMS, []])
+    def test_json_array(self, items):
+        body = b"".join(json_array_chunks(items))
+        assert json.loads(body) == [item.model_dump() for item in items]
+
+
+class TestStreamResponse:
+    @pytest.fixture
+    def state(self) -> dict:
+        return {"closed": False, "read": 0}
+
+    @pytest.fixture
+    def client(self, state, monkeypatch):
+        monkeypatch.setattr(streaming, "STREAM_BUFFER_BYTES", 16)
+        app = FastAPI()
+
+        def items(fail_at: int = -1):
+            try:
+                for index, item in enumerate(ITEMS):
+                    if index == fail_at:
+                        raise RuntimeError("database gone")
+                    state["read"] += 1
+                    yield item
+            finally:
+                state["closed"] = True
+
+        @app.get("/pedidos")
+        def pedidos(request: Request, fail_at: int = -1):
+            return stream_response(request, items(fail_at))
+
+        return TestClient(app)
+
+    def expected(self) -> List[dict]:
+        return [item.model_dump() for item in ITEMS]
+
+    def test_streams_a_json_array(self, client, state):
+        response = client.get("/pedidos")
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == self.expected()
+        assert state["closed"]
+
+    def test_streams_ndjson_when_accepted(self, client):
+        response = client.get("/pedidos", headers={"Accept": NDJSON_MEDIA_TYPE})
+
+        assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+        assert [
+            json.loads(line) for line in response.text.splitlines()
+        ] == self.expected()
+
+    def test_error_midway_ends_the_body_and_closes_items(self, client, state):
+        response = client.get("/pedidos", params={"fail_at": 3})
+
+        assert response.status_code == 200
+        with pytest.raises(ValueError):
+            json.loads(response.text)
+        assert state["read"] == 3
+        assert state["closed"]
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from src.adapters.driven.infra.cache.redis_cache_service import RedisCacheService
+from src.adapters.driver import container as container_module
+from src.adapters.driver.API import dependencies
+from src.core.domain.entities.produto_entity import ProdutoEntity
+from src.core.helpers.services.cache_eviction import LFUEviction
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from src.core.helpers.services.tiered_cache import TieredCacheService
+from tests.test_resources.redis_stand_in import RedisStandIn
+
+
+class TestContainer:
+    @pytest.fixture(autouse=True)
+    def fresh_container(self):
+        container_module.reset_container()
+        yield
+        container_module.reset_container()
+
+    def test_container_is_process_wide(self):
+        assert container_module.get_container() is container_module.get_container()
+
+    def test_pedido_routes_share_services_and_cache(self):
+        container = container_module.get_container()
+        assert container.pedido_repository.cache_service is container.pedido_cache
+        assert container.pedido_command.purchase_repository is (
+            container.pedido_repository
+        )
+        assert container.pedido_command.cache_service is container.produto_cache
+        assert container.produto_repository.cache_service is container.produto_cache
+
+    def test_pagamento_service_is_built_per_use(self):
+        container = container_module.get_container()
+        first = container.create_pagamento_service()
+        second = container.create_pagamento_service()
+        assert first is not second
+        assert first.notification_services is not second.notification_services
+        assert first.pedido_repository is container.pedido_repository
+
+    def test_dependencies_return_singletons(self):
+        container = container_module.get_container()
+        for provider, expected in (
+            (dependencies.get_pedido_command, container.pedido_command),
+            (dependencies.get_pedido_query, container.pedido_query_service),
+            (dependencies.get_produto_command, container.produto_command),
+            (dependencies.get_produto_query, container.produto_query_service),
+            (dependencies.get_cliente_service, container.cliente_service),
+        ):
+            assert asyncio.run(provider()) is expected
+
+    def test_namespaces_share_one_cache(self):
+        container = container_module.get_container()
+        assert container.pedido_cache.cache is container.cache
+        assert container.produto_cache.cache is container.cache
+        assert set(container.cache_keyspace.stats()) == {
+            "pedido",
+            "produto",
+            "pedido_query",
+            "produto_query",
+            "cliente_query",
+            "categoria_query",
+            "currency_query",
+            "meio_de_pagamento_query",
+            "catalog_snapshot",
+        }
+
+    def test_product_writes_invalidate_the_cached_product_query(self):
+        container = container_module.get_container()
+        assert container.produto_query_service.product_query is (
+            container.cached_produto_query
+        )
+        assert container.produto_command.product_query is container.produto_query
+        assert container.produto_repository.invalidation_hooks == [
+            container.cached_produto_query.invalidate,
+            container.catalog_snapshot.invalidate,
+        ]
+
+    def test_pedido_and_cliente_writes_invalidate_their_cached_queries(self):
+        container = container_module.get_container()
+        assert container.pedido_repository.invalidation_hooks == [
+            container.cached_pedido_query.invalidate
+        ]
+        assert container.cliente_repository.invalidation_hooks == [
+            container.cached_cliente_query.invalidate
+        ]
+        assert container.cliente_service.client_query is (
+            container.cached_cliente_query
+        )
+
+    def test_invalidate_caches_drops_entities_queries_and_the_menu(self):
+        container = container_module.get_container()
+        produto = container.produto_cache
+        produto.set(1, ProdutoEntity.model_construct(id=1))
+        version = container.catalog_snapshot._version.current()
+        container.invalidate_caches()
+        assert produto.get(1) is None
+        assert container.catalog_snapshot._version.current() != version
+
+    def test_reset_closes_cache(self, monkeypatch):
+        container = container_module.get_container()
+        stopped = []
+        monkeypatch.setattr(container.cache, "close", lambda: stopped.append("cache"))
+        container_module.reset_container()
+        assert stopped == ["cache"]
+        assert container_module.get_container() is not container
+
+    def test_caches_are_bounded_from_environment(self, monkeypatch):
+        monkeypatch.setenv("CACHE_MAX_BYTES", "1024")
+        monkeypatch.setenv("CACHE_MAX_ENTRIES", "10")
+        monkeypatch.setenv("CACHE_EVICTION_POLICY", "lfu")
+        cache = container_module.build_cache()
+        try:
+            assert cache.max_bytes == 1024
+            assert cache.max_entries == 10
+            assert isinstance(cache._segments[0].eviction, LFUEviction)
+        finally:
+            cache.stop_cleaner()
+
+    def test_redis_is_the_shared_tier_when_configured(self, monkeypatch):
+        server = RedisStandIn().start()
+        monkeypatch.setenv("CACHE_REDIS_URL", server.url)
+        monkeypatch.setenv("CACHE_REDIS_SECRET", "secret")
+        monkeypatch.setenv("CACHE_REDIS_MAX_CONNECTIONS", "5")
+        monkeypatch.setenv("CACHE_L1_TTL", "2")
+        cache = container_module.build_cache()
+        try:
+            assert isinstance(cache, TieredCacheService)
+            assert isinstance(cache.l1, InMemoryCacheService)
+            assert isinstance(cache.l2, RedisCacheService)
+            assert cache.l2.pool.max_connections == 5
+            assert cache.l1_ttl == 2
+        finally:
+            cache.close()
+            server.stop()
+
+    def test_redis_requires_a_signing_secret(self, monkeypatch):
+        monkeypatch.setenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        monkeypatch.delenv("CACHE_REDIS_SECRET", raising=False)
+        with pytest.raises(ValueError):
+            container_module.build_cache()
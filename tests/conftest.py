@@ -0,0 +1,13 @@
+import os
+
+# Most modules import the database module, which reads its settings on
+# import. No test opens a connection with them: the ones that need a
+# database bind the models to their own in-memory SQLite database.
+for key, value in {
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+}.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,149 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.application.services.catalog_snapshot_service import (
+    CatalogSnapshotService,
+)
+from src.core.domain.aggregates.produto_aggregate import ProdutoAggregate
+from src.core.domain.entities.categoria_entity import CategoriaEntity
+from src.core.domain.entities.currency_entity import CurrencyEntity
+from src.core.domain.entities.meio_de_pagamento_entity import MeioDePagamentoEntity
+from src.core.domain.entities.produto_entity import ProdutoEntity
+from src.core.domain.value_objects.preco_value_object import PrecoValueObject
+from src.core.helpers.base.page import Page
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from tests.test_resources.local_invalidation_bus import tiered_pods
+
+NOW = datetime(2024, 1, 1)
+
+
+def produto(item_id: int, is_active: bool = True) -> ProdutoAggregate:
+    return ProdutoAggregate(
+        product=ProdutoEntity(
+            id=item_id,
+            created_at=NOW,
+            updated_at=NOW,
+            name=f"Produto {item_id}",
+            is_active=is_active,
+            price=PrecoValueObject(
+                value=Decimal("10.00"),
+                currency=CurrencyEntity(
+                    id=1,
+                    created_at=NOW,
+                    updated_at=NOW,
+                    symbol="R$",
+                    name="Real",
+                    code="BRL",
+                ),
+            ),
+        )
+    )
+
+
+class TestCatalogSnapshotService:
+    @pytest.fixture
+    def product_query(self):
+        query = MagicMock()
+        query.find_page.return_value = Page(items=[produto(1), produto(2, False)])
+        return query
+
+    @pytest.fixture
+    def category_query(self):
+        query = MagicMock()
+        query.get_all.return_value = [
+            CategoriaEntity(
+                id=1, created_at=NOW, updated_at=NOW, name="Lanche", description="-"
+            )
+        ]
+        return query
+
+    @pytest.fixture
+    def currency_query(self):
+        query = MagicMock()
+        query.get_all.return_value = []
+        return query
+
+    @pytest.fixture
+    def payment_method_query(self):
+        query = MagicMock()
+        query.get_all.return_value = [
+            MeioDePagamentoEntity(
+                id=1,
+                created_at=NOW,
+                updated_at=NOW,
+                name="Pix",
+                sys_name="pix",
+                description="-",
+                is_active=False,
+            )
+        ]
+        return query
+
+    @pytest.fixture
+    def cache(self):
+        return InMemoryCacheService(start_cleaner_deamon=False)
+
+    @pytest.fixture
+    def catalog(
+        self, product_query, category_query, currency_query, payment_method_query, cache
+    ):
+        return CatalogSnapshotService(
+            product_query, category_query, currency_query, payment_method_query, cache
+        )
+
+    def test_menu_holds_only_active_items(self, catalog):
+        menu = json.loads(catalog.section(CatalogSnapshotService.MENU).body)
+        assert [product["id"] for product in menu["products"]] == [1]
+        assert len(menu["categories"]) == 1
+        assert menu["payment_methods"] == []
+
+    def test_sections_keep_the_endpoint_lists(self, catalog):
+        methods = catalog.section(CatalogSnapshotService.PAYMENT_METHODS)
+        assert [method["sys_name"] for method in json.loads(methods.body)] == ["pix"]
+
+    def test_reads_reuse_the_snapshot_until_invalidated(self, catalog, product_query):
+        first = catalog.section(CatalogSnapshotService.MENU)
+        assert catalog.section(CatalogSnapshotService.MENU) is first
+        assert product_query.find_page.call_count == 1
+
+        product_query.find_page.return_value = Page(items=[produto(1), produto(2)])
+        catalog.invalidate(2)
+        rebuilt = catalog.section(CatalogSnapshotService.MENU)
+        assert product_query.find_page.call_count == 2
+        assert rebuilt.etag != first.etag
+        assert len(json.loads(rebuilt.body)["products"]) == 2
+
+    def test_invalidation_reaches_processes_sharing_the_cache(
+        self, product_query, category_query, currency_query, payment_method_query, cache
+    ):
+        catalog, other = (
+            CatalogSnapshotService(
+                product_query, category_query, currency_query, payment_method_query, pod
+            )
+            for pod in tiered_pods(cache)
+        )
+        catalog.snapshot()
+        version = other.snapshot().version
+        catalog.invalidate()
+        assert other.snapshot().version != version
+
+    def test_same_data_has_the_same_etag(
+        self, product_query, category_query, currency_query, payment_method_query
+    ):
+        etags = {
+            CatalogSnapshotService(
+                product_query,
+                category_query,
+                currency_query,
+                payment_method_query,
+                InMemoryCacheService(start_cleaner_deamon=False),
+            )
+            .section(CatalogSnapshotService.CATEGORIES)
+            .etag
+            for _ in range(2)
+        }
+        assert len(etags) == 1
@@ -50,6 +50,9 @@ class TestPedidoService:
     ):
         cache_service.get = MagicMock(return_value=None)
         cache_service.set = MagicMock(return_value=None)
+        cache_service.get_or_load = MagicMock(
+            side_effect=lambda key, loader, **kwargs: loader()
+        )
         return PedidoServiceCommand(
             purchase_repository=purchase_repository,
             purchase_query=purchase_query,
@@ -216,6 +219,20 @@ class TestPedidoService:
         assert result == pedido_aggregate.purchase
         purchase_service.purchase_repository.update.assert_called_once()
 
+    def test_add_product_loads_product_through_cache(
+        self, purchase_service: PedidoServiceCommand, pedido_aggregate: PedidoAggregate
+    ):
+        purchase_service.purchase_repository.get_by_purchase_id = MagicMock(
+            return_value=pedido_aggregate
+        )
+        purchase_service.produto_query.get_only_entity = MagicMock(
+            return_value=pedido_aggregate.purchase.selected_products[0].product
+        )
+        purchase_service.add_new_product(1, 2)
+        purchase_service.cache_service.get_or_load.assert_called_once()
+        assert purchase_service.cache_service.get_or_load.call_args.args[0] == 2
+        purchase_service.produto_query.get_only_entity.assert_called_once_with(2)
+
     def test_add_product_to_existing_purchase_fail_because_purchase_doesnt_exists(
         self, purchase_service: PedidoServiceCommand, pedido_aggregate: PedidoAggregate
     ):
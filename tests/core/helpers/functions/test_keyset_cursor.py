@@ -0,0 +1,27 @@
+from datetime import datetime
+
+import pytest
+from src.core.helpers.functions.keyset_cursor import decode_cursor, encode_cursor
+
+
+class TestKeysetCursor:
+    def test_round_trip(self):
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        cursor = encode_cursor(created_at, 42)
+        assert decode_cursor(cursor, datetime, int) == [created_at, 42]
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor", datetime, int)
+
+    def test_cursor_with_wrong_size(self):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(1), datetime, int)
+
+    @pytest.mark.parametrize(
+        "values",
+        [(1, 2), ("not a date", 2), ("2024-05-01T12:30:15", "2"), (None, True)],
+    )
+    def test_cursor_with_wrong_types(self, values):
+        with pytest.raises(ValueError, match="Cursor inválido."):
+            decode_cursor(encode_cursor(*values), datetime, int)
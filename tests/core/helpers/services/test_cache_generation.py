@@ -0,0 +1,78 @@
+import pytest
+from src.core.helpers.services.cache_generation import CacheGeneration
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from tests.test_resources.local_invalidation_bus import tiered_pods
+
+
+class CountingCache(InMemoryCacheService):
+    def __init__(self):
+        super().__init__(start_cleaner_deamon=False)
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append("get")
+        return super().get(key)
+
+    def get_or_set(self, key, value, ttl=300, pin=False):
+        self.calls.append("get_or_set")
+        return super().get_or_set(key, value, ttl, pin)
+
+
+class RefusingCache(InMemoryCacheService):
+    """A shared cache that is down: nothing is read or stored."""
+
+    def __init__(self):
+        super().__init__(start_cleaner_deamon=False)
+
+    def get(self, key):
+        return None
+
+    def get_or_set(self, key, value, ttl=300, pin=False):
+        return None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCacheGeneration:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_reads_are_served_from_the_local_copy(self, clock):
+        cache = CountingCache()
+        generation = CacheGeneration(cache, "generation", local_ttl=1, clock=clock)
+        token = generation.current()
+        assert [generation.current() for _ in range(100)] == [token] * 100
+        assert cache.calls == ["get", "get_or_set"]
+
+    def test_local_copy_is_read_again_after_local_ttl(self, clock):
+        cache = CountingCache()
+        generation = CacheGeneration(cache, "generation", local_ttl=1, clock=clock)
+        token = generation.current()
+        cache.set("generation", "other", ttl=0, pin=True)
+        assert generation.current() == token
+        clock.now = 1
+        assert generation.current() == "other"
+
+    def test_bump_is_seen_by_processes_sharing_the_cache(self):
+        first, second = (
+            CacheGeneration(pod, "generation")
+            for pod in tiered_pods(InMemoryCacheService(start_cleaner_deamon=False))
+        )
+        token = second.current()
+        first.bump()
+        assert second.current() == first.current() != token
+
+    def test_keeps_its_own_token_while_the_cache_refuses_it(self, clock):
+        generation = CacheGeneration(
+            RefusingCache(), "generation", local_ttl=1, clock=clock
+        )
+        token = generation.current()
+        clock.now = 5
+        assert generation.current() == token
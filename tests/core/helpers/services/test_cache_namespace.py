@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock
+
+import pytest
+from src.core.helpers.services.cache_namespace import (
+    LOAD_SECONDS_BUCKETS,
+    CacheKeyspace,
+    LatencyHistogram,
+)
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from tests.test_resources.local_invalidation_bus import tiered_pods
+
+
+class Pedido(dict):
+    pass
+
+
+class Produto(dict):
+    pass
+
+
+class TestCacheKeyspace:
+    @pytest.fixture
+    def cache(self):
+        return InMemoryCacheService(start_cleaner_deamon=False)
+
+    @pytest.fixture
+    def keyspace(self, cache):
+        return CacheKeyspace(cache)
+
+    def test_same_id_does_not_collide_across_namespaces(self, keyspace):
+        pedidos = keyspace.namespace("pedido", Pedido)
+        produtos = keyspace.namespace("produto", Produto)
+        pedidos.set(5, Pedido(kind="pedido"))
+        produtos.set(5, Produto(kind="produto"))
+        assert pedidos.get(5) == {"kind": "pedido"}
+        assert produtos.get(5) == {"kind": "produto"}
+
+    def test_rejects_values_of_other_types(self, keyspace):
+        pedidos = keyspace.namespace("pedido", Pedido)
+        with pytest.raises(TypeError):
+            pedidos.set(1, Produto())
+        with pytest.raises(TypeError):
+            pedidos.get_or_load(1, Produto)
+        assert pedidos.get(1) is None
+
+    def test_namespace_ttl_is_the_default(self, cache, keyspace):
+        produtos = keyspace.namespace("produto", Produto, ttl=60, stale_ttl=30)
+        produtos.set(1, Produto())
+        produtos.get_or_load(2, Produto)
+        for key in (produtos.key(1), produtos.key(2)):
+            entry = cache._segment(key).entries[key]
+            assert entry.expiration - cache._clock() == pytest.approx(60, abs=1)
+        entry = cache._segment(produtos.key(2)).entries[produtos.key(2)]
+        assert entry.stale_until - entry.expiration == 30
+
+    def test_version_bump_orphans_old_entries(self, cache):
+        CacheKeyspace(cache).namespace("produto", Produto).set(1, Produto(a=1))
+        bumped = CacheKeyspace(cache).namespace("produto", Produto, version=2)
+        assert bumped.get(1) is None
+
+    def test_clear_only_drops_its_namespace(self, keyspace):
+        pedidos = keyspace.namespace("pedido", Pedido)
+        produtos = keyspace.namespace("produto", Produto)
+        pedidos.set(1, Pedido())
+        produtos.set(1, Produto())
+        pedidos.clear()
+        assert pedidos.get(1) is None
+        assert produtos.get(1) == {}
+
+    def test_clear_is_seen_by_processes_sharing_the_cache(self, cache):
+        pedidos, other = (
+            CacheKeyspace(pod).namespace("pedido", Pedido) for pod in tiered_pods(cache)
+        )
+        pedidos.set(1, Pedido())
+        assert other.get(1) == {}
+        other.clear()
+        assert pedidos.get(1) is None
+
+    def test_hits_do_not_reach_the_shared_cache(self, cache):
+        pod, _ = tiered_pods(cache)
+        pedidos = CacheKeyspace(pod).namespace("pedido", Pedido)
+        pedidos.set(1, Pedido())
+        pod.l2 = MagicMock()
+        assert [pedidos.get(1) for _ in range(100)] == [{}] * 100
+        assert pod.l2.method_calls == []
+
+    def test_name_is_registered_once(self, keyspace):
+        keyspace.namespace("pedido", Pedido)
+        with pytest.raises(ValueError):
+            keyspace.namespace("pedido", Produto)
+
+    def test_stats_are_per_namespace(self, keyspace):
+        pedidos = keyspace.namespace("pedido", Pedido)
+        produtos = keyspace.namespace("produto", Produto)
+        pedidos.set(1, Pedido())
+        pedidos.get(1)
+        pedidos.get(2)
+        produtos.get_or_load(1, Produto)
+        produtos.get_or_load(1, Produto)
+        stats = keyspace.stats()
+        assert stats["pedido"] == {
+            "hits": 1,
+            "misses": 1,
+            "loads": 0,
+            "sets": 1,
+            "deletes": 0,
+            "hit_ratio": 0.5,
+            "load_seconds": {
+                "count": 0,
+                "sum": 0.0,
+                "buckets": dict.fromkeys(
+                    [str(bound) for bound in LOAD_SECONDS_BUCKETS] + ["+Inf"], 0
+                ),
+            },
+            "entries": 1,
+            "bytes": stats["pedido"]["bytes"],
+            "evictions": 0,
+            "expirations": 0,
+        }
+        assert stats["produto"]["loads"] == 1
+        assert stats["produto"]["hits"] == 1
+
+    def test_load_times_are_recorded(self, keyspace):
+        produtos = keyspace.namespace("produto", Produto)
+        produtos.get_or_load(1, Produto)
+        produtos.get_or_load(1, Produto)
+        histogram = keyspace.stats()["produto"]["load_seconds"]
+        assert histogram["count"] == 1
+        assert histogram["buckets"]["+Inf"] == 1
+
+    def test_namespaces_without_entries_report_zero(self, keyspace):
+        keyspace.namespace("pedido", Pedido)
+        assert keyspace.stats()["pedido"]["entries"] == 0
+
+
+class TestLatencyHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = LatencyHistogram(buckets=(0.01, 0.1))
+        for seconds in (0.005, 0.01, 0.05, 2):
+            histogram.observe(seconds)
+        assert histogram.snapshot() == {
+            "count": 4,
+            "sum": pytest.approx(2.065),
+            "buckets": {"0.01": 2, "0.1": 3, "+Inf": 4},
+        }
@@ -0,0 +1,149 @@
+import pytest
+from src.core.helpers.enums.eviction_policy import EvictionPolicy
+from src.core.helpers.options.produto_find_options import ProdutoFindOptions
+from src.core.helpers.services.cache_namespace import CacheKeyspace
+from src.core.helpers.services.cached_query import (
+    GENERATION_KEY,
+    CachedMethod,
+    CachedQuery,
+)
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from tests.test_resources.local_invalidation_bus import tiered_pods
+
+
+class FakeProdutoQuery:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, item_id: int):
+        self.calls.append(("get", item_id))
+        return {"id": item_id} if item_id < 100 else None
+
+    def find(self, query_options: ProdutoFindOptions, limit: int = 10):
+        self.calls.append(("find", query_options.name, limit))
+        return [{"name": query_options.name}] if query_options.name else []
+
+    def get_only_entity(self, item_id: int):
+        self.calls.append(("get_only_entity", item_id))
+        return {"id": item_id}
+
+
+class TestCachedQuery:
+    @pytest.fixture
+    def cache(self):
+        return InMemoryCacheService(start_cleaner_deamon=False)
+
+    @pytest.fixture
+    def query(self):
+        return FakeProdutoQuery()
+
+    @pytest.fixture
+    def cached(self, cache, query):
+        namespace = CacheKeyspace(cache).namespace("produto_query", object)
+        return CachedQuery(
+            query,
+            namespace,
+            {
+                "get": CachedMethod(60, by_item=True, negative_ttl=5),
+                "find": CachedMethod(30, negative_ttl=5),
+            },
+        )
+
+    def test_reads_hit_the_port_once(self, cached, query):
+        assert cached.get(1) == {"id": 1}
+        assert cached.get(item_id=1) == {"id": 1}
+        assert query.calls == [("get", 1)]
+
+    def test_key_derives_from_every_argument(self, cached, query):
+        cached.find(ProdutoFindOptions(name="X-Burger"))
+        cached.find(ProdutoFindOptions(name="X-Burger"), limit=10)
+        cached.find(ProdutoFindOptions(name="X-Salada"))
+        cached.find(ProdutoFindOptions(name="X-Burger"), 20)
+        assert query.calls == [
+            ("find", "X-Burger", 10),
+            ("find", "X-Salada", 10),
+            ("find", "X-Burger", 20),
+        ]
+
+    def test_methods_without_policy_are_not_cached(self, cached, query):
+        cached.get_only_entity(1)
+        cached.get_only_entity(1)
+        assert query.calls == [("get_only_entity", 1), ("get_only_entity", 1)]
+
+    def test_each_method_has_its_own_ttl(self, cache, cached):
+        cached.get(1)
+        cached.find(ProdutoFindOptions(name="X-Burger"))
+        ttls = sorted(
+            round(entry.expiration - cache._clock())
+            for segment in cache._segments
+            for entry in segment.entries.values()
+            if entry.expiration is not None
+        )
+        assert ttls == [30, 60]
+
+    def test_invalidate_drops_the_item_and_every_collection(self, cached, query):
+        cached.get(1)
+        cached.get(2)
+        cached.find(ProdutoFindOptions(name="X-Burger"))
+        cached.invalidate(1)
+        cached.get(1)
+        cached.get(2)
+        cached.find(ProdutoFindOptions(name="X-Burger"))
+        assert query.calls == [
+            ("get", 1),
+            ("get", 2),
+            ("find", "X-Burger", 10),
+            ("get", 1),
+            ("find", "X-Burger", 10),
+        ]
+
+    def test_invalidation_is_seen_by_processes_sharing_the_cache(self, cache, query):
+        policies = {"find": CachedMethod(30)}
+        pod_a, pod_b = (
+            CachedQuery(
+                query, CacheKeyspace(pod).namespace("produto_query", object), policies
+            )
+            for pod in tiered_pods(cache)
+        )
+        pod_a.find(ProdutoFindOptions(name="X-Burger"))
+        pod_b.find(ProdutoFindOptions(name="X-Burger"))
+        pod_a.invalidate()
+        pod_b.find(ProdutoFindOptions(name="X-Burger"))
+        assert len(query.calls) == 2
+
+    def test_missing_items_are_cached_until_created(self, cached, query):
+        assert cached.get(404) is None
+        assert cached.get(404) is None
+        assert query.calls == [("get", 404)]
+        cached.invalidate(404)
+        cached.get(404)
+        assert query.calls == [("get", 404), ("get", 404)]
+
+    def test_empty_collections_are_cached_as_misses(self, cache, cached, query):
+        assert cached.find(ProdutoFindOptions()) == []
+        assert cached.find(ProdutoFindOptions()) == []
+        assert query.calls == [("find", None, 10)]
+        key = next(key for key in cache.keys() if ":find:" in key)
+        entry = cache._segment(key).entries[key]
+        assert entry.expiration - cache._clock() == pytest.approx(5, abs=1)
+
+    def test_generation_survives_a_full_bounded_cache(self, query):
+        cache = InMemoryCacheService(
+            start_cleaner_deamon=False,
+            segments=1,
+            max_entries=10,
+            eviction_policy=EvictionPolicy.TINY_LFU,
+        )
+        for _ in range(3):
+            for key in range(10):
+                if cache.get(key) is None:
+                    cache.set(key, key)
+        cached = CachedQuery(
+            query,
+            CacheKeyspace(cache).namespace("produto_query", object),
+            {"find": CachedMethod(30)},
+        )
+        generation = cached._generation.current()
+        for key in range(1_000):
+            cache.set(f"scan:{key}", key)
+        assert cached.cache.get(GENERATION_KEY) == generation
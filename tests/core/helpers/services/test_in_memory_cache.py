@@ -0,0 +1,515 @@
+import threading
+import time
+import tracemalloc
+
+import pytest
+from src.core.helpers.enums.eviction_policy import EvictionPolicy
+from src.core.helpers.functions.cache_serializer import deserialize
+from src.core.helpers.services import cache_segment
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def heap_size(cache: InMemoryCacheService) -> int:
+    return sum(len(segment.expiry_heap) for segment in cache._segments)
+
+
+class TestInMemoryCacheService:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(self, clock):
+        return InMemoryCacheService(start_cleaner_deamon=False, clock=clock)
+
+    def test_get_returns_value_until_it_expires(self, cache, clock):
+        cache.set("a", 1, ttl=10)
+        clock.advance(9)
+        assert cache.get("a") == 1
+        clock.advance(1)
+        assert cache.get("a") is None
+        assert "a" not in cache
+
+    def test_reads_return_private_copies(self, cache):
+        value = {"items": [1]}
+        cache.set("a", value)
+        value["items"].append(2)
+        cache.get("a")["items"].append(3)
+        assert cache.get("a") == {"items": [1]}
+
+    def test_entry_without_ttl_never_expires(self, cache, clock):
+        cache.set("a", 1, ttl=0)
+        clock.advance(10**6)
+        assert cache._clean_expired_entries() == 0
+        assert cache.get("a") == 1
+
+    def test_cleaner_removes_only_due_entries(self, cache, clock):
+        for key in range(100):
+            cache.set(key, key, ttl=1 + key % 2)
+        clock.advance(1)
+        assert cache._clean_expired_entries() == 50
+        assert sorted(cache.keys()) == list(range(1, 100, 2))
+
+    def test_stats_count_expirations_by_namespace(self, cache, clock):
+        cache.set("pedido:1", 1, ttl=1)
+        cache.set("pedido:2", 2, ttl=1)
+        cache.set("produto:1", 1, ttl=10)
+        clock.advance(1)
+        cache.get("pedido:1")
+        cache._clean_expired_entries()
+        stats = cache.stats()
+        assert stats["pedido"] == {
+            "entries": 0,
+            "bytes": 0,
+            "evictions": 0,
+            "expirations": 2,
+        }
+        assert stats["produto"]["entries"] == 1
+        assert stats["produto"]["bytes"] == len(
+            cache._segment("produto:1").entries["produto:1"].payload
+        )
+
+    def test_reset_key_is_not_evicted_by_its_old_expiry(self, cache, clock):
+        cache.set("a", 1, ttl=1)
+        cache.set("a", 2, ttl=100)
+        clock.advance(1)
+        assert cache._clean_expired_entries() == 0
+        assert cache.get("a") == 2
+
+    def test_clear_drops_expiry_heap(self, cache):
+        cache.set("a", 1, ttl=1)
+        cache.clear()
+        assert len(cache) == 0
+        assert heap_size(cache) == 0
+
+    def test_overwrites_keep_heap_bounded(self, cache):
+        for round_ in range(50):
+            for key in range(100):
+                cache.set(key, round_, ttl=300)
+        assert len(cache) == 100
+        for segment in cache._segments:
+            assert len(segment.expiry_heap) <= max(
+                cache_segment.HEAP_COMPACT_MIN_SIZE,
+                cache_segment.HEAP_COMPACT_FACTOR * len(segment.entries),
+            )
+
+    def test_memory_stays_flat_under_churn(self, cache, clock):
+        def churn(round_: int):
+            for key in range(2_000):
+                cache.set(f"{round_}:{key}", {"value": key}, ttl=1)
+            clock.advance(1)
+            cache._clean_expired_entries()
+
+        for round_ in range(5):
+            churn(round_)
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for round_ in range(5, 50):
+                churn(round_)
+            growth = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+        assert len(cache) == 0
+        assert heap_size(cache) == 0
+        # 90k entries were written; holding on to them would take megabytes.
+        assert growth < 256 * 1024
+
+    def test_background_cleaner_evicts_and_stops(self):
+        cache = InMemoryCacheService(cleaner_interval=0.01)
+        try:
+            cache.set("a", 1, ttl=0.02)
+            deadline = time.monotonic() + 2
+            while "a" in cache and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert "a" not in cache
+        finally:
+            cleaner = cache._cleaner
+            cache.stop_cleaner(timeout=1)
+        assert not cleaner.is_alive()
+
+    def test_start_cleaner_is_idempotent(self):
+        cache = InMemoryCacheService(cleaner_interval=60)
+        cleaner = cache._cleaner
+        cache.start_cleaner(60)
+        assert cache._cleaner is cleaner
+        cache.stop_cleaner(timeout=1)
+        assert not cleaner.is_alive()
+
+
+class TestBoundedInMemoryCacheService:
+    # The tests below cache ints and use the int itself as the entry size. A
+    # single segment keeps the whole budget and eviction order in one place.
+
+    def build(self, **kwargs) -> InMemoryCacheService:
+        return InMemoryCacheService(start_cleaner_deamon=False, segments=1, **kwargs)
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = self.build(max_entries=2, eviction_policy=EvictionPolicy.LRU)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert sorted(cache.keys()) == ["a", "c"]
+
+    def test_stats_count_evictions_by_namespace(self):
+        cache = self.build(max_entries=2)
+        cache.set("pedido:1", 1)
+        cache.set("pedido:2", 2)
+        cache.set("produto:1", 3)
+        cache.delete("produto:1")
+        assert cache.stats()["pedido"]["evictions"] == 1
+        assert "produto" not in cache.stats()
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = self.build(max_entries=2, eviction_policy=EvictionPolicy.LFU)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.get("b")
+        cache.get("b")
+        cache.set("c", 3)
+        assert sorted(cache.keys()) == ["b", "c"]
+
+    def test_tiny_lfu_keeps_hot_keys_through_a_scan(self):
+        cache = self.build(max_entries=10, eviction_policy=EvictionPolicy.TINY_LFU)
+        hot = [f"hot:{key}" for key in range(10)]
+        for _ in range(3):
+            for key in hot:
+                if cache.get(key) is None:
+                    cache.set(key, key)
+        for key in range(1_000):
+            cache.set(f"scan:{key}", key)
+        assert sorted(cache.keys()) == sorted(hot)
+
+    def test_get_or_set_reports_a_refused_value(self):
+        cache = self.build(max_entries=10, eviction_policy=EvictionPolicy.TINY_LFU)
+        for _ in range(3):
+            for key in range(10):
+                if cache.get(key) is None:
+                    cache.set(key, key)
+        assert cache.get_or_set("new", 1) is None
+        assert "new" not in cache
+
+    def test_pinned_keys_are_neither_refused_nor_evicted(self):
+        cache = self.build(max_entries=10, eviction_policy=EvictionPolicy.TINY_LFU)
+        for _ in range(3):
+            for key in range(10):
+                if cache.get(key) is None:
+                    cache.set(key, key)
+        assert cache.get_or_set("generation", "g1", ttl=0, pin=True) == "g1"
+        for key in range(1_000):
+            cache.set(f"scan:{key}", key)
+        assert cache.get_or_set("generation", "g2", ttl=0, pin=True) == "g1"
+        assert len(cache) == 11
+
+    def test_unpinned_overwrite_is_bounded_again(self):
+        cache = self.build(max_bytes=100, sizer=deserialize)
+        cache.set("a", 80, pin=True)
+        cache.set("b", 90)
+        assert sorted(cache.keys()) == ["a", "b"]
+        cache.set("a", 20)
+        assert sorted(cache.keys()) == ["a"]
+        assert cache.size_bytes == 20
+
+    def test_byte_budget_is_never_exceeded(self):
+        cache = self.build(max_bytes=1_000, sizer=deserialize)
+        for key in range(100):
+            cache.set(key, 90 + key % 20)
+            assert cache.size_bytes <= 1_000
+        assert cache.size_bytes == sum(cache.get(key) for key in cache.keys())
+
+    def test_value_larger_than_budget_is_not_cached(self):
+        cache = self.build(max_bytes=100, sizer=deserialize)
+        cache.set("a", 50)
+        cache.set("a", 500)
+        assert cache.get("a") is None
+        assert cache.size_bytes == 0
+
+    def test_update_adjusts_size(self):
+        cache = self.build(max_bytes=100, sizer=deserialize)
+        cache.set("a", 10)
+        cache.set("b", 10)
+        cache.set("a", 60)
+        assert cache.size_bytes == 70
+        cache.set("b", 50)
+        assert sorted(cache.keys()) == ["b"]
+        assert cache.size_bytes == 50
+
+    def test_removals_release_budget(self):
+        clock = FakeClock()
+        cache = self.build(max_bytes=100, sizer=deserialize, clock=clock)
+        cache.set("a", 10, ttl=1)
+        cache.set("b", 20)
+        cache.delete("b")
+        clock.advance(1)
+        cache._clean_expired_entries()
+        assert cache.size_bytes == 0
+        assert cache._segments[0].sizes == {}
+
+    def test_default_sizer_bounds_nested_values(self):
+        cache = self.build(max_bytes=64 * 1024)
+        for key in range(1_000):
+            cache.set(key, {"items": [{"name": f"produto {n}"} for n in range(20)]})
+        assert 0 < cache.size_bytes <= 64 * 1024
+        assert 0 < len(cache) < 1_000
+
+
+class TestAtomicInMemoryCacheService:
+    THREADS = 16
+
+    @pytest.fixture
+    def cache(self):
+        return InMemoryCacheService(start_cleaner_deamon=False)
+
+    def run_threads(self, target):
+        barrier = threading.Barrier(self.THREADS)
+        results = [None] * self.THREADS
+
+        def worker(index: int):
+            barrier.wait()
+            results[index] = target(index)
+
+        threads = [
+            threading.Thread(target=worker, args=(index,))
+            for index in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_get_or_set_keeps_the_first_value(self, cache):
+        assert cache.get_or_set("a", 1) == 1
+        assert cache.get_or_set("a", 2) == 1
+        assert cache.get("a") == 1
+
+    def test_get_or_set_race_has_a_single_winner(self, cache):
+        results = self.run_threads(lambda index: cache.get_or_set("a", index))
+        assert len(set(results)) == 1
+        assert cache.get("a") == results[0]
+
+    def test_compare_and_set_checks_version(self, cache):
+        assert cache.compare_and_set("a", None, 1)
+        assert not cache.compare_and_set("a", None, 2)
+        value, version = cache.get_with_version("a")
+        assert value == 1
+        cache.set("a", 3)
+        assert not cache.compare_and_set("a", version, 4)
+        _, version = cache.get_with_version("a")
+        assert cache.compare_and_set("a", version, 5)
+        assert cache.get("a") == 5
+
+    def test_compare_and_set_increments_are_not_lost(self, cache):
+        increments = 200
+        cache.set("counter", 0)
+
+        def increment(_):
+            for _ in range(increments):
+                while True:
+                    value, version = cache.get_with_version("counter")
+                    if cache.compare_and_set("counter", version, value + 1):
+                        break
+
+        self.run_threads(increment)
+        assert cache.get("counter") == self.THREADS * increments
+
+    def test_bounded_cache_stays_consistent_under_concurrent_writes(self):
+        cache = InMemoryCacheService(
+            start_cleaner_deamon=False, max_entries=64, segments=4
+        )
+
+        def churn(index: int):
+            for key in range(500):
+                cache.set((index, key % 100), key)
+                cache.get((index, (key + 1) % 100))
+                if key % 7 == 0:
+                    cache.delete((index, key % 100))
+
+        self.run_threads(churn)
+        assert len(cache) <= 64
+        for segment in cache._segments:
+            assert segment.size_bytes == sum(segment.sizes.values())
+            assert set(segment.sizes) == set(segment.entries)
+
+
+class TestInMemoryCacheServiceGetOrLoad:
+    THREADS = 16
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(self, clock):
+        return InMemoryCacheService(start_cleaner_deamon=False, clock=clock)
+
+    def counting_loader(self, *values, delay: float = 0):
+        calls = []
+
+        def loader():
+            calls.append(None)
+            time.sleep(delay)
+            return values[min(len(calls), len(values)) - 1]
+
+        return loader, calls
+
+    def test_concurrent_misses_share_one_load(self, cache):
+        loader, calls = self.counting_loader({"id": 1}, delay=0.1)
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(cache.get_or_load("a", loader))
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"id": 1}] * self.THREADS
+        assert cache.get("a") == {"id": 1}
+
+    def test_waiters_get_private_copies(self, cache):
+        release = threading.Event()
+        results = []
+
+        def loader():
+            release.wait()
+            return {"items": []}
+
+        leader = threading.Thread(
+            target=lambda: results.append(cache.get_or_load("a", loader))
+        )
+        leader.start()
+        while not cache._segment("a").flights:
+            time.sleep(0.001)
+        follower = threading.Thread(
+            target=lambda: results.append(cache.get_or_load("a", loader))
+        )
+        follower.start()
+        release.set()
+        leader.join()
+        follower.join()
+
+        results[0]["items"].append(1)
+        assert results[1] == {"items": []}
+
+    def test_loader_error_reaches_every_waiter(self, cache):
+        release = threading.Event()
+        errors = []
+
+        def loader():
+            release.wait()
+            raise ValueError("Produto não encontrado")
+
+        def worker():
+            try:
+                cache.get_or_load("a", loader)
+            except ValueError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        threads[0].start()
+        while not cache._segment("a").flights:
+            time.sleep(0.001)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 4
+        assert cache._segment("a").flights == {}
+        assert cache.get_or_load("a", lambda: 1) == 1
+
+    def test_none_is_not_cached(self, cache):
+        loader, calls = self.counting_loader(None)
+        assert cache.get_or_load("a", loader) is None
+        assert cache.get_or_load("a", loader) is None
+        assert len(calls) == 2
+
+    def test_none_is_cached_for_negative_ttl(self, cache, clock):
+        loader, calls = self.counting_loader(None, 1)
+        assert cache.get_or_load("a", loader, ttl=300, negative_ttl=5) is None
+        clock.advance(4)
+        assert cache.get_or_load("a", loader, ttl=300, negative_ttl=5) is None
+        assert len(calls) == 1
+        clock.advance(1)
+        assert cache.get_or_load("a", loader, ttl=300, negative_ttl=5) == 1
+        assert len(calls) == 2
+
+    def test_set_replaces_a_cached_miss(self, cache):
+        loader, calls = self.counting_loader(None)
+        cache.get_or_load("a", loader, negative_ttl=30)
+        cache.set("a", 1)
+        assert cache.get_or_load("a", loader, negative_ttl=30) == 1
+        assert len(calls) == 1
+
+    def test_expired_entry_is_reloaded(self, cache, clock):
+        loader, calls = self.counting_loader(1, 2)
+        assert cache.get_or_load("a", loader, ttl=10, early_refresh_beta=0) == 1
+        clock.advance(9)
+        assert cache.get_or_load("a", loader, ttl=10, early_refresh_beta=0) == 1
+        clock.advance(1)
+        assert cache.get_or_load("a", loader, ttl=10, early_refresh_beta=0) == 2
+        assert len(calls) == 2
+
+    def test_stale_value_is_served_while_one_caller_reloads(self, cache, clock):
+        cache.get_or_load("a", lambda: "old", ttl=10, stale_ttl=30)
+        clock.advance(15)
+        assert cache.get("a") is None
+
+        release = threading.Event()
+        results = []
+
+        def reload():
+            release.wait()
+            return "new"
+
+        leader = threading.Thread(
+            target=lambda: results.append(
+                cache.get_or_load("a", reload, ttl=10, stale_ttl=30)
+            )
+        )
+        leader.start()
+        while not cache._segment("a").flights:
+            time.sleep(0.001)
+        assert cache.get_or_load("a", reload, ttl=10, stale_ttl=30) == "old"
+        release.set()
+        leader.join()
+
+        assert results == ["new"]
+        assert cache.get("a") == "new"
+
+    def test_stale_window_ends(self, cache, clock):
+        cache.get_or_load("a", lambda: "old", ttl=10, stale_ttl=30)
+        clock.advance(40)
+        assert cache._clean_expired_entries() == 1
+        assert "a" not in cache
+
+    def test_early_refresh_probability_follows_beta(self, cache, clock):
+        loader, calls = self.counting_loader(1, 2, 3)
+        cache.get_or_load("a", loader, ttl=10)
+        clock.advance(5)
+        assert cache.get_or_load("a", loader, ttl=10, early_refresh_beta=0) == 1
+        assert len(calls) == 1
+        assert cache.get_or_load("a", loader, ttl=10, early_refresh_beta=1e12) == 2
+        assert len(calls) == 2
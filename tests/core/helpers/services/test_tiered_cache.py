@@ -0,0 +1,148 @@
+import pytest
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from src.core.helpers.services.tiered_cache import TieredCacheService
+from tests.test_resources.local_invalidation_bus import LocalBus
+
+
+class UnavailableCache(InMemoryCacheService):
+    """An l2 whose server is down: every operation raises."""
+
+    def __init__(self):
+        super().__init__(start_cleaner_deamon=False)
+
+    def _unavailable(self, *args, **kwargs):
+        raise ConnectionError("Redis indisponível.")
+
+    set = get = delete = clear = get_or_set = get_or_load = _unavailable
+    get_with_version = compare_and_set = _unavailable
+
+
+class UnavailableBus(LocalBus):
+    def publish(self, keys):
+        raise ConnectionError("Redis indisponível.")
+
+
+class TestTieredCacheService:
+    @pytest.fixture
+    def l2(self):
+        return InMemoryCacheService(start_cleaner_deamon=False)
+
+    @pytest.fixture
+    def pods(self, l2):
+        network = []
+        return [
+            TieredCacheService(
+                InMemoryCacheService(start_cleaner_deamon=False),
+                l2,
+                LocalBus(network),
+                l1_ttl=5,
+            )
+            for _ in range(2)
+        ]
+
+    def test_hits_are_served_from_l1(self, pods, l2):
+        pod, _ = pods
+        pod.set("a", 1)
+        l2.clear()
+        assert pod.get("a") == 1
+
+    def test_get_or_set_hits_are_served_from_l1(self, pods, l2):
+        writer, reader = pods
+        assert reader.get_or_set("a", 1) == 1
+        l2.clear()
+        assert reader.get_or_set("a", 2) == 1
+        writer.set("a", 3)
+        assert reader.get_or_set("a", 4) == 3
+
+    def test_misses_fill_l1_from_l2(self, pods):
+        writer, reader = pods
+        writer.set("a", 1)
+        assert "a" not in reader.l1
+        assert reader.get("a") == 1
+        assert "a" in reader.l1
+
+    def test_writes_invalidate_other_pods(self, pods):
+        writer, reader = pods
+        writer.set("a", 1)
+        assert reader.get("a") == 1
+        writer.set("a", 2)
+        assert "a" not in reader.l1
+        assert reader.get("a") == 2
+        writer.delete("a")
+        assert reader.get("a") is None
+
+    def test_l1_entries_expire_after_l1_ttl(self, pods):
+        pod, _ = pods
+        pod.set("a", 1, ttl=300)
+        entry = pod.l1._segment("a").entries["a"]
+        assert entry.expiration - pod.l1._clock() <= 5
+
+    def test_get_or_load_loads_once_for_every_pod(self, pods):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {"id": 1}
+
+        assert [pod.get_or_load("a", loader) for pod in pods] == [{"id": 1}] * 2
+        assert len(calls) == 1
+
+    def test_compare_and_set_uses_l2_versions(self, pods):
+        writer, reader = pods
+        writer.set("a", 1)
+        _, version = reader.get_with_version("a")
+        writer.set("a", 2)
+        assert not reader.compare_and_set("a", version, 3)
+        _, version = reader.get_with_version("a")
+        assert reader.compare_and_set("a", version, 3)
+        assert writer.get("a") == 3
+
+    def test_clear_drops_every_l1(self, pods):
+        writer, reader = pods
+        writer.set("a", 1)
+        reader.get("a")
+        writer.clear()
+        assert len(reader.l1) == 0
+
+
+class TestTieredCacheServiceWithoutL2:
+    @pytest.fixture
+    def pod(self):
+        return TieredCacheService(
+            InMemoryCacheService(start_cleaner_deamon=False),
+            UnavailableCache(),
+            UnavailableBus([]),
+            l1_ttl=5,
+        )
+
+    def test_writes_still_update_l1(self, pod):
+        pod.set("a", 1)
+        assert pod.get("a") == 1
+        pod.delete("a")
+        assert pod.get("a") is None
+        pod.set("a", 1)
+        pod.clear()
+        assert len(pod.l1) == 0
+
+    def test_get_or_load_falls_back_to_the_loader(self, pod):
+        assert pod.get_or_load("a", lambda: 1) == 1
+        assert pod.get_or_set("b", 2) == 2
+        assert pod.get_or_set("b", 3) == 2
+
+    def test_loader_errors_are_not_retried(self, pod):
+        pod.l2 = InMemoryCacheService(start_cleaner_deamon=False)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            pod.get_or_load("a", loader)
+        assert len(calls) == 1
+
+    def test_compare_and_set_fails_and_drops_l1(self, pod):
+        pod.set("a", 1)
+        assert pod.get_with_version("a") == (None, None)
+        assert not pod.compare_and_set("a", None, 2)
+        assert "a" not in pod.l1
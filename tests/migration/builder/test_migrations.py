@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from peewee import SqliteDatabase
+
+from migration.builder import migrations
+from migration.builder.migrations import (
+    IndexDefinition,
+    create_index,
+    delete_duplicates,
+)
+from src.adapters.driven.infra.models.product_components import ProductComponent
+
+INDEX = IndexDefinition(
+    "productcomponent_product_id_component_id",
+    "product_component",
+    ["product_id", "component_id"],
+    unique=True,
+)
+
+
+class TestCreateIndex:
+    @pytest.fixture(autouse=True)
+    def database(self, monkeypatch):
+        database = SqliteDatabase(":memory:")
+        with database.bind_ctx([ProductComponent]):
+            # Without the model's unique index, as in databases created before it.
+            database.execute_sql(
+                "CREATE TABLE product_component (id INTEGER PRIMARY KEY, "
+                "product_id INTEGER, component_id INTEGER, created_at DATETIME, "
+                "updated_at DATETIME, deleted_at DATETIME)"
+            )
+            monkeypatch.setattr(migrations, "db", database)
+            yield database
+        database.close()
+
+    @pytest.fixture
+    def duplicates(self):
+        ProductComponent.insert_many(
+            [
+                {"product": 1, "component": 2, "deleted_at": datetime.now()},
+                {"product": 1, "component": 2},
+                {"product": 1, "component": 2},
+                {"product": 1, "component": 3},
+            ]
+        ).execute()
+
+    def test_unique_index_stops_on_duplicate_keys(self, database, duplicates):
+        with pytest.raises(RuntimeError, match=r"product_id=1, component_id=2 \(3"):
+            create_index(INDEX)
+
+        assert database.execute_sql(
+            "SELECT COUNT(*) FROM product_component"
+        ).fetchone() == (4,)
+        assert INDEX.name not in [
+            index.name for index in database.get_indexes("product_component")
+        ]
+
+    def test_cleanup_keeps_one_active_row_per_key(self, database, duplicates):
+        delete_duplicates(INDEX)
+        create_index(INDEX)
+
+        rows = database.execute_sql(
+            "SELECT id, component_id FROM product_component ORDER BY id"
+        ).fetchall()
+        assert rows == [(2, 2), (4, 3)]
+        assert INDEX.name in [
+            index.name for index in database.get_indexes("product_component")
+        ]
@@ -0,0 +1,36 @@
+from typing import List
+
+from src.core.helpers.interfaces.cache_invalidation_bus import CacheInvalidationBus
+from src.core.helpers.services.in_memory_cache import InMemoryCacheService
+from src.core.helpers.services.tiered_cache import TieredCacheService
+
+
+class LocalBus(CacheInvalidationBus):
+    """Delivers every message synchronously to the other buses of network."""
+
+    def __init__(self, network: list):
+        self.network = network
+        self.handler = None
+        network.append(self)
+
+    def publish(self, keys):
+        for bus in self.network:
+            if bus is not self and bus.handler:
+                bus.handler(keys)
+
+    def subscribe(self, handler):
+        self.handler = handler
+
+    def close(self):
+        self.network.remove(self)
+
+
+def tiered_pods(l2: InMemoryCacheService, count: int = 2) -> List[TieredCacheService]:
+    """Processes sharing l2, each with its own l1, on one bus network."""
+    network = []
+    return [
+        TieredCacheService(
+            InMemoryCacheService(start_cleaner_deamon=False), l2, LocalBus(network)
+        )
+        for _ in range(count)
+    ]
@@ -0,0 +1,212 @@
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, List, Optional, Tuple
+import socket
+import socketserver
+import threading
+import time
+
+
+class RedisStandIn:
+    """
+    In-process TCP server speaking the RESP subset RedisCacheService uses:
+    GET, SET (EX/PX/NX/XX), DEL, EXISTS, SCAN, WATCH/MULTI/EXEC,
+    PUBLISH/SUBSCRIBE, PING, AUTH and SELECT. Expiry is lazy and follows the
+    given clock.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.revisions: Dict[bytes, int] = {}
+        self.commands: List[Tuple[bytes, ...]] = []
+        self.connections = 0
+        self.subscribers: Dict[bytes, List["_Session"]] = {}
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def handle(self):
+                with stand_in.lock:
+                    stand_in.connections += 1
+                session = _Session(stand_in, self.connection, self.wfile)
+                while True:
+                    try:
+                        command = _read_command(self.rfile)
+                    except (OSError, ValueError):
+                        return
+                    if command is None:
+                        return
+                    session.write(session.execute(command))
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RedisStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def drop_subscribers(self):
+        """Closes every subscribed connection, as a Redis restart would."""
+        with self.lock:
+            sessions = [
+                session
+                for channel_sessions in self.subscribers.values()
+                for session in channel_sessions
+            ]
+            self.subscribers.clear()
+        for session in sessions:
+            session.connection.shutdown(socket.SHUT_RDWR)
+
+    def live(self, key: bytes) -> Optional[bytes]:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and self.clock() >= expires_at:
+            self.delete(key)
+            return None
+        return value
+
+    def delete(self, key: bytes) -> bool:
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+        return self.data.pop(key, None) is not None
+
+    def store(self, key: bytes, value: bytes, expires_at: Optional[float]):
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+        self.data[key] = (value, expires_at)
+
+
+class _Session:
+    def __init__(self, stand_in: RedisStandIn, connection: socket.socket, wfile):
+        self.stand_in = stand_in
+        self.connection = connection
+        self.wfile = wfile
+        self.write_lock = threading.Lock()
+        self.watched: Dict[bytes, int] = {}
+        self.queued: Optional[List[List[bytes]]] = None
+
+    def write(self, data: bytes):
+        with self.write_lock:
+            self.wfile.write(data)
+
+    def execute(self, command: List[bytes]) -> bytes:
+        name = command[0].upper()
+        with self.stand_in.lock:
+            self.stand_in.commands.append(tuple(command))
+            if name == b"MULTI":
+                self.queued = []
+                return b"+OK\r\n"
+            if name == b"EXEC":
+                queued, self.queued = self.queued or [], None
+                watched, self.watched = self.watched, {}
+                if any(
+                    self.stand_in.revisions.get(key, 0) != revision
+                    for key, revision in watched.items()
+                ):
+                    return b"*-1\r\n"
+                replies = [self._run(queued_command) for queued_command in queued]
+                return b"*%d\r\n" % len(replies) + b"".join(replies)
+            if self.queued is not None:
+                self.queued.append(command)
+                return b"+QUEUED\r\n"
+            if name == b"WATCH":
+                for key in command[1:]:
+                    self.stand_in.live(key)
+                    self.watched[key] = self.stand_in.revisions.get(key, 0)
+                return b"+OK\r\n"
+            if name == b"SUBSCRIBE":
+                replies = []
+                for channel in command[1:]:
+                    self.stand_in.subscribers.setdefault(channel, []).append(self)
+                    replies.append(
+                        b"*3\r\n" + _bulk(b"subscribe") + _bulk(channel) + b":1\r\n"
+                    )
+                return b"".join(replies)
+            if name == b"PUBLISH":
+                channel, message = command[1], command[2]
+                sessions = self.stand_in.subscribers.get(channel, [])
+                for session in sessions:
+                    session.write(
+                        b"*3\r\n" + _bulk(b"message") + _bulk(channel) + _bulk(message)
+                    )
+                return b":%d\r\n" % len(sessions)
+            if name == b"UNWATCH":
+                self.watched = {}
+                return b"+OK\r\n"
+            return self._run(command)
+
+    def _run(self, command: List[bytes]) -> bytes:
+        stand_in = self.stand_in
+        name, args = command[0].upper(), command[1:]
+        if name in (b"PING", b"AUTH", b"SELECT"):
+            return b"+OK\r\n"
+        if name == b"GET":
+            return _bulk(stand_in.live(args[0]))
+        if name == b"SET":
+            return self._set(args)
+        if name == b"DEL":
+            return b":%d\r\n" % sum(stand_in.delete(key) for key in args)
+        if name == b"EXISTS":
+            return b":%d\r\n" % sum(stand_in.live(key) is not None for key in args)
+        if name == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1] if b"MATCH" in args else b"*"
+            keys = [
+                key
+                for key in list(stand_in.data)
+                if fnmatchcase(key, pattern) and stand_in.live(key) is not None
+            ]
+            return (
+                b"*2\r\n"
+                + _bulk(b"0")
+                + b"*%d\r\n" % len(keys)
+                + b"".join(_bulk(key) for key in keys)
+            )
+        return b"-ERR unknown command '%s'\r\n" % name
+
+    def _set(self, args: List[bytes]) -> bytes:
+        stand_in = self.stand_in
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        expires_at = None
+        if b"EX" in options:
+            expires_at = stand_in.clock() + int(options[options.index(b"EX") + 1])
+        if b"PX" in options:
+            milliseconds = int(options[options.index(b"PX") + 1])
+            expires_at = stand_in.clock() + milliseconds / 1000
+        exists = stand_in.live(key) is not None
+        if (b"NX" in options and exists) or (b"XX" in options and not exists):
+            return b"$-1\r\n"
+        stand_in.store(key, value, expires_at)
+        return b"+OK\r\n"
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _read_command(rfile) -> Optional[List[bytes]]:
+    header = rfile.readline()
+    if not header:
+        return None
+    arguments = []
+    for _ in range(int(header[1:-2])):
+        length = int(rfile.readline()[1:-2])
+        arguments.append(rfile.read(length + 2)[:-2])
+    return arguments